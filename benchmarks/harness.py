@@ -0,0 +1,177 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+DEFAULT_THRESHOLD = 0.10  # Relative slowdown of the best time that counts as a regression
+
+# A benchmark's setup builds its state and returns the operation to time
+Setup = Callable[[], Callable[[], object]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    setup: Setup
+    group: str
+    ops: int = 1  # Operations per call, e.g. games per batch
+    threshold: float = DEFAULT_THRESHOLD
+
+
+@dataclass
+class Measurement:
+    median: float  # seconds per operation
+    best: float  # Least disturbed by other load, so comparisons use it
+    stdev: float
+    number: int  # Calls per repeat
+    repeats: int
+
+    @property
+    def ops_per_second(self) -> float:
+        return 1 / self.median if self.median else float("inf")
+
+
+@dataclass
+class Comparison:
+    ratio: float  # new best / baseline best
+    threshold: float
+    status: str  # "regression", "improvement" or "ok"
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(group: str, ops: int = 1, threshold: float = DEFAULT_THRESHOLD) -> Callable[[Setup], Setup]:
+    """Register a setup function as a benchmark named after it."""
+    def register(setup: Setup) -> Setup:
+        if setup.__name__ in BENCHMARKS:
+            raise ValueError(f"Benchmark {setup.__name__!r} is already registered.")
+        BENCHMARKS[setup.__name__] = Benchmark(setup.__name__, setup, group, ops, threshold)
+        return setup
+    return register
+
+
+def measure(bench: Benchmark, repeats: int = 5, min_time: float = 0.2) -> Measurement:
+    """
+    Time the operation like timeit: calibrate the number of calls so one
+    repeat takes at least min_time, then summarize the per-operation times
+    of the repeats.
+    """
+    operation = bench.setup()
+    operation()  # Warm caches and lazy imports
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.1))
+
+    timings = [elapsed / (number * bench.ops)]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        timings.append((time.perf_counter() - start) / (number * bench.ops))
+    return Measurement(
+        statistics.median(timings), min(timings),
+        statistics.stdev(timings) if len(timings) > 1 else 0.0, number, repeats,
+    )
+
+
+def compare(best: float, baseline: float, threshold: float) -> Comparison:
+    ratio = best / baseline if baseline else float("inf")
+    if ratio > 1 + threshold:
+        status = "regression"
+    elif ratio < 1 / (1 + threshold):
+        status = "improvement"
+    else:
+        status = "ok"
+    return Comparison(ratio, threshold, status)
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    names: Optional[list[str]] = None,
+    baseline: Optional[dict] = None,
+    threshold: Optional[float] = None,
+    repeats: int = 5,
+    min_time: float = 0.2,
+    on_result: Optional[Callable[[str, dict], None]] = None,
+) -> dict:
+    """
+    Measure the named benchmarks (all by default) and return the report:
+    metadata, one entry per benchmark and, given a baseline report, the
+    ratio and status of every benchmark both runs share. `threshold`
+    overrides the per-benchmark thresholds.
+    """
+    selected = [BENCHMARKS[name] for name in names] if names else list(BENCHMARKS.values())
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": _commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeats": repeats,
+            "min_time": min_time,
+        },
+        "results": {},
+    }
+    if baseline is not None:
+        report["baseline"] = baseline.get("meta", {})
+        report["comparison"] = {}
+
+    for bench in selected:
+        measurement = measure(bench, repeats, min_time)
+        result = {"group": bench.group, "unit": "s/op", **asdict(measurement),
+                  "ops_per_second": measurement.ops_per_second}
+        report["results"][bench.name] = result
+        if baseline is not None and bench.name in baseline.get("results", {}):
+            comparison = compare(
+                measurement.best, baseline["results"][bench.name]["best"],
+                bench.threshold if threshold is None else threshold,
+            )
+            report["comparison"][bench.name] = asdict(comparison)
+        if on_result is not None:
+            on_result(bench.name, report)
+    return report
+
+
+def regressions(report: dict) -> list[str]:
+    return [name for name, comparison in report.get("comparison", {}).items() if comparison["status"] == "regression"]
+
+
+def load_report(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_report(report: dict, path: str) -> None:
+    with open(path + ".tmp", "w") as file:
+        json.dump(report, file, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
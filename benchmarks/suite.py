@@ -0,0 +1,239 @@
+"""
+Benchmarks for the engine hot paths and full-game throughput.
+
+Run from the repository root:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json --output after.json
+
+Every result is seconds per operation, the median and best over repeats.
+Against a baseline, a best time slower by more than the benchmark's
+threshold is a regression and the run exits with status 1.
+"""
+import argparse
+import copy
+import random
+
+from benchmarks.harness import (
+    BENCHMARKS, DEFAULT_THRESHOLD, benchmark, format_time, load_report, regressions, run_suite, save_report,
+)
+from components import catalogue
+from components.compact_deck import CompactDeck
+from components.compact_token_board import CompactTokenBoard
+from components.deck import DEFAULT_CARD_SPEC_FILE_PATH, Deck
+from components.engine import HeadlessGame, random_agent
+from components.game_record import encode_snapshot, restore_snapshot
+from components.player import Player
+from components.rng import GameRNG
+from components.token_bag import CountTokenBag, TokenBag
+from components.token_board import TokenBoard
+from components.vector_sim import VectorGames
+
+TAKE = [(3, 2), (3, 3), (3, 4)]  # A line through the centre of the board
+
+
+def _midgame(seed: int = 0, plies: int = 20) -> HeadlessGame:
+    """A seeded position a few random plies in, so the players hold tokens and cards."""
+    rng = random.Random(seed)
+    game = HeadlessGame([random_agent(rng), random_agent(rng)], DEFAULT_CARD_SPEC_FILE_PATH, seed=seed)
+    while game.plies < plies and not game.is_over:
+        game.apply(rng.choice(game.legal_actions()))
+    return game
+
+
+def _full_board(bag) -> TokenBoard:
+    token_board = TokenBoard(verbose=False)
+    token_board.replenish(bag)
+    return token_board
+
+
+# Deck
+
+@benchmark("deck")
+def deck_construction():
+    """Deck from deck.json with the catalogue already parsed, as every new game pays."""
+    rng = GameRNG(0)
+    return lambda: Deck(DEFAULT_CARD_SPEC_FILE_PATH, verbose=False, rng=rng)
+
+
+@benchmark("deck")
+def deck_construction_cold():
+    """Deck from deck.json, parsing the catalogue each time."""
+    rng = GameRNG(0)
+
+    def operation():
+        catalogue._load.cache_clear()
+        return Deck(DEFAULT_CARD_SPEC_FILE_PATH, verbose=False, rng=rng)
+    return operation
+
+
+# Token board
+
+def _replenish(bag):
+    token_board = _full_board(bag)
+
+    def operation():
+        for token in token_board.take_tokens(TAKE):
+            bag.add_token(token)
+        token_board.replenish(bag)
+    return operation
+
+
+@benchmark("token_board")
+def token_board_replenish():
+    """Take a line of three and replenish it from the list bag."""
+    return _replenish(TokenBag(GameRNG(0)))
+
+
+@benchmark("token_board")
+def token_board_replenish_count_bag():
+    """Same as token_board_replenish with the count-based bag."""
+    return _replenish(CountTokenBag(GameRNG(0)))
+
+
+@benchmark("token_board")
+def token_board_take_tokens():
+    token_board = _full_board(TokenBag(GameRNG(0)))
+    fields = [token_board.fields[row - 1][col - 1] for row, col in TAKE]
+
+    def operation():
+        for field, token in zip(fields, token_board.take_tokens(TAKE)):
+            field.token = token
+    return operation
+
+
+@benchmark("token_board")
+def compact_token_board_take_tokens():
+    token_board = CompactTokenBoard.from_token_board(_full_board(TokenBag(GameRNG(0))))
+    return lambda: token_board.copy().take_tokens(TAKE)
+
+
+# Player
+
+def _player() -> Player:
+    return max(_midgame(1, 40).players, key=lambda player: player.prestige)
+
+
+@benchmark("player")
+def player_check_win_condition():
+    player = _player()
+    player.verbose = False
+    return player.check_win_condition
+
+
+@benchmark("player")
+def player_win_condition():
+    """The running-counter check the engine uses."""
+    return _player().win_condition
+
+
+# Move generation
+
+@benchmark("engine")
+def legal_actions():
+    return _midgame().legal_actions
+
+
+@benchmark("engine")
+def apply_undo():
+    """Apply and roll back every legal move of a midgame position."""
+    game = _midgame()
+    actions = game.legal_actions()
+
+    def operation():
+        for action in actions:
+            game.undo(game.apply(action))
+    return operation
+
+
+# State cloning
+
+@benchmark("clone")
+def deepcopy_game():
+    game = _midgame()
+    return lambda: copy.deepcopy(game)
+
+
+@benchmark("clone")
+def snapshot_round_trip():
+    """Encode a game_record snapshot and restore it into another game."""
+    game, target = _midgame(), _midgame()
+
+    def operation():
+        snapshot = bytearray()
+        encode_snapshot(snapshot, game)
+        restore_snapshot(target, snapshot, 0)
+    return operation
+
+
+@benchmark("clone")
+def compact_deck_copy():
+    return CompactDeck.from_deck(_midgame().deck).copy
+
+
+@benchmark("clone")
+def compact_token_board_copy():
+    return CompactTokenBoard.from_token_board(_midgame().token_board).copy
+
+
+# Full games
+
+@benchmark("playout", threshold=0.15)
+def random_playout():
+    """One whole HeadlessGame between random agents; seeds cycle so games vary."""
+    seeds = iter(range(10 ** 9))
+
+    def operation():
+        seed = next(seeds) % 64
+        rng = random.Random(seed)
+        return HeadlessGame([random_agent(rng), random_agent(rng)], DEFAULT_CARD_SPEC_FILE_PATH, seed=seed).play()
+    return operation
+
+
+@benchmark("playout", ops=256, threshold=0.15)
+def vector_random_playouts():
+    """256 random games in lockstep with vector_sim; reported per game."""
+    seeds = iter(range(10 ** 9))
+    return lambda: VectorGames(256, next(seeds) % 64, DEFAULT_CARD_SPEC_FILE_PATH).play("random")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default all): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--group", action="append", help="run only these groups")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float,
+                        help=f"regression threshold for every benchmark (default per benchmark, {DEFAULT_THRESHOLD})")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+    names = args.names or [
+        name for name, bench in BENCHMARKS.items() if not args.group or bench.group in args.group
+    ]
+    baseline = load_report(args.baseline) if args.baseline else None
+
+    def show(name: str, report: dict) -> None:
+        result = report["results"][name]
+        line = (f"{name:34} {format_time(result['median']):>10}/op (best {format_time(result['best'])})"
+                f"  {result['ops_per_second']:>12.1f} ops/s")
+        comparison = report.get("comparison", {}).get(name)
+        if comparison is not None:
+            line += f"  x{comparison['ratio']:.2f} {comparison['status']}"
+        print(line, flush=True)
+
+    report = run_suite(names, baseline, args.threshold, args.repeats, args.min_time, show)
+    if args.output:
+        save_report(report, args.output)
+    failed = regressions(report)
+    if failed:
+        print(f"Regressions: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from components.card import Card
+from components.t0ken import Token
+
+
+@dataclass(frozen=True, slots=True)
+class TakeTokens:
+    """Take the tokens on 1-3 fields in one line (1-based board coordinates)."""
+    coords: tuple[tuple[int, int], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class BuyCard:
+    """
+    Buy the active card `card_id` of deck level `level`. Cards are named by id
+    rather than slot so an action means the same thing in every transposition.
+    """
+    level: int
+    card_id: int
+
+
+@dataclass(frozen=True, slots=True)
+class Replenish:
+    """Refill the token board from the bag; the next player gains a privilege."""
+
+
+@dataclass(frozen=True, slots=True)
+class Pass:
+    """Do nothing; only legal when no other action is."""
+
+
+Action = TakeTokens | BuyCard | Replenish | Pass
+
+
+@dataclass(slots=True)
+class UndoRecord:
+    """Everything `HeadlessGame.undo` needs to roll back one applied action."""
+    action: Action
+    player_index: int  # Player who moved
+    tokens: list[Token] = field(default_factory=list)  # Tokens taken
+    payment: Optional[tuple[int, ...]] = None  # Token counts spent on a card
+    card: Optional[Card] = None  # Card bought
+    index: int = 0  # Active slot the card was bought from
+    replacement: Optional[Card] = None  # Card drawn into the vacated slot
+    filled: list[tuple[int, int]] = field(default_factory=list)  # Fields replenished
+    bag_tokens: Optional[list[Token]] = None  # Bag contents before replenishing
+    privileges: int = 0  # Next player's privileges before replenishing
+    hash: int = 0  # Zobrist hash before the action
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from PIL import Image, ImageDraw, ImageFont
+
+from components.card import Card
+from components.catalogue import DEFAULT_CATALOGUE_PATH, load_catalogue
+from components.t0ken import Token
+
+# Bump whenever the layout changes so every card is drawn again
+RENDER_VERSION = 1
+CARD_SIZE = (400, 600)
+BACKGROUND_COLOR = "grey"
+CROWN_SIZE = (40, 40)
+CROWN_IMAGE_PATH = os.path.join(os.path.dirname(__file__), "..", "resources", "images", "crown.png")
+FONT_PATHS = [
+    "/System/Library/Fonts/Arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+]
+MANIFEST_FILE = "manifest.json"
+SHEET_FILE = "cards.png"
+ATLAS_FILE = "cards.json"
+
+
+@dataclass(frozen=True)
+class RenderAssets:
+    title_font: ImageFont.ImageFont
+    number_font: ImageFont.ImageFont
+    crown: Image.Image
+    crown_mask: Image.Image
+
+
+def _load_font(size: int) -> ImageFont.ImageFont:
+    for path in FONT_PATHS:
+        try:
+            return ImageFont.truetype(path, size)
+        except IOError:
+            continue
+    return ImageFont.load_default(size)
+
+
+@lru_cache(maxsize=None)
+def load_assets(crown_image_path: str = CROWN_IMAGE_PATH) -> RenderAssets:
+    """Fonts and the resized crown icon, loaded once per process."""
+    crown = Image.open(crown_image_path).convert("RGBA").resize(CROWN_SIZE)
+    return RenderAssets(_load_font(24), _load_font(20), crown, crown.split()[3])
+
+
+def card_hash(card: Card) -> str:
+    """Digest of everything drawn on the card, in drawing order, plus the layout version."""
+    content = [
+        RENDER_VERSION, card.level, card.points, card.feature, card.crowns,
+        [(token.name, quantity) for token, quantity in _color_counts(card.requirements)],
+        [(token.name, quantity) for token, quantity in _color_counts(card.output)],
+    ]
+    return hashlib.sha1(json.dumps(content).encode()).hexdigest()
+
+
+def _draw_border_text(draw: ImageDraw.ImageDraw, x: int, y: int, text: str, font, offset: int = 2) -> None:
+    """White text with a black border, as on the printed cards."""
+    for dx, dy in [(-offset, 0), (offset, 0), (0, -offset), (0, offset),
+                   (-offset, -offset), (-offset, offset), (offset, -offset), (offset, offset)]:
+        draw.text((x + dx, y + dy), text, font=font, fill="black")
+    draw.text((x, y), text, font=font, fill="white")
+
+
+def _color_counts(tokens: Optional[list[Token]]) -> list[tuple[Token, int]]:
+    counts: dict[Token, int] = {}
+    for token in tokens or ():
+        counts[token] = counts.get(token, 0) + 1
+    return list(counts.items())
+
+
+def render_card(card: Card, assets: Optional[RenderAssets] = None) -> Image.Image:
+    """
+    Draw a card: feature top left, output tokens top right, crowns top
+    centre and requirements along the bottom (one circle per color).
+    """
+    assets = assets or load_assets()
+    width, height = CARD_SIZE
+    image = Image.new("RGB", CARD_SIZE, BACKGROUND_COLOR)
+    draw = ImageDraw.Draw(image)
+
+    if card.feature and card.feature.lower() != "none":
+        _draw_border_text(draw, 20, 20, card.feature, assets.title_font)
+
+    square_size = 30
+    for i, (token, quantity) in enumerate(_color_counts(card.output)):
+        x, y = width - 120, 20 + i * (square_size + 10)
+        draw.rectangle([x, y, x + square_size, y + square_size], fill=token.value, outline="black")
+        _draw_border_text(draw, x + square_size + 10, y, str(quantity), assets.number_font)
+
+    crown_width, crown_height = CROWN_SIZE
+    crown_x = (width - (card.crowns * crown_width + (card.crowns - 1) * 10)) // 2
+    for i in range(card.crowns):
+        image.paste(assets.crown, (crown_x + i * (crown_width + 10), 20 - crown_height // 2), assets.crown_mask)
+
+    radius, spacing = 25, 60
+    for i, (token, quantity) in enumerate(_color_counts(card.requirements)):
+        x, y = 30 + i * spacing, height - 150
+        draw.ellipse([x, y, x + radius * 2, y + radius * 2], fill=token.value, outline="black")
+        _draw_border_text(draw, x + radius - 10, y + radius - 10, str(quantity), assets.number_font)
+
+    return image
+
+
+def card_file(card_id: int) -> str:
+    return f"card-{card_id:03d}.png"
+
+
+def render_cards(card_ids: list[int], card_spec_file_path: str, output_dir: str) -> list[tuple[int, str]]:
+    """Render and save the given cards; returns (card_id, hash) pairs. Runs in pool workers."""
+    catalogue = load_catalogue(card_spec_file_path)
+    assets = load_assets()
+    rendered = []
+    for card_id in card_ids:
+        card = catalogue[card_id]
+        render_card(card, assets).save(os.path.join(output_dir, card_file(card_id)))
+        rendered.append((card_id, card_hash(card)))
+    return rendered
+
+
+@dataclass
+class RenderReport:
+    rendered: list[int]
+    skipped: list[int]
+    elapsed: float
+    sheet_path: Optional[str] = None
+    atlas_path: Optional[str] = None
+
+
+def _write_json(path: str, data: dict) -> None:
+    with open(path + ".tmp", "w") as file:
+        json.dump(data, file, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+def build_sprite_sheet(output_dir: str, manifest: dict[str, str], columns: int = 10) -> tuple[str, str]:
+    """
+    Pack the rendered cards into one image in card id order, plus a JSON atlas
+    giving each card's rectangle in it.
+    """
+    card_ids = sorted(int(card_id) for card_id in manifest)
+    width, height = CARD_SIZE
+    rows = -(-len(card_ids) // columns)
+    sheet = Image.new("RGB", (columns * width, rows * height), BACKGROUND_COLOR)
+    frames = {}
+    for i, card_id in enumerate(card_ids):
+        x, y = (i % columns) * width, (i // columns) * height
+        with Image.open(os.path.join(output_dir, card_file(card_id))) as image:
+            sheet.paste(image, (x, y))
+        frames[str(card_id)] = {"x": x, "y": y, "w": width, "h": height, "hash": manifest[str(card_id)]}
+
+    sheet_path = os.path.join(output_dir, SHEET_FILE)
+    atlas_path = os.path.join(output_dir, ATLAS_FILE)
+    sheet.save(sheet_path)
+    _write_json(atlas_path, {"image": SHEET_FILE, "size": list(sheet.size), "frames": frames})
+    return sheet_path, atlas_path
+
+
+def render_deck(
+    output_dir: str,
+    card_spec_file_path: str = DEFAULT_CATALOGUE_PATH,
+    workers: Optional[int] = None,
+    force: bool = False,
+    sprite_sheet: bool = True,
+    columns: int = 10,
+    chunk_size: int = 8,
+) -> RenderReport:
+    """
+    Render every card in the catalogue into output_dir as card-NNN.png.
+
+    A manifest keeps the content hash of each rendered card, and cards whose
+    hash and file are unchanged are skipped unless `force`. The rest are
+    rendered in chunks across a process pool (inline with workers=1); every
+    worker loads fonts and icons once. With sprite_sheet the cards are also
+    packed into cards.png with a cards.json atlas, rebuilt only when a card
+    changed or either file is missing.
+    """
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    catalogue = load_catalogue(card_spec_file_path)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    manifest: dict[str, str] = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+
+    stale, skipped = [], []
+    for card in catalogue.cards:
+        unchanged = manifest.get(str(card.card_id)) == card_hash(card)
+        if unchanged and os.path.exists(os.path.join(output_dir, card_file(card.card_id))):
+            skipped.append(card.card_id)
+        else:
+            stale.append(card.card_id)
+    manifest = {str(card_id): manifest[str(card_id)] for card_id in skipped}
+
+    chunks = [stale[i:i + chunk_size] for i in range(0, len(stale), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        results = [render_cards(chunk, card_spec_file_path, output_dir) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            results = list(pool.map(render_cards, chunks, [card_spec_file_path] * len(chunks),
+                                    [output_dir] * len(chunks)))
+    for chunk in results:
+        for card_id, digest in chunk:
+            manifest[str(card_id)] = digest
+    _write_json(manifest_path, manifest)
+
+    report = RenderReport(stale, skipped, 0.0)
+    if sprite_sheet:
+        report.sheet_path = os.path.join(output_dir, SHEET_FILE)
+        report.atlas_path = os.path.join(output_dir, ATLAS_FILE)
+        if stale or not (os.path.exists(report.sheet_path) and os.path.exists(report.atlas_path)):
+            build_sprite_sheet(output_dir, manifest, columns)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+if __name__ == '__main__':
+    output_dir = os.path.join(os.path.dirname(__file__), "..", "resources", "cards")
+    for attempt in ("first", "second"):
+        report = render_deck(output_dir)
+        print(f"{attempt} run: rendered {len(report.rendered)}, skipped {len(report.skipped)} "
+              f"in {report.elapsed:.2f}s; sheet {report.sheet_path}")
@@ -0,0 +1,164 @@
+import json
+import os
+import struct
+import zlib
+from functools import lru_cache
+from typing import Optional
+
+from components.card import Card
+from components.t0ken import TOKEN_INDEX, Token
+
+# Compiled catalogue layout (little endian):
+#   header   magic, format version, card count, catalogue version, feature count
+#   features one length-prefixed UTF-8 string per feature name
+#   cards    one fixed-size record per card, in card id order
+CATALOGUE_MAGIC = b"SDCC"
+CATALOGUE_FORMAT = 2
+HEADER = struct.Struct("<4sHHIH")
+FEATURE_LENGTH = struct.Struct("<B")
+NO_FEATURE = 0xFF  # Feature index of a card whose feature is null
+# Requirements and output are each stored as a pair count followed by
+# (token index, quantity) pairs in spec order, zero padded, so cards read
+# back exactly as deck.json lists them (the renderer draws in that order)
+TOKEN_PAIRS = 1 + 2 * len(Token)
+# level, points, crowns, feature index, requirement pairs, output pairs
+CARD_RECORD = struct.Struct(f"<BBBB{TOKEN_PAIRS}B{TOKEN_PAIRS}B")
+
+LEVELS = (0, 1, 2)  # Card levels a Deck deals, see Deck._get_max_card_count
+
+DEFAULT_CATALOGUE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "resources", "deck", "deck.bin"
+)
+
+
+class Catalogue:
+    """
+    The immutable set of cards, loaded once per process and shared by every
+    Deck. A card's id is its index in `cards`.
+    """
+    __slots__ = ("cards", "version", "ids_by_level")
+
+    def __init__(self, cards: tuple[Card, ...], version: int) -> None:
+        self.cards = cards
+        self.version = version  # CRC32 of the source deck.json
+        ids_by_level: dict[int, list[int]] = {}
+        for card in cards:
+            if card.level not in LEVELS:
+                raise ValueError(f"Card {card.card_id} has level {card.level}; expected one of {LEVELS}.")
+            ids_by_level.setdefault(card.level, []).append(card.card_id)
+        self.ids_by_level = {level: tuple(ids) for level, ids in sorted(ids_by_level.items())}
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def __getitem__(self, card_id: int) -> Card:
+        return self.cards[card_id]
+
+
+def _pack_pairs(quantities: Optional[dict[str, int]]) -> list[int]:
+    pairs = [len(quantities or ())]
+    for color, quantity in (quantities or {}).items():
+        pairs += [TOKEN_INDEX[Token[color]], quantity]
+    return pairs + [0] * (TOKEN_PAIRS - len(pairs))
+
+
+def _unpack_pairs(pairs: tuple[int, ...]) -> dict[str, int]:
+    tokens = list(Token)
+    return {tokens[pairs[1 + 2 * i]].name: pairs[2 + 2 * i] for i in range(pairs[0])}
+
+
+def compile_catalogue(card_spec_file_path: str, output_path: str) -> int:
+    """Pack deck.json into the compiled format; returns the catalogue version."""
+    with open(card_spec_file_path, "rb") as file:
+        source = file.read()
+    items = json.loads(source)
+    version = zlib.crc32(source)
+
+    features = sorted({item["feature"] for item in items if item["feature"] is not None})
+    feature_index = {feature: i for i, feature in enumerate(features)}
+
+    chunks = [HEADER.pack(CATALOGUE_MAGIC, CATALOGUE_FORMAT, len(items), version, len(features))]
+    for feature in features:
+        encoded = feature.encode()
+        chunks.append(FEATURE_LENGTH.pack(len(encoded)) + encoded)
+    for item in items:
+        chunks.append(CARD_RECORD.pack(
+            item["level"], item["points"], item["crowns"],
+            NO_FEATURE if item["feature"] is None else feature_index[item["feature"]],
+            *_pack_pairs(item["requirements"]), *_pack_pairs(item["output"]),
+        ))
+
+    # Write aside and rename so readers never see a half-written catalogue
+    with open(output_path + ".tmp", "wb") as file:
+        file.write(b"".join(chunks))
+    os.replace(output_path + ".tmp", output_path)
+    return version
+
+
+def _read_compiled(path: str) -> Catalogue:
+    with open(path, "rb") as file:
+        data = file.read()
+
+    magic, file_format, count, version, feature_count = HEADER.unpack_from(data)
+    if magic != CATALOGUE_MAGIC or file_format != CATALOGUE_FORMAT:
+        raise ValueError(f"{path} is not a compiled card catalogue (format {CATALOGUE_FORMAT}).")
+
+    offset = HEADER.size
+    features = []
+    for _ in range(feature_count):
+        (length,) = FEATURE_LENGTH.unpack_from(data, offset)
+        offset += FEATURE_LENGTH.size
+        features.append(data[offset:offset + length].decode())
+        offset += length
+
+    cards = tuple(
+        Card(
+            level=record[0],
+            points=record[1],
+            feature=None if record[3] == NO_FEATURE else features[record[3]],
+            requirements=_unpack_pairs(record[4:4 + TOKEN_PAIRS]),
+            output=_unpack_pairs(record[4 + TOKEN_PAIRS:]),
+            crowns=record[2],
+            card_id=card_id,
+        )
+        for card_id, record in enumerate(CARD_RECORD.iter_unpack(data[offset:offset + count * CARD_RECORD.size]))
+    )
+    return Catalogue(cards, version)
+
+
+def _read_json(path: str) -> Catalogue:
+    with open(path, "rb") as file:
+        source = file.read()
+    cards = tuple(
+        Card(**item, card_id=card_id) for card_id, item in enumerate(json.loads(source))
+    )
+    return Catalogue(cards, zlib.crc32(source))
+
+
+def _read_checked(path: str) -> Catalogue:
+    """
+    Read a compiled catalogue, or the deck.json next to it if that no longer
+    matches the CRC32 it was compiled from (recompile with helper/).
+    """
+    catalogue = _read_compiled(path)
+    source_path = os.path.splitext(path)[0] + ".json"
+    if not os.path.exists(source_path):
+        return catalogue
+    with open(source_path, "rb") as file:
+        if zlib.crc32(file.read()) == catalogue.version:
+            return catalogue
+    return _read_json(source_path)
+
+
+@lru_cache(maxsize=None)
+def _load(path: str) -> Catalogue:
+    return _read_json(path) if path.endswith(".json") else _read_checked(path)
+
+
+def load_catalogue(path: str = DEFAULT_CATALOGUE_PATH) -> Catalogue:
+    """
+    Load a compiled (.bin) or JSON catalogue, once per process per file. A
+    compiled catalogue older than its adjacent JSON source is ignored in
+    favour of the JSON.
+    """
+    return _load(os.path.abspath(path))
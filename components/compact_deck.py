@@ -0,0 +1,192 @@
+from array import array
+from typing import Optional
+
+from components.card import Card
+from components.catalogue import DEFAULT_CATALOGUE_PATH, Catalogue, load_catalogue
+from components.deck import Deck
+from components.rng import GameRNG
+
+EMPTY_SLOT = -1
+
+
+class CompactDeck:
+    """
+    Deck state in one flat integer array, so a clone is a single buffer copy.
+
+    Layout of `state`: one top-of-pile cursor per level, then every level's
+    pile of card ids (the top card sits just below the cursor), then every
+    level's active slots (EMPTY_SLOT once a pile can no longer refill them).
+    Cards drawn from a pile stay in the buffer above the cursor, which is
+    what makes undoing a draw O(1).
+    """
+    __slots__ = ("catalogue", "levels", "pile_offsets", "slot_offsets", "slot_counts", "state")
+
+    def __init__(
+        self,
+        card_spec_file_path: str = DEFAULT_CATALOGUE_PATH,
+        catalogue: Optional[Catalogue] = None,
+        rng: Optional[GameRNG] = None,
+    ) -> None:
+        rng = rng if rng is not None else GameRNG()
+        self.catalogue = catalogue if catalogue is not None else load_catalogue(card_spec_file_path)
+        self.levels = tuple(self.catalogue.ids_by_level)
+        self.slot_counts = tuple(Deck._get_max_card_count(level) for level in self.levels)
+
+        n_levels = len(self.levels)
+        self.pile_offsets = []
+        offset = n_levels
+        for level in self.levels:
+            self.pile_offsets.append(offset)
+            offset += len(self.catalogue.ids_by_level[level])
+        self.slot_offsets = []
+        for count in self.slot_counts:
+            self.slot_offsets.append(offset)
+            offset += count
+        self.pile_offsets = tuple(self.pile_offsets)
+        self.slot_offsets = tuple(self.slot_offsets)
+
+        state = array("h", [0] * offset)
+        for i, level in enumerate(self.levels):
+            pile = list(self.catalogue.ids_by_level[level])
+            rng.shuffle(pile)
+            start = self.pile_offsets[i]
+            state[start:start + len(pile)] = array("h", pile)
+            state[i] = start + len(pile)
+        self.state = state
+
+        for i in range(n_levels):
+            for slot in range(self.slot_counts[i]):
+                drawn = self.draw(i)
+                self.state[self.slot_offsets[i] + slot] = EMPTY_SLOT if drawn is None else drawn
+
+    @classmethod
+    def from_deck(cls, deck: Deck) -> "CompactDeck":
+        """Build the compact form of an existing Deck (same piles and active cards)."""
+        compact = cls(catalogue=deck.catalogue)
+        state = compact.state
+        for i, level in enumerate(compact.levels):
+            pile = deck.piles[level]
+            start = compact.pile_offsets[i]
+            state[start:start + len(pile)] = array("h", pile)
+            state[i] = start + len(pile)
+            active = [card.card_id for card in deck.active_cards[level]]
+            active += [EMPTY_SLOT] * (compact.slot_counts[i] - len(active))
+            state[compact.slot_offsets[i]:compact.slot_offsets[i] + len(active)] = array("h", active)
+        return compact
+
+    def copy(self) -> "CompactDeck":
+        clone = CompactDeck.__new__(CompactDeck)
+        clone.catalogue = self.catalogue
+        clone.levels = self.levels
+        clone.pile_offsets = self.pile_offsets
+        clone.slot_offsets = self.slot_offsets
+        clone.slot_counts = self.slot_counts
+        clone.state = self.state[:]
+        return clone
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactDeck):
+            return NotImplemented
+        return self.state == other.state
+
+    # Levels are addressed by their index in self.levels (0, 1, 2 for deck.json)
+
+    def pile_size(self, i: int) -> int:
+        return self.state[i] - self.pile_offsets[i]
+
+    def draw(self, i: int) -> Optional[int]:
+        """Take the top card id off pile i, or None if it is empty."""
+        state = self.state
+        if state[i] == self.pile_offsets[i]:
+            return None
+        state[i] -= 1
+        return state[state[i]]
+
+    def undraw(self, i: int) -> None:
+        """Put the last drawn card back on top of pile i."""
+        self.state[i] += 1
+
+    def take(self, i: int, card_index: int) -> int:
+        """
+        Take the card at card_index of pile i by swapping it with the top card
+        first; undo with untake(i, card_index).
+        """
+        state = self.state
+        position = self.pile_offsets[i] + card_index
+        if not self.pile_offsets[i] <= position < state[i]:
+            raise IndexError(f"Invalid card index or level: Level {self.levels[i]}, Index {card_index}.")
+        top = state[i] - 1
+        state[position], state[top] = state[top], state[position]
+        state[i] = top
+        return state[top]
+
+    def untake(self, i: int, card_index: int) -> None:
+        state = self.state
+        top = state[i]
+        position = self.pile_offsets[i] + card_index
+        state[position], state[top] = state[top], state[position]
+        state[i] = top + 1
+
+    def active_slot(self, i: int, slot: int) -> int:
+        return self.state[self.slot_offsets[i] + slot]
+
+    def buy(self, i: int, slot: int) -> tuple[int, int]:
+        """
+        Remove the active card in a slot and refill it from the pile.
+        Returns (bought id, replacement id or EMPTY_SLOT); undo with unbuy.
+        """
+        state = self.state
+        position = self.slot_offsets[i] + slot
+        bought = state[position]
+        if bought == EMPTY_SLOT:
+            raise IndexError(f"Active slot {slot} of level {self.levels[i]} is empty.")
+        replacement = self.draw(i)
+        state[position] = EMPTY_SLOT if replacement is None else replacement
+        return bought, state[position]
+
+    def unbuy(self, i: int, slot: int, bought: int, replacement: int) -> None:
+        self.state[self.slot_offsets[i] + slot] = bought
+        if replacement != EMPTY_SLOT:
+            self.undraw(i)
+
+    # Card views, mirroring Deck
+
+    @property
+    def piles(self) -> dict[int, list[Card]]:
+        catalogue, state = self.catalogue, self.state
+        return {
+            level: [catalogue[card_id] for card_id in state[self.pile_offsets[i]:state[i]]]
+            for i, level in enumerate(self.levels)
+        }
+
+    @property
+    def active_cards(self) -> dict[int, list[Card]]:
+        catalogue, state = self.catalogue, self.state
+        return {
+            level: [
+                catalogue[card_id]
+                for card_id in state[self.slot_offsets[i]:self.slot_offsets[i] + self.slot_counts[i]]
+                if card_id != EMPTY_SLOT
+            ]
+            for i, level in enumerate(self.levels)
+        }
+
+    def pop(self, level: int) -> Optional[Card]:
+        card_id = self.draw(self.levels.index(level))
+        return None if card_id is None else self.catalogue[card_id]
+
+    def display_deck(self) -> None:
+        print("\n--- Deck ---\n")
+        Deck.display_cards(list(self.catalogue.cards))
+
+    def display_piles(self) -> None:
+        print("\n--- Piles by Level ---\n")
+        for level, pile in self.piles.items():
+            print(f"Level {level}: {len(pile)} cards\n")
+            Deck.display_cards(pile)
+
+    def display_active_cards(self) -> None:
+        print("\n--- Active Cards by Level ---\n")
+        for level, cards in self.active_cards.items():
+            print(f"Level {level}: {len(cards)} cards\n")
+            Deck.display_cards(cards)
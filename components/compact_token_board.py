@@ -0,0 +1,143 @@
+from typing import Optional, Union
+
+from components.t0ken import Token
+from components.token_bag import CountTokenBag, TokenBag
+from components.token_board import BOARD_REPLENISH_ORDER, TokenBoard
+from components.token_selection import Coords, legal_selections, selection_mask
+
+TOKENS = list(Token)
+CELL_BITS = 3  # 0 = empty, 1..7 = Token in enum order
+CELL_MASK = (1 << CELL_BITS) - 1
+
+
+def cell_index(coord: tuple[int, int]) -> int:
+    """Map 1-based (row, col) board coordinates to a 0-24 cell index."""
+    row, col = coord
+    if not (1 <= row <= 5) or not (1 <= col <= 5):
+        raise ValueError(f"Coordinates {row}, {col} are out of bounds (1-5)")
+    return (row - 1) * 5 + (col - 1)
+
+
+TOKEN_CODES = {token: code for code, token in enumerate(TOKENS, start=1)}
+REPLENISH_CELLS = [cell_index(coord) for coord in BOARD_REPLENISH_ORDER]
+
+
+class CompactTokenBoard:
+    """
+    Token board packed into two integers so that copies are O(1).
+
+    `cells` holds CELL_BITS bits per field (cell i at bit i * CELL_BITS) and
+    `occupied` holds one bit per non-empty field. Convert to and from
+    `TokenBoard` with `from_token_board` / `to_token_board`.
+    """
+    __slots__ = ("cells", "occupied")
+
+    def __init__(self, cells: int = 0, occupied: Optional[int] = None) -> None:
+        self.cells = cells
+        if occupied is None:
+            occupied = 0
+            for i in range(25):
+                if (cells >> (i * CELL_BITS)) & CELL_MASK:
+                    occupied |= 1 << i
+        self.occupied = occupied
+
+    @classmethod
+    def from_token_board(cls, token_board: TokenBoard) -> "CompactTokenBoard":
+        cells = occupied = 0
+        for row in token_board.fields:
+            for field in row:
+                if field.token is not None:
+                    i = (field.row - 1) * 5 + (field.col - 1)
+                    cells |= TOKEN_CODES[field.token] << (i * CELL_BITS)
+                    occupied |= 1 << i
+        return cls(cells, occupied)
+
+    def to_token_board(self) -> TokenBoard:
+        token_board = TokenBoard(verbose=False)
+        for row in token_board.fields:
+            for field in row:
+                field.token = self.get((field.row, field.col))
+        return token_board
+
+    def copy(self) -> "CompactTokenBoard":
+        clone = CompactTokenBoard.__new__(CompactTokenBoard)
+        clone.cells = self.cells
+        clone.occupied = self.occupied
+        return clone
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactTokenBoard):
+            return NotImplemented
+        return self.cells == other.cells
+
+    def __hash__(self) -> int:
+        return hash(self.cells)
+
+    def __repr__(self) -> str:
+        return f"CompactTokenBoard(cells={self.cells:#x})"
+
+    def get(self, coord: tuple[int, int]) -> Optional[Token]:
+        code = (self.cells >> (cell_index(coord) * CELL_BITS)) & CELL_MASK
+        return TOKENS[code - 1] if code else None
+
+    def set(self, coord: tuple[int, int], token: Optional[Token]) -> None:
+        i = cell_index(coord)
+        shift = i * CELL_BITS
+        self.cells &= ~(CELL_MASK << shift)
+        if token is None:
+            self.occupied &= ~(1 << i)
+        else:
+            self.cells |= TOKEN_CODES[token] << shift
+            self.occupied |= 1 << i
+
+    def color_mask(self, token: Token) -> int:
+        """Bitmask of the fields holding the given token color."""
+        code = TOKEN_CODES[token]
+        mask = 0
+        cells = self.cells
+        for i in range(25):
+            if (cells >> (i * CELL_BITS)) & CELL_MASK == code:
+                mask |= 1 << i
+        return mask
+
+    def legal_selections(self, max_length: int = 3) -> list[Coords]:
+        """List every legal take_tokens selection on the current board."""
+        return legal_selections(self.occupied, max_length)
+
+    def replenish(self, token_bag: Union[TokenBag, CountTokenBag]) -> Union[TokenBag, CountTokenBag]:
+        """Same semantics as `TokenBoard.replenish`."""
+        occupied = self.occupied
+        empty = [i for i in REPLENISH_CELLS if not (occupied >> i) & 1]
+        for i, token in zip(empty, token_bag.draw(len(empty))):
+            self.cells |= TOKEN_CODES[token] << (i * CELL_BITS)
+            self.occupied |= 1 << i
+
+        return token_bag
+
+    def take_tokens(self, coords: list[tuple[int, int]]) -> list[Token]:
+        """Same rules as `TokenBoard.take_tokens`."""
+        if len(coords) > 3:
+            raise ValueError("Cannot take tokens from more than three fields.")
+
+        if not coords:
+            raise ValueError("Must take at least one token.")
+
+        indices = [cell_index(coord) for coord in coords]
+        if any(not (self.occupied >> i) & 1 for i in indices):
+            raise ValueError("Cannot take tokens from empty fields.")
+
+        mask = selection_mask(coords)
+        if mask is None:
+            raise ValueError(
+                "Fields must be adjacent and aligned in one line "
+                "(horizontal, vertical, or diagonal)."
+            )
+
+        tokens = []
+        for i in indices:
+            shift = i * CELL_BITS
+            tokens.append(TOKENS[((self.cells >> shift) & CELL_MASK) - 1])
+            self.cells &= ~(CELL_MASK << shift)
+        self.occupied &= ~mask
+
+        return tokens
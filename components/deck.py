@@ -1,35 +1,41 @@
-import json
-from collections import defaultdict
-from random import shuffle
+import os
+from typing import TYPE_CHECKING, Optional
 
 from components.card import Card
+from components.catalogue import Catalogue, load_catalogue
+from components.rng import GameRNG
+
+if TYPE_CHECKING:
+    from components.player import Player
+
+DEFAULT_CARD_SPEC_FILE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "resources", "deck", "deck.json"
+)
 
 
 class Deck:
-    def __init__(self, card_spec_file_path: str) -> None:
-        self.deck: list[Card] = self._load_card_specs(card_spec_file_path)
-        self.piles: dict[int, list[Card]] = self._load_piles()
+    def __init__(self, card_spec_file_path: str, verbose: bool = True, rng: Optional[GameRNG] = None) -> None:
+        self.verbose = verbose
+        self.rng = rng if rng is not None else GameRNG()
+        self.catalogue: Catalogue = load_catalogue(card_spec_file_path)
+        self.deck: list[Card] = list(self.catalogue.cards)
+        self.piles: dict[int, list[int]] = self._load_piles()  # Card ids, top of pile last
         self.active_cards: dict[int, list[Card]] = self._load_active_cards()
 
-    @staticmethod
-    def _load_card_specs(card_spec_file_path: str) -> list[Card]:
-        """Parse cards and their properties from JSON file."""
-        with open(card_spec_file_path, "r") as file:
-            return [Card(**item) for item in json.load(file)]  # todo: validate levels
-
-    def _load_piles(self) -> dict[int, list[Card]]:
-        """Shuffle cards and separate them into piles by level."""
-        shuffle(self.deck)
-        piles = defaultdict(list)
-        for card in self.deck:
-            piles[card.level].append(card)
-        return dict(piles)
+    def _load_piles(self) -> dict[int, list[int]]:
+        """Shuffle the card ids of each level into a pile."""
+        piles = {}
+        for level, card_ids in self.catalogue.ids_by_level.items():
+            pile = list(card_ids)
+            self.rng.shuffle(pile)
+            piles[level] = pile
+        return piles
 
     def _load_active_cards(self) -> dict[int, list[Card]]:
         """Deal playable cards to start per level."""
         return {
             level: [
-                self.piles[level].pop()
+                self.catalogue[self.piles[level].pop()]
                 for _ in range(self._get_max_card_count(level))
             ]
             for level in self.piles.keys()
@@ -39,6 +45,10 @@ class Deck:
     def _get_max_card_count(level: int) -> int:
         return 5 - level  # 5 cards for level 0; 4 for level 1; 3 for level 2
 
+    def _log(self, message: str) -> None:
+        if self.verbose:
+            print(message)
+
     @staticmethod
     def display_cards(cards: list[Card]) -> None:
         for card in cards:
@@ -52,7 +62,7 @@ class Deck:
         print("\n--- Piles by Level ---\n")
         for level, pile in self.piles.items():
             print(f"Level {level}: {len(pile)} cards\n")
-            self.display_cards(pile)
+            self.display_cards([self.catalogue[card_id] for card_id in pile])
 
     def display_active_cards(self) -> None:
         print("\n--- Active Cards by Level ---\n")
@@ -60,15 +70,23 @@ class Deck:
             print(f"Level {level}: {len(cards)} cards\n")
             self.display_cards(cards)
 
+    def affordable_cards(self, player: "Player") -> list[Card]:
+        """List the active cards of every level that the player can pay for."""
+        return [
+            card
+            for cards in self.active_cards.values()
+            for card in player.affordable_cards(cards)
+        ]
+
     # TODO: Clean up/add typehints from here on
     def replenish_card(self, level, num_cards):
         # TODO: consolidate with pop
         """Deal a number of cards from the top of the pile of a specific level"""
         if level in self.piles and len(self.piles[level]) >= num_cards:
-            dealt_cards = [self.piles[level].pop() for _ in range(num_cards)]
+            dealt_cards = [self.catalogue[self.piles[level].pop()] for _ in range(num_cards)]
             return dealt_cards
         else:
-            print(f"Not enough cards to deal from level {level}.")
+            self._log(f"Not enough cards to deal from level {level}.")
             return []
 
     def take(self, level, card_index):
@@ -77,17 +95,17 @@ class Deck:
         Note: Ensure the index is valid.
         """
         if level in self.piles and 0 <= card_index < len(self.piles[level]):
-            return self.piles[level].pop(card_index)
+            return self.catalogue[self.piles[level].pop(card_index)]
         else:
-            print(f"Invalid card index or level: Level {level}, Index {card_index}.")
+            self._log(f"Invalid card index or level: Level {level}, Index {card_index}.")
             return None
 
     def pop(self, level):
         """Pop the top card from a specific level pile"""
         if level in self.piles and self.piles[level]:
-            return self.piles[level].pop()
+            return self.catalogue[self.piles[level].pop()]
         else:
-            print(f"No cards left in level {level}.")
+            self._log(f"No cards left in level {level}.")
             return None
 
 
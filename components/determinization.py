@@ -0,0 +1,90 @@
+import random
+from array import array
+from collections import Counter
+
+from components.engine import HeadlessGame
+from components.t0ken import Token
+from components.token_bag import TokenBag
+
+
+class Determinizer:
+    """
+    Samples completions of the hidden state of a game from public information.
+
+    What a player can see: the card catalogue, the active cards, every
+    player's cards and tokens, the board and the pile sizes. The unseen cards
+    of each level must therefore be in that level's pile, in unknown order,
+    and the bag holds whatever tokens are neither on the board nor held.
+    """
+
+    def __init__(self, game: HeadlessGame) -> None:
+        self.catalogue = game.deck.catalogue
+
+        seen = {card.card_id for cards in game.deck.active_cards.values() for card in cards}
+        for player in game.players:
+            seen.update(card.card_id for card in player.jewel_cards + player.prestige_cards)
+
+        self.levels = sorted(game.deck.piles)
+        self.unseen: dict[int, list[int]] = {
+            level: sorted(
+                card_id for card_id in self.catalogue.ids_by_level[level]
+                if card_id not in seen
+            )
+            for level in self.levels
+        }
+        for level in self.levels:
+            if len(self.unseen[level]) != len(game.deck.piles[level]):
+                raise ValueError(f"Pile {level} does not match the unseen cards of its level.")
+
+        tokens = Counter(TokenBag._fill_with_tokens())
+        tokens.subtract(
+            field.token for row in game.token_board.fields for field in row if field.token is not None
+        )
+        for player in game.players:
+            tokens.subtract(dict(zip(Token, player.tokens)))
+        self.bag_tokens: list[Token] = list(tokens.elements())
+
+    def sample(self, n: int, rng: random.Random) -> "DeterminizationBatch":
+        """Draw n independent pile orderings into one flat id buffer."""
+        ids = array("H")
+        scratch = [list(self.unseen[level]) for level in self.levels]
+        for _ in range(n):
+            for pile in scratch:
+                rng.shuffle(pile)
+                ids.extend(pile)
+        return DeterminizationBatch(self, ids, n)
+
+
+class DeterminizationBatch:
+    """N sampled hidden states; sample i is a slice of the shared id buffer."""
+
+    def __init__(self, determinizer: Determinizer, ids: array, n: int) -> None:
+        self.determinizer = determinizer
+        self.ids = ids
+        self.n = n
+        self.stride = sum(len(pile) for pile in determinizer.unseen.values())
+
+    def __len__(self) -> int:
+        return self.n
+
+    def apply(self, game: HeadlessGame, i: int) -> None:
+        """Overwrite the game's piles and bag with sample i, in place."""
+        determinizer = self.determinizer
+        offset = i * self.stride
+        for level in determinizer.levels:
+            size = len(determinizer.unseen[level])
+            game.deck.piles[level][:] = self.ids[offset:offset + size]
+            offset += size
+        game.token_bag.restore(determinizer.bag_tokens)
+
+
+def hidden_state(game: HeadlessGame) -> tuple[dict[int, list[int]], list[Token]]:
+    """Copy the piles and bag, to put the true hidden state back after sampling."""
+    return {level: list(pile) for level, pile in game.deck.piles.items()}, list(game.token_bag.tokens)
+
+
+def restore_hidden_state(game: HeadlessGame, state: tuple[dict[int, list[int]], list[Token]]) -> None:
+    piles, bag_tokens = state
+    for level, pile in piles.items():
+        game.deck.piles[level][:] = pile
+    game.token_bag.restore(bag_tokens)
@@ -0,0 +1,322 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional
+
+from components.action import Action, BuyCard, Pass, Replenish, TakeTokens, UndoRecord
+from components.catalogue import DEFAULT_CATALOGUE_PATH
+from components.deck import Deck
+from components.player import MAX_PRIVILEGES, MAX_TOKENS, Player
+from components.rng import GameRNG, seed_from_entropy
+from components.t0ken import TOKEN_INDEX, Token
+from components.token_bag import TokenBag
+from components.token_board import TokenBoard
+from components.zobrist import ZOBRIST, hash_game, hash_tokens
+
+if TYPE_CHECKING:
+    from components.game_record import GameRecorder
+
+TOKENS = list(Token)
+
+# An agent picks one of the legal actions for the player to move
+Agent = Callable[["HeadlessGame", list[Action]], Action]
+
+
+@dataclass(frozen=True, slots=True)
+class GameResult:
+    winner_index: Optional[int]  # None if the game hit the turn limit
+    winner_name: Optional[str]
+    win_condition: Optional[str]  # "crowns", "prestige", "color" or None
+    plies: int
+    crowns: tuple[int, ...]
+    prestige: tuple[int, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationReport:
+    results: list[GameResult]
+    elapsed: float  # seconds
+
+    @property
+    def games_per_second(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed else float("inf")
+
+
+def random_agent(rng: Optional[random.Random] = None) -> Agent:
+    """Build an agent that picks uniformly among the legal actions."""
+    choice = (rng or random.Random()).choice
+    return lambda game, actions: choice(actions)
+
+
+def _payment_tokens(payment: tuple[int, ...]) -> list[Token]:
+    """The tokens a payment count vector puts back in the bag, in enum order."""
+    return [TOKENS[i] for i, quantity in enumerate(payment) for _ in range(quantity)]
+
+
+class HeadlessGame:
+    """
+    Non-interactive game loop for bulk simulation.
+
+    Mirrors the PlayerTurn/EndTurn/GameOver states of `Game`, but players are
+    driven by agent callables, and nothing prints or sleeps.
+
+    Rules modelled:
+    - Take 1-3 tokens from fields in one line, up to MAX_TOKENS held.
+    - Buy an active card, paying after jewel bonuses with gold as a wildcard;
+      spent tokens return to the bag and the card slot is refilled.
+    - Replenish the board from the bag; the next player gains a privilege.
+    - Pass, only when nothing else is legal.
+    Card features are not modelled.
+
+    All chance (pile order, bag draws) comes from GameRNG(seed), so a game
+    replays exactly from its seed; one is drawn from entropy if not given.
+    """
+
+    def __init__(
+        self,
+        agents: list[Agent],
+        card_spec_file_path: str = DEFAULT_CATALOGUE_PATH,
+        max_plies: int = 200,
+        names: Optional[list[str]] = None,
+        seed: Optional[int] = None,
+        recorder: Optional["GameRecorder"] = None,
+    ) -> None:
+        self.agents = list(agents)
+        self.recorder = recorder  # Sees every ply played through player_turn
+        self.seed = seed if seed is not None else seed_from_entropy()
+        self.rng = GameRNG(self.seed)
+        self.max_plies = max_plies
+        self.players = [
+            Player(name, verbose=False)
+            for name in (names or [f"Player {i + 1}" for i in range(len(self.agents))])
+        ]
+        self.deck = Deck(card_spec_file_path, verbose=False, rng=self.rng.stream(0))
+        self.token_bag = TokenBag(self.rng.stream(1))
+        self.token_board = TokenBoard(verbose=False)
+        self.token_bag = self.token_board.replenish(self.token_bag)
+        self.current_player_index = 0
+        self.plies = 0
+        self.winner_index: Optional[int] = None
+        self.win_condition: Optional[str] = None
+        self.result: Optional[GameResult] = None
+        self.hash = hash_game(self)  # Zobrist hash, kept up to date by apply/undo
+
+    @property
+    def current_player(self) -> Player:
+        return self.players[self.current_player_index]
+
+    def legal_actions(self) -> list[Action]:
+        player = self.current_player
+        actions: list[Action] = []
+
+        room = MAX_TOKENS - sum(player.tokens)
+        if room > 0:
+            actions.extend(
+                TakeTokens(coords)
+                for coords in self.token_board.legal_selections(min(room, 3))
+            )
+
+        actions.extend(
+            BuyCard(card.level, card.card_id) for card in self.deck.affordable_cards(player)
+        )
+
+        if self.token_bag.tokens and any(
+            field.token is None for row in self.token_board.fields for field in row
+        ):
+            actions.append(Replenish())
+
+        return actions or [Pass()]
+
+    @property
+    def is_over(self) -> bool:
+        return self.winner_index is not None or self.plies >= self.max_plies
+
+    def apply(self, action: Action) -> UndoRecord:
+        """
+        Play one ply in place: perform the action for the player to move, check
+        their win condition and pass the turn on unless they won.
+
+        Returns the record that `undo` needs to roll the ply back, so search
+        can walk a single shared game instead of copying it per node.
+        """
+        player_index = self.current_player_index
+        player = self.players[player_index]
+        record = UndoRecord(action, player_index, hash=self.hash)
+        keys = ZOBRIST
+        h = self.hash ^ keys.side[player_index]
+
+        if isinstance(action, TakeTokens):
+            record.tokens = self.token_board.take_tokens(list(action.coords))
+            tokens, token_keys = player.tokens, keys.player_tokens[player_index]
+            for (row, col), token in zip(action.coords, record.tokens):
+                i = TOKEN_INDEX[token]
+                h ^= keys.board[(row - 1) * 5 + col - 1][i] ^ token_keys[i][tokens[i]]
+                tokens[i] += 1
+                h ^= token_keys[i][tokens[i]]
+
+        elif isinstance(action, BuyCard):
+            cards = self.deck.active_cards[action.level]
+            index = next(i for i, card in enumerate(cards) if card.card_id == action.card_id)
+            card = cards[index]
+            payment = player.payment_for(card)
+            if payment is None:
+                raise ValueError(f"{player.name} cannot afford {action}.")
+            tokens, token_keys = player.tokens, keys.player_tokens[player_index]
+            bag = self.token_bag
+            for i, quantity in enumerate(payment):
+                if quantity:
+                    token = TOKENS[i]
+                    held, in_bag = tokens[i], bag.count(token)
+                    h ^= token_keys[i][held] ^ token_keys[i][held - quantity]
+                    h ^= keys.bag[i][in_bag] ^ keys.bag[i][in_bag + quantity]
+            bag.add(_payment_tokens(payment))
+            player.spend_tokens(payment)
+            player.add_card(card, "jewel" if card.output else "prestige")
+            h ^= keys.active[card.card_id] ^ keys.player_cards[player_index][card.card_id]
+
+            pile = self.deck.piles[action.level]
+            h ^= keys.pile_size[action.level][len(pile)]
+            replacement = self.deck.pop(action.level)
+            h ^= keys.pile_size[action.level][len(pile)]
+            if replacement is not None:
+                cards[index] = replacement
+                h ^= keys.active[replacement.card_id]
+            else:
+                del cards[index]
+            record.payment, record.card, record.index = payment, card, index
+            record.replacement = replacement
+
+        elif isinstance(action, Replenish):
+            next_index = (player_index + 1) % len(self.players)
+            next_player = self.players[next_index]
+            record.bag_tokens = list(self.token_bag.tokens)
+            record.privileges = next_player.privileges
+            empty = [
+                (field.row, field.col)
+                for row in self.token_board.fields for field in row if field.token is None
+            ]
+            self.token_bag = self.token_board.replenish(self.token_bag)
+            record.filled = [
+                coord for coord in empty if self.token_board.fields[coord[0] - 1][coord[1] - 1].token is not None
+            ]
+            for row, col in record.filled:
+                token = self.token_board.fields[row - 1][col - 1].token
+                h ^= keys.board[(row - 1) * 5 + col - 1][TOKEN_INDEX[token]]
+            h ^= hash_tokens(keys.bag, record.bag_tokens)
+            h ^= hash_tokens(keys.bag, self.token_bag.tokens)
+            h ^= keys.privileges[next_index][next_player.privileges]
+            next_player.privileges = min(next_player.privileges + 1, MAX_PRIVILEGES)
+            h ^= keys.privileges[next_index][next_player.privileges]
+
+        self.plies += 1
+        condition = player.win_condition()
+        if condition is not None:
+            self.winner_index = player_index
+            self.win_condition = condition
+        else:
+            self.current_player_index = (player_index + 1) % len(self.players)
+        self.hash = h ^ keys.side[self.current_player_index]
+
+        return record
+
+    def undo(self, record: UndoRecord) -> None:
+        """Roll back the ply that produced `record`; undo in reverse order."""
+        action = record.action
+        player = self.players[record.player_index]
+        self.current_player_index = record.player_index
+        self.winner_index = None
+        self.win_condition = None
+        self.plies -= 1
+        self.hash = record.hash
+
+        if isinstance(action, TakeTokens):
+            for token in record.tokens:
+                player.tokens[TOKEN_INDEX[token]] -= 1
+            for (row, col), token in zip(action.coords, record.tokens):
+                self.token_board.fields[row - 1][col - 1].token = token
+
+        elif isinstance(action, BuyCard):
+            cards = self.deck.active_cards[action.level]
+            if record.replacement is not None:
+                self.deck.piles[action.level].append(record.replacement.card_id)
+                cards[record.index] = record.card
+            else:
+                cards.insert(record.index, record.card)
+            player.remove_card(record.card)
+            self.token_bag.remove(_payment_tokens(record.payment))
+            for i, quantity in enumerate(record.payment):
+                player.tokens[i] += quantity
+
+        elif isinstance(action, Replenish):
+            for row, col in record.filled:
+                self.token_board.fields[row - 1][col - 1].token = None
+            self.token_bag.restore(record.bag_tokens)
+            self.players[(record.player_index + 1) % len(self.players)].privileges = record.privileges
+
+    def player_turn(self) -> str:
+        """Let the current player's agent act and check the win condition."""
+        action = self.agents[self.current_player_index](self, self.legal_actions())
+        if self.recorder is not None:
+            self.recorder.record_ply(self, action)
+        self.apply(action)
+        return "GameOver" if self.winner_index is not None else "EndTurn"
+
+    def end_turn(self) -> str:
+        """End the turn (apply already passed it on), stopping at the ply limit."""
+        if self.plies >= self.max_plies:
+            return "GameOver"
+        return "PlayerTurn"
+
+    def game_over(self) -> None:
+        """Record the structured result of the game."""
+        self.result = GameResult(
+            winner_index=self.winner_index,
+            winner_name=None if self.winner_index is None else self.players[self.winner_index].name,
+            win_condition=self.win_condition,
+            plies=self.plies,
+            crowns=tuple(player.calculate_crowns() for player in self.players),
+            prestige=tuple(player.calculate_prestige() for player in self.players),
+        )
+        if self.recorder is not None:
+            self.recorder.finish(self)
+        return None
+
+    def play(self) -> GameResult:
+        """Drive the state machine until the game is over."""
+        states = {
+            "PlayerTurn": self.player_turn,
+            "EndTurn": self.end_turn,
+            "GameOver": self.game_over,
+        }
+        state = "PlayerTurn"
+        while state is not None:
+            state = states[state]()
+        return self.result
+
+
+def run_games(
+    n_games: int,
+    make_agents: Callable[[], list[Agent]],
+    card_spec_file_path: str = DEFAULT_CATALOGUE_PATH,
+    max_plies: int = 200,
+    seed: Optional[int] = None,
+) -> SimulationReport:
+    """
+    Play n_games headless games back to back and time them. With a seed,
+    game i is seeded from stream i of GameRNG(seed), so the run replays.
+    """
+    start = time.perf_counter()
+    streams = GameRNG(seed)
+    results = [
+        HeadlessGame(
+            make_agents(), card_spec_file_path, max_plies, seed=streams.stream(i).getrandbits(64)
+        ).play()
+        for i in range(n_games)
+    ]
+    return SimulationReport(results, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    report = run_games(1000, lambda: [random_agent(), random_agent()])
+    print(f"{len(report.results)} games in {report.elapsed:.2f}s "
+          f"({report.games_per_second:.1f} games/sec)")
@@ -0,0 +1,146 @@
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from components.engine import HeadlessGame
+from components.features import N_TOKENS, FeatureEncoder
+
+Layer = tuple[np.ndarray, np.ndarray]  # (weights, bias)
+
+
+class BatchEvaluator:
+    """
+    Small MLP (or linear model, with a single layer) scoring a batch of encoded
+    positions in one matrix product per layer: ReLU between layers, tanh on
+    the output. Values are in (-1, 1) for the player to move.
+
+    Weights are stored as an .npz file with arrays W0, b0, W1, b1, ...
+    """
+
+    def __init__(self, layers: list[Layer]) -> None:
+        if not layers or layers[-1][0].shape[1] != 1:
+            raise ValueError("The last layer must have a single output.")
+        for (weights, _), (next_weights, _) in zip(layers, layers[1:]):
+            if weights.shape[1] != next_weights.shape[0]:
+                raise ValueError(f"Layer shapes {weights.shape} and {next_weights.shape} do not chain.")
+        self.layers = [
+            (np.ascontiguousarray(weights, dtype=np.float32), np.asarray(bias, dtype=np.float32))
+            for weights, bias in layers
+        ]
+
+    @property
+    def input_size(self) -> int:
+        return self.layers[0][0].shape[0]
+
+    @classmethod
+    def from_file(cls, path: str) -> "BatchEvaluator":
+        with np.load(path) as data:
+            n_layers = sum(1 for name in data.files if name.startswith("W"))
+            return cls([(data[f"W{i}"], data[f"b{i}"]) for i in range(n_layers)])
+
+    def save(self, path: str) -> None:
+        arrays = {}
+        for i, (weights, bias) in enumerate(self.layers):
+            arrays[f"W{i}"], arrays[f"b{i}"] = weights, bias
+        np.savez(path, **arrays)
+
+    @classmethod
+    def random(cls, sizes: list[int], rng: np.random.Generator) -> "BatchEvaluator":
+        """He-initialised MLP with the given layer sizes (input first, 1 last)."""
+        return cls([
+            (rng.normal(0, np.sqrt(2 / n_in), (n_in, n_out)), np.zeros(n_out))
+            for n_in, n_out in zip(sizes, sizes[1:])
+        ])
+
+    @classmethod
+    def progress_heuristic(cls, encoder: FeatureEncoder) -> "BatchEvaluator":
+        """
+        Linear stand-in until trained weights exist: the difference in progress
+        towards the prestige and crown goals, like search.evaluate.
+        """
+        weights = np.zeros((encoder.size, 1), dtype=np.float32)
+        seat_size = 3 * N_TOKENS + 3
+        start = encoder.offsets["players"].start
+        for seat, sign in ((0, 1.0), (1, -1.0)):
+            crowns = start + seat * seat_size + 3 * N_TOKENS
+            weights[crowns, 0] = sign / 10
+            weights[crowns + 1, 0] = sign / 20
+        return cls([(weights * 2, np.zeros(1))])
+
+    def __call__(self, features: np.ndarray) -> np.ndarray:
+        x = features
+        for weights, bias in self.layers[:-1]:
+            x = np.maximum(x @ weights + bias, 0)
+        weights, bias = self.layers[-1]
+        return np.tanh(x @ weights + bias)[:, 0]
+
+
+class EvaluationQueue:
+    """
+    Coalesces leaf evaluation requests from search into batches.
+
+    `submit` copies the position's integer state at once (the search goes on
+    to mutate the game) and queues a callback; the queue is flushed through
+    the evaluator when it holds `max_batch` requests or its oldest request is
+    `max_delay` seconds old, and always on `flush()`. Searches must flush
+    before they read their statistics.
+    """
+
+    def __init__(
+        self,
+        evaluator: BatchEvaluator,
+        encoder: FeatureEncoder,
+        max_batch: int = 64,
+        max_delay: float = 0.005,
+    ) -> None:
+        if evaluator.input_size != encoder.size:
+            raise ValueError(f"Evaluator expects {evaluator.input_size} features, encoder gives {encoder.size}.")
+        self.evaluator = evaluator
+        self.encoder = encoder
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.states: list[tuple] = []
+        self.callbacks: list[Callable[[float], None]] = []
+        self.oldest = 0.0
+        self.buffer = np.empty((max_batch, encoder.size), dtype=np.float32)
+        self.batches = 0
+        self.evaluations = 0
+
+    def submit(self, game: HeadlessGame, callback: Callable[[float], None]) -> None:
+        """Queue the position; callback gets its value for the player to move."""
+        if not self.states:
+            self.oldest = time.perf_counter()
+        self.states.append(self.encoder.gather(game))
+        self.callbacks.append(callback)
+        if len(self.states) >= self.max_batch or time.perf_counter() - self.oldest >= self.max_delay:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.states:
+            return
+        states, callbacks = self.states, self.callbacks
+        self.states, self.callbacks = [], []
+        buffer = self.buffer if len(states) <= len(self.buffer) else None
+        values = self.evaluator(self.encoder.expand(states, buffer))
+        self.batches += 1
+        self.evaluations += len(states)
+        for callback, value in zip(callbacks, values.tolist()):
+            callback(value)
+
+    def evaluate(self, games: list[HeadlessGame]) -> np.ndarray:
+        """Score positions right away, bypassing the queue."""
+        return self.evaluator(self.encoder.encode_batch(games))
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.evaluations / self.batches if self.batches else 0.0
+
+
+def default_queue(game: HeadlessGame, weights_path: Optional[str] = None, **options) -> EvaluationQueue:
+    """Queue over the game's catalogue, with weights from a file or the progress heuristic."""
+    encoder = FeatureEncoder(game.deck.catalogue, len(game.players))
+    evaluator = (
+        BatchEvaluator.from_file(weights_path) if weights_path else BatchEvaluator.progress_heuristic(encoder)
+    )
+    return EvaluationQueue(evaluator, encoder, **options)
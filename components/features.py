@@ -0,0 +1,141 @@
+from typing import Optional
+
+import numpy as np
+
+from components.action import Action, BuyCard, Pass, Replenish, TakeTokens
+from components.catalogue import Catalogue
+from components.deck import Deck
+from components.engine import HeadlessGame
+from components.t0ken import TOKEN_INDEX, Token
+from components.token_selection import TOKEN_SELECTIONS
+
+N_TOKENS = len(Token)
+N_CELLS = 25
+
+# Fixed action space for policy targets: every token selection, every card
+# (by id), then Replenish and Pass.
+SELECTION_INDEX = {tuple(sorted(coords)): i for i, (coords, _) in enumerate(TOKEN_SELECTIONS)}
+
+
+def action_space_size(catalogue: Catalogue) -> int:
+    return len(TOKEN_SELECTIONS) + len(catalogue) + 2
+
+
+def action_index(action: Action, catalogue: Catalogue) -> int:
+    if isinstance(action, TakeTokens):
+        return SELECTION_INDEX[tuple(sorted(action.coords))]
+    if isinstance(action, BuyCard):
+        return len(TOKEN_SELECTIONS) + action.card_id
+    if isinstance(action, Replenish):
+        return len(TOKEN_SELECTIONS) + len(catalogue)
+    if isinstance(action, Pass):
+        return len(TOKEN_SELECTIONS) + len(catalogue) + 1
+    raise ValueError(f"Unknown action {action!r}.")
+
+
+def _card_features(catalogue: Catalogue) -> np.ndarray:
+    """
+    One row per card id plus a final all-zero row for an empty slot:
+    present, points, crowns, requirement counts, bonus counts.
+    """
+    rows = np.zeros((len(catalogue) + 1, 3 + 2 * N_TOKENS), dtype=np.float32)
+    for card in catalogue.cards:
+        rows[card.card_id, :3] = (1, card.points, card.crowns)
+        rows[card.card_id, 3:3 + N_TOKENS] = card.requirement_vector
+        rows[card.card_id, 3 + N_TOKENS:] = card.bonus_vector
+    return rows
+
+
+class FeatureEncoder:
+    """
+    Encodes positions as fixed-length float32 vectors, seen from the player to
+    move (their seat first, then the others in turn order).
+
+    Layout, in order:
+      board        one-hot token color per cell (25 x 7)
+      bag          token counts (7)
+      active cards per slot: present, points, crowns, requirements, bonuses
+                   (slots per level as dealt by Deck)
+      piles        cards left per level
+      players      per seat: tokens, bonuses, color prestige (7 each),
+                   crowns, prestige, privileges
+      progress     plies / max_plies
+
+    Encoding is split in two: `gather` copies the small integer state of a
+    game and `expand` turns a batch of those into rows with NumPy, so the
+    per-game Python work is a few list copies.
+    """
+
+    def __init__(self, catalogue: Catalogue, n_players: int = 2) -> None:
+        self.catalogue = catalogue
+        self.n_players = n_players
+        self.levels = list(catalogue.ids_by_level)
+        self.slots = [Deck._get_max_card_count(level) for level in self.levels]
+        self.card_features = _card_features(catalogue)
+        self.board_one_hot = np.eye(N_TOKENS + 1, dtype=np.float32)[:, 1:]  # Row 0 is an empty cell
+        self.empty_card = len(catalogue)
+
+        sizes = {
+            "board": N_CELLS * N_TOKENS,
+            "bag": N_TOKENS,
+            "cards": sum(self.slots) * self.card_features.shape[1],
+            "piles": len(self.levels),
+            "players": n_players * (3 * N_TOKENS + 3),
+            "progress": 1,
+        }
+        self.offsets: dict[str, slice] = {}
+        offset = 0
+        for name, size in sizes.items():
+            self.offsets[name] = slice(offset, offset + size)
+            offset += size
+        self.size = offset
+
+    def encode(self, game: HeadlessGame) -> np.ndarray:
+        return self.encode_batch([game])[0]
+
+    def encode_batch(self, games: list[HeadlessGame], out: Optional[np.ndarray] = None) -> np.ndarray:
+        return self.expand([self.gather(game) for game in games], out)
+
+    def gather(self, game: HeadlessGame) -> tuple:
+        """
+        Copy the integer state the features are built from. Cheap enough to
+        take at every search leaf; `expand` turns a batch of them into rows.
+        """
+        board = [
+            0 if field.token is None else TOKEN_INDEX[field.token] + 1
+            for row in game.token_board.fields for field in row
+        ]
+        bag = [0] * N_TOKENS
+        for token in game.token_bag.tokens:
+            bag[TOKEN_INDEX[token]] += 1
+        cards = []
+        piles = []
+        for i, level in enumerate(self.levels):
+            active = game.deck.active_cards[level]
+            cards += [card.card_id for card in active]
+            cards += [self.empty_card] * (self.slots[i] - len(active))
+            piles.append(len(game.deck.piles[level]))
+        players = []
+        seats = len(game.players)
+        for seat in range(self.n_players):
+            player = game.players[(game.current_player_index + seat) % seats]
+            players += player.tokens + player.bonuses + player.color_prestige
+            players += [player.crowns, player.prestige, player.privileges]
+        return board, bag, cards, piles, players, game.plies / game.max_plies
+
+    def expand(self, states: list[tuple], out: Optional[np.ndarray] = None) -> np.ndarray:
+        n = len(states)
+        if out is None:
+            out = np.empty((n, self.size), dtype=np.float32)
+        if not n:
+            return out[:0]
+        board, bag, cards, piles, players, progress = zip(*states)
+
+        view = out[:n]
+        view[:, self.offsets["board"]] = self.board_one_hot[np.array(board, dtype=np.int64)].reshape(n, -1)
+        view[:, self.offsets["bag"]] = bag
+        view[:, self.offsets["cards"]] = self.card_features[np.array(cards, dtype=np.int64)].reshape(n, -1)
+        view[:, self.offsets["piles"]] = piles
+        view[:, self.offsets["players"]] = players
+        view[:, self.offsets["progress"]] = np.array(progress, dtype=np.float32)[:, None]
+        return view
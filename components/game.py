@@ -3,47 +3,19 @@ from components.deck import Deck
 from components.t0ken import Token
 from components.token_bag import TokenBag
 from components.token_board import TokenBoard
+from components.rng import GameRNG
 
-import hashlib
-import datetime
-from secrets import randbelow
+from typing import Optional
 from tqdm import tqdm
-import time
-
-
-def resolve_n_player(players, n):
-    #This is extra security to prevent Alina from using the random() function because she can hack that. 
-    print(f"Resolving who goes {n}...")
-
-    # Step 1: Get the current day of the year and approximate moon phase
-    today = datetime.date.today()
-    day_of_year = today.timetuple().tm_yday
-    moon_phase = day_of_year % 30  # Approximate moon phase (0-29)
-
-    # Step 2: Use the length of the players' names as entropy
-    name_lengths = [len(player.name) for player in players]
-
-    # Step 3: Add cryptographic randomness
-    crypto_random = randbelow(100)
-
-    # Step 4: Create a weird hash
-    seed_string = f"{today}-{moon_phase}-{name_lengths}-{crypto_random}"
-    hash_value = int(hashlib.sha256(seed_string.encode()).hexdigest(), 16)
-
-    # Step 5: Determine first player based on hash parity
-    first_player_index = hash_value % len(players)
-    first_player = players[first_player_index]
-
-    print(f"{first_player.name}")
-    return first_player
 
 
 class Game:
-    def __init__(self, card_spec_file_path: str = "../resources/deck/deck.json"):
+    def __init__(self, card_spec_file_path: str = "../resources/deck/deck.json", seed: Optional[int] = None):
         self.player_count = 4
+        self.rng = GameRNG(seed)
         self.players = self.add_players()
-        self.deck = Deck(card_spec_file_path)
-        self.token_bag = TokenBag()
+        self.deck = Deck(card_spec_file_path, rng=self.rng.stream(0))
+        self.token_bag = TokenBag(self.rng.stream(1))
         self.token_board = TokenBoard()
 
     def add_players(self) -> list[Player]:
@@ -59,15 +31,8 @@ class Game:
         return players
 
     def resolve_player_order(self, players: list[Player]) -> list[Player]:
-        player_order_list = []
-
-        # Step 6: Unbearable pause
-        # Progress bar before revealing
-        while len(player_order_list) < self.player_count:
-            player = resolve_n_player(players, len(player_order_list)+1)
-            if player not in player_order_list: 
-                player_order_list.append(player)
-                time.sleep(0.5)
+        player_order_list = list(players)
+        self.rng.stream(2).shuffle(player_order_list)
         return player_order_list
 
     def player_turn(self, context):
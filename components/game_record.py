@@ -0,0 +1,345 @@
+import mmap
+import os
+import struct
+from typing import Iterator, Optional
+
+from components.action import Action, BuyCard, Pass, Replenish, TakeTokens
+from components.catalogue import DEFAULT_CATALOGUE_PATH, load_catalogue
+from components.engine import HeadlessGame
+from components.player import Player
+from components.t0ken import TOKEN_INDEX, Token
+from components.token_selection import TOKEN_SELECTIONS
+from components.zobrist import hash_game
+
+# Record file layout (little endian):
+#   file header  magic, format version, catalogue version
+#   games        one self-contained block per game, appended as games finish
+# Game block:
+#   header       block size, seed, plies, players, snapshot interval,
+#                winner (-1 for none), win condition code, action bytes, snapshot count
+#   index        (ply, action offset, snapshot offset) per snapshot
+#   actions      one u16 per ply: kind in the top 2 bits, payload below;
+#                Replenish is followed by the bag RNG counter as a varint
+#   snapshots    full positions every `snapshot_interval` plies
+RECORD_MAGIC = b"SDGR"
+RECORD_FORMAT = 1
+FILE_HEADER = struct.Struct("<4sHI")
+GAME_HEADER = struct.Struct("<IQHBBbBIH")
+SNAPSHOT_ENTRY = struct.Struct("<HII")
+ACTION = struct.Struct("<H")
+
+TAKE, BUY, REPLENISH, PASS = range(4)
+KIND_SHIFT = 14
+PAYLOAD_MASK = (1 << KIND_SHIFT) - 1
+WIN_CONDITIONS = (None, "crowns", "prestige", "color")  # Index is the stored code
+TOKENS = list(Token)
+
+# Selections keyed by sorted coordinates, so pick order does not matter
+SELECTION_INDEX = {tuple(sorted(coords)): i for i, (coords, _) in enumerate(TOKEN_SELECTIONS)}
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, offset: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def encode_action(out: bytearray, game: HeadlessGame, action: Action) -> None:
+    """Append one ply, read before the action is applied to `game`."""
+    if isinstance(action, TakeTokens):
+        out += ACTION.pack(TAKE << KIND_SHIFT | SELECTION_INDEX[tuple(sorted(action.coords))])
+    elif isinstance(action, BuyCard):
+        out += ACTION.pack(BUY << KIND_SHIFT | action.level << 8 | action.card_id)
+    elif isinstance(action, Replenish):
+        # Search may have advanced the bag's RNG, so note where the shuffle drew from
+        out += ACTION.pack(REPLENISH << KIND_SHIFT)
+        _write_varint(out, game.token_bag.rng.counter)
+    else:
+        out += ACTION.pack(PASS << KIND_SHIFT)
+
+
+def decode_actions(data, offset: int = 0, end: Optional[int] = None) -> Iterator[tuple[Action, Optional[int]]]:
+    """Yield (action, bag RNG counter or None) for each ply in data[offset:end]."""
+    end = len(data) if end is None else end
+    while offset < end:
+        (code,) = ACTION.unpack_from(data, offset)
+        offset += ACTION.size
+        kind, payload = code >> KIND_SHIFT, code & PAYLOAD_MASK
+        if kind == TAKE:
+            yield TakeTokens(TOKEN_SELECTIONS[payload][0]), None
+        elif kind == BUY:
+            yield BuyCard(payload >> 8, payload & 0xFF), None
+        elif kind == REPLENISH:
+            counter, offset = _read_varint(data, offset)
+            yield Replenish(), counter
+        else:
+            yield Pass(), None
+
+
+def encode_snapshot(out: bytearray, game: HeadlessGame) -> None:
+    """Append the full position: board, bag (in order), deck and players."""
+    out += struct.pack("<HB", game.plies, game.current_player_index)
+    out += bytes(
+        0 if field.token is None else TOKEN_INDEX[field.token] + 1
+        for row in game.token_board.fields for field in row
+    )
+    bag = game.token_bag.tokens
+    out.append(len(bag))
+    out += bytes(TOKEN_INDEX[token] for token in bag)
+    _write_varint(out, game.token_bag.rng.counter)
+    for level in sorted(game.deck.piles):
+        pile, active = game.deck.piles[level], game.deck.active_cards[level]
+        out.append(len(pile))
+        out += bytes(pile)
+        out.append(len(active))
+        out += bytes(card.card_id for card in active)
+    for player in game.players:
+        out += bytes(player.tokens)
+        out.append(player.privileges)
+        for cards in (player.jewel_cards, player.prestige_cards):
+            out.append(len(cards))
+            out += bytes(card.card_id for card in cards)
+
+
+def restore_snapshot(game: HeadlessGame, data, offset: int) -> None:
+    """Overwrite a game built from the same seed with a snapshot."""
+    game.plies, game.current_player_index = struct.unpack_from("<HB", data, offset)
+    offset += 3
+    for i, field in enumerate(field for row in game.token_board.fields for field in row):
+        code = data[offset + i]
+        field.token = None if code == 0 else TOKENS[code - 1]
+    offset += 25
+    size = data[offset]
+    game.token_bag.restore([TOKENS[i] for i in data[offset + 1:offset + 1 + size]])
+    counter, offset = _read_varint(data, offset + 1 + size)
+    game.token_bag.rng.setstate((game.token_bag.rng.key, counter))
+
+    catalogue = game.deck.catalogue
+    for level in sorted(game.deck.piles):
+        size = data[offset]
+        game.deck.piles[level] = list(data[offset + 1:offset + 1 + size])
+        offset += 1 + size
+        size = data[offset]
+        game.deck.active_cards[level] = [catalogue[i] for i in data[offset + 1:offset + 1 + size]]
+        offset += 1 + size
+
+    for p, old in enumerate(game.players):
+        player = game.players[p] = Player(old.name, verbose=False)
+        player.tokens = list(data[offset:offset + len(Token)])
+        player.privileges = data[offset + len(Token)]
+        offset += len(Token) + 1
+        for kind in ("jewel", "prestige"):
+            size = data[offset]
+            for card_id in data[offset + 1:offset + 1 + size]:
+                player.add_card(catalogue[card_id], kind)
+            offset += 1 + size
+
+    game.winner_index = game.win_condition = None
+    game.hash = hash_game(game)
+
+
+class GameRecorder:
+    """
+    Collects one game's plies while it is played; attach it to a HeadlessGame
+    and it hands the finished block to its writer at game over.
+    """
+
+    def __init__(self, writer: "GameRecordWriter", snapshot_interval: int = 16) -> None:
+        if not 0 < snapshot_interval < 256:
+            raise ValueError("Snapshot interval must be between 1 and 255 plies.")
+        self.writer = writer
+        self.snapshot_interval = snapshot_interval
+        self.actions = bytearray()
+        self.snapshots = bytearray()
+        self.index: list[tuple[int, int, int]] = []
+
+    def record_ply(self, game: HeadlessGame, action: Action) -> None:
+        if game.plies and game.plies % self.snapshot_interval == 0:
+            self.index.append((game.plies, len(self.actions), len(self.snapshots)))
+            encode_snapshot(self.snapshots, game)
+        encode_action(self.actions, game, action)
+
+    def finish(self, game: HeadlessGame) -> None:
+        index = b"".join(SNAPSHOT_ENTRY.pack(*entry) for entry in self.index)
+        size = GAME_HEADER.size + len(index) + len(self.actions) + len(self.snapshots)
+        header = GAME_HEADER.pack(
+            size, game.seed, game.plies, len(game.players), self.snapshot_interval,
+            -1 if game.winner_index is None else game.winner_index,
+            WIN_CONDITIONS.index(game.win_condition), len(self.actions), len(self.index),
+        )
+        self.writer.write(header + index + self.actions + self.snapshots)
+        self.actions, self.snapshots, self.index = bytearray(), bytearray(), []
+
+
+class GameRecordWriter:
+    """Appends game blocks to a record file, creating it with a header if needed."""
+
+    def __init__(self, path: str, catalogue_version: int, snapshot_interval: int = 16) -> None:
+        self.path = path
+        self.catalogue_version = catalogue_version
+        self.snapshot_interval = snapshot_interval
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER.pack(RECORD_MAGIC, RECORD_FORMAT, catalogue_version))
+        else:
+            with open(path, "rb") as existing:
+                _check_header(existing.read(FILE_HEADER.size), path, catalogue_version)
+        self.games = 0
+
+    def recorder(self) -> GameRecorder:
+        return GameRecorder(self, self.snapshot_interval)
+
+    def write(self, block: bytes) -> None:
+        self.file.write(block)
+        self.games += 1
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _check_header(data: bytes, path: str, catalogue_version: Optional[int] = None) -> int:
+    if len(data) < FILE_HEADER.size:
+        raise ValueError(f"{path} is not a game record file.")
+    magic, file_format, version = FILE_HEADER.unpack_from(data)
+    if magic != RECORD_MAGIC or file_format != RECORD_FORMAT:
+        raise ValueError(f"{path} is not a game record file (format {RECORD_FORMAT}).")
+    if catalogue_version is not None and version != catalogue_version:
+        raise ValueError(f"{path} was recorded with catalogue {version:#x}, not {catalogue_version:#x}.")
+    return version
+
+
+class GameRecord:
+    """One game block, decoded lazily from a view of the record file."""
+
+    def __init__(self, data: memoryview) -> None:
+        (
+            _, self.seed, self.plies, self.n_players, self.snapshot_interval,
+            winner, condition, actions_size, n_snapshots,
+        ) = GAME_HEADER.unpack_from(data)
+        self.winner_index: Optional[int] = None if winner < 0 else winner
+        self.win_condition: Optional[str] = WIN_CONDITIONS[condition]
+        self.data = data
+        self.index = [
+            SNAPSHOT_ENTRY.unpack_from(data, GAME_HEADER.size + i * SNAPSHOT_ENTRY.size)
+            for i in range(n_snapshots)
+        ]
+        self.actions_start = GAME_HEADER.size + n_snapshots * SNAPSHOT_ENTRY.size
+        self.snapshots_start = self.actions_start + actions_size
+
+    def actions(self) -> Iterator[Action]:
+        for action, _ in decode_actions(self.data, self.actions_start, self.snapshots_start):
+            yield action
+
+    def replay(self, ply: Optional[int] = None, card_spec_file_path: str = DEFAULT_CATALOGUE_PATH) -> HeadlessGame:
+        """
+        Rebuild the position after `ply` plies (the final one by default),
+        starting from the nearest snapshot at or before it.
+        """
+        ply = self.plies if ply is None else ply
+        if not 0 <= ply <= self.plies:
+            raise ValueError(f"Ply {ply} is outside this game (0-{self.plies}).")
+        game = HeadlessGame([None] * self.n_players, card_spec_file_path, seed=self.seed)
+        action_offset = self.actions_start
+        for snapshot_ply, snapshot_action_offset, snapshot_offset in reversed(self.index):
+            if snapshot_ply <= ply:
+                restore_snapshot(game, self.data, self.snapshots_start + snapshot_offset)
+                action_offset = self.actions_start + snapshot_action_offset
+                break
+
+        rng = game.token_bag.rng
+        for action, counter in decode_actions(self.data, action_offset, self.snapshots_start):
+            if game.plies == ply:
+                break
+            if counter is not None:
+                rng.setstate((rng.key, counter))
+            game.apply(action)
+        return game
+
+    def positions(self, card_spec_file_path: str = DEFAULT_CATALOGUE_PATH) -> Iterator[HeadlessGame]:
+        """
+        Yield the position before the first ply and after every ply, replaying
+        forward once. The same game object is yielded each time, mutated in place.
+        """
+        game = HeadlessGame([None] * self.n_players, card_spec_file_path, seed=self.seed)
+        rng = game.token_bag.rng
+        yield game
+        for action, counter in decode_actions(self.data, self.actions_start, self.snapshots_start):
+            if counter is not None:
+                rng.setstate((rng.key, counter))
+            game.apply(action)
+            yield game
+
+
+class GameRecordReader:
+    """
+    Streams the games of a record file through mmap, so memory stays bounded
+    however many games it holds. Games are views into the mapping; use the
+    reader as a context manager and drop the records before it closes.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.catalogue_version = _check_header(self.map[:FILE_HEADER.size], path)
+
+    def check_catalogue(self, card_spec_file_path: str = DEFAULT_CATALOGUE_PATH) -> None:
+        version = load_catalogue(card_spec_file_path).version
+        if version != self.catalogue_version:
+            raise ValueError(
+                f"{self.path} was recorded with catalogue {self.catalogue_version:#x}, not {version:#x}."
+            )
+
+    def offsets(self) -> Iterator[int]:
+        """Byte offset of every complete game block, skipping a torn last write."""
+        offset, end = FILE_HEADER.size, len(self.map)
+        while offset + 4 <= end:
+            (size,) = struct.unpack_from("<I", self.map, offset)
+            if offset + size > end:
+                break
+            yield offset
+            offset += size
+
+    def game_at(self, offset: int) -> GameRecord:
+        (size,) = struct.unpack_from("<I", self.map, offset)
+        return GameRecord(memoryview(self.map)[offset:offset + size])
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for offset in self.offsets():
+            yield self.game_at(offset)
+
+    def close(self) -> None:
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self) -> "GameRecordReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def record_path(directory: str) -> str:
+    """Per-process record file, so parallel workers never share a file."""
+    return os.path.join(directory, f"games-{os.getpid()}.sdgr")
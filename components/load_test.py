@@ -0,0 +1,207 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from components.server import GameServer
+
+
+@dataclass
+class LoadTestReport:
+    """Client-side view of a load test; latencies run from sending a move to the next state."""
+    clients: int
+    games: int = 0
+    moves: int = 0
+    errors: int = 0
+    latencies: list[float] = field(default_factory=list)  # seconds
+    elapsed: float = 0.0  # seconds
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(int(q / 100 * len(ordered)), len(ordered) - 1)]
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+
+    @property
+    def moves_per_second(self) -> float:
+        return self.moves / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class CapacityReport:
+    """Result of a ramp: the largest client count whose p99 met the target."""
+    p99_target: float  # seconds
+    cores: int  # Available to the server process
+    clients: int = 0  # 0 if even the smallest step missed the target
+    steps: list[LoadTestReport] = field(default_factory=list)
+
+    @property
+    def sessions_per_core(self) -> float:
+        return self.clients / self.cores
+
+
+async def simulated_player(
+    host: str,
+    port: int,
+    report: LoadTestReport,
+    games: int = 1,
+    opponent: Optional[dict] = None,
+    think_time: float = 0.0,
+    rng: Optional[random.Random] = None,
+) -> None:
+    """Play whole games with uniformly random legal moves, timing every reply."""
+    rng = rng or random.Random()
+    for _ in range(games):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            join = {"op": "join", "name": "load-test", "opponent": opponent or {"kind": "random"}}
+            writer.write(json.dumps(join).encode() + b"\n")
+            sent: Optional[float] = None
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if sent is not None:
+                    report.latencies.append(time.perf_counter() - sent)
+                    sent = None
+                message = json.loads(line)
+                if message["type"] == "over":
+                    report.games += 1
+                    break
+                if message["type"] == "error":
+                    report.errors += 1
+                    break
+                if think_time:
+                    await asyncio.sleep(rng.expovariate(1 / think_time))
+                move = {"op": "move", "action": rng.choice(message["legal"])}
+                writer.write(json.dumps(move).encode() + b"\n")
+                await writer.drain()
+                sent = time.perf_counter()
+                report.moves += 1
+        finally:
+            writer.close()
+
+
+async def load_test(
+    clients: int,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    games_per_client: int = 1,
+    opponent: Optional[dict] = None,
+    think_time: float = 0.0,
+    seed: int = 0,
+    **server_options,
+) -> LoadTestReport:
+    """
+    Run `clients` concurrent simulated players. With port 0 a GameServer is
+    started in this process on a free port (server_options go to it);
+    otherwise the players connect to the server already at host:port.
+    """
+    report = LoadTestReport(clients)
+    server = None
+    if port == 0:
+        server = GameServer(host, 0, **server_options)
+        await server.start()
+        port = server.port
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            simulated_player(host, port, report, games_per_client, opponent, think_time,
+                             random.Random(rng.getrandbits(64)))
+            for _ in range(clients)
+        ))
+    finally:
+        report.elapsed = time.perf_counter() - start
+        if server is not None:
+            await server.close()
+    return report
+
+
+def _serve(host: str, ports: multiprocessing.Queue, stop: multiprocessing.Event, server_options: dict) -> None:
+    """Server process: report the bound port, then serve until stop is set."""
+    async def serve() -> None:
+        async with GameServer(host, 0, **server_options) as server:
+            ports.put(server.port)
+            await asyncio.get_running_loop().run_in_executor(None, stop.wait)
+    asyncio.run(serve())
+
+
+def find_capacity(
+    p99_target: float,
+    start: int = 10,
+    max_clients: int = 1000,
+    resolution: float = 0.1,
+    host: str = "127.0.0.1",
+    games_per_client: int = 1,
+    opponent: Optional[dict] = None,
+    think_time: float = 0.0,
+    seed: int = 0,
+    **server_options,
+) -> CapacityReport:
+    """
+    Find the most concurrent clients the server holds at a p99 latency of
+    p99_target seconds without errors. The server runs in its own process
+    (server_options go to it) so the simulated players do not share its
+    event loop. Client counts double from start until a step misses the
+    target, then bisect until the bracket is within `resolution` of its
+    lower end.
+    """
+    context = multiprocessing.get_context("spawn")
+    ports, stop = context.Queue(), context.Event()
+    process = context.Process(target=_serve, args=(host, ports, stop, server_options))
+    process.start()
+    try:
+        port = ports.get(timeout=60)
+        capacity = CapacityReport(p99_target, os.cpu_count() or 1)
+
+        def meets_target(clients: int) -> bool:
+            report = asyncio.run(load_test(
+                clients, host, port, games_per_client, opponent, think_time, seed + len(capacity.steps),
+            ))
+            capacity.steps.append(report)
+            return not report.errors and report.p99 <= p99_target
+
+        low, high = 0, None  # Largest passing and smallest failing client counts
+        clients = start
+        while clients <= max_clients and meets_target(clients):
+            low, clients = clients, clients * 2
+        if clients <= max_clients:
+            high = clients
+        while high is not None and high - low > max(1, int(low * resolution)):
+            clients = (low + high) // 2
+            if meets_target(clients):
+                low = clients
+            else:
+                high = clients
+        capacity.clients = low
+        return capacity
+    finally:
+        stop.set()
+        process.join(timeout=60)
+        if process.is_alive():
+            process.terminate()
+
+
+if __name__ == '__main__':
+    opponent = {"kind": "mcts", "options": {"iterations": 5, "time_limit": None}}
+    p99_target = 0.25
+    print(f"{os.cpu_count()} core(s); opponent {opponent}; p99 target {p99_target * 1000:.0f}ms")
+    capacity = find_capacity(p99_target, start=25, opponent=opponent, think_time=1.0)
+    for report in capacity.steps:
+        print(f"{report.clients} sessions: {report.games} games, "
+              f"{report.moves_per_second:.0f} moves/sec, p50 {report.p50 * 1000:.1f}ms, "
+              f"p99 {report.p99 * 1000:.1f}ms, {report.errors} errors")
+    print(f"Capacity: {capacity.clients} sessions ({capacity.sessions_per_core:.0f}/core)")
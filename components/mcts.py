@@ -0,0 +1,230 @@
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+from components.action import Action
+from components.determinization import Determinizer, hidden_state, restore_hidden_state
+from components.engine import HeadlessGame
+
+if TYPE_CHECKING:
+    from components.evaluator import EvaluationQueue
+
+
+class Node:
+    """
+    Search statistics for one position, shared by every path reaching it.
+
+    Statistics live on the edges (one slot per legal action) so that
+    transpositions reached through different move orders pool their visits.
+    """
+    __slots__ = ("player", "actions", "visits", "values", "total", "children")
+
+    def __init__(self, game: HeadlessGame) -> None:
+        self.player = game.current_player_index
+        self.actions: list[Action] = game.legal_actions()
+        self.visits = [0] * len(self.actions)
+        self.values = [0.0] * len(self.actions)  # Reward sums for self.player
+        self.total = 0
+        self.children: set[int] = set()  # Hashes of positions seen after an action
+
+
+@dataclass(slots=True)
+class SearchStats:
+    iterations: int = 0
+    elapsed: float = 0.0  # seconds
+    nodes: int = 0  # Transposition table size after the search
+    reused: int = 0  # Nodes carried over from the previous move
+
+    @property
+    def iterations_per_second(self) -> float:
+        return self.iterations / self.elapsed if self.elapsed else 0.0
+
+
+class MCTSAgent:
+    """
+    UCT Monte Carlo tree search over a live HeadlessGame.
+
+    The search walks the game in place with apply/undo, so the position is
+    unchanged when it returns. Nodes are kept in a transposition table keyed
+    by the Zobrist hash; chance outcomes (replenish shuffles, card draws)
+    simply land on whichever position they produce. Between moves the table
+    is pruned to the subtree below the new root and the rest is reused.
+
+    Stops after `iterations` or `time_limit` seconds, whichever comes first;
+    at least one of them must be set.
+
+    With `determinizations` > 0 the agent does not read the hidden piles and
+    bag: each iteration runs on one of that many sampled completions of the
+    hidden state (information-set MCTS). Nodes are keyed by the Zobrist hash,
+    which only covers pile sizes and the bag multiset, so every sample
+    shares the same tree.
+
+    With an `evaluator` queue, leaves are scored by the batch evaluator
+    instead of random rollouts. Each pending leaf puts a virtual loss on its
+    path (the visit is counted before its value arrives), which steers the
+    following iterations elsewhere while the batch fills up.
+    """
+
+    def __init__(
+        self,
+        iterations: Optional[int] = None,
+        time_limit: Optional[float] = 0.2,
+        exploration: float = 1.4,
+        rng: Optional[random.Random] = None,
+        determinizations: int = 0,
+        evaluator: Optional["EvaluationQueue"] = None,
+    ) -> None:
+        if iterations is None and time_limit is None:
+            raise ValueError("Set an iteration or time budget.")
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rng = rng or random.Random()
+        self.determinizations = determinizations
+        self.evaluator = evaluator
+        self.table: dict[int, Node] = {}
+        self.stats = SearchStats()
+
+    def __call__(self, game: HeadlessGame, actions: list[Action]) -> Action:
+        if len(actions) == 1:
+            return actions[0]
+        root = self.search(game)
+        best = max(range(len(root.actions)), key=root.visits.__getitem__)
+        return root.actions[best]
+
+    def search(self, game: HeadlessGame) -> Node:
+        start = time.perf_counter()
+        self._reuse_subtree(game.hash)
+        self.stats = SearchStats(reused=len(self.table))
+
+        root = self.table.get(game.hash)
+        if root is None:
+            root = self.table[game.hash] = Node(game)
+
+        samples = None
+        if self.determinizations:
+            true_hidden_state = hidden_state(game)
+            samples = Determinizer(game).sample(self.determinizations, self.rng)
+
+        # Replenishes during search shuffle with the real bag RNG; put it back
+        # so thinking never changes the game's future draws
+        bag_rng = game.token_bag.rng
+        bag_state = bag_rng.getstate()
+        deadline = None if self.time_limit is None else start + self.time_limit
+        iterations = 0
+        try:
+            while (self.iterations is None or iterations < self.iterations) and (
+                deadline is None or time.perf_counter() < deadline
+            ):
+                if samples is not None:
+                    samples.apply(game, iterations % len(samples))
+                self._iterate(game, root)
+                iterations += 1
+            if self.evaluator is not None:
+                self.evaluator.flush()
+        finally:
+            # The caller's game must get its real hidden state back even if the search fails
+            bag_rng.setstate(bag_state)
+            if samples is not None:
+                restore_hidden_state(game, true_hidden_state)
+
+        self.stats.iterations = iterations
+        self.stats.elapsed = time.perf_counter() - start
+        self.stats.nodes = len(self.table)
+        return root
+
+    def _reuse_subtree(self, root_hash: int) -> None:
+        """Drop every node that is unreachable from the new root."""
+        if root_hash not in self.table:
+            self.table = {}
+            return
+        kept = {root_hash: self.table[root_hash]}
+        frontier = [root_hash]
+        while frontier:
+            for child_hash in self.table[frontier.pop()].children:
+                if child_hash not in kept and child_hash in self.table:
+                    kept[child_hash] = self.table[child_hash]
+                    frontier.append(child_hash)
+        self.table = kept
+
+    def _iterate(self, game: HeadlessGame, root: Node) -> None:
+        path: list[tuple[Node, int]] = []
+        records = []
+        node = root
+
+        # Selection and expansion
+        while not game.is_over:
+            index = self._select(node)
+            path.append((node, index))
+            records.append(game.apply(node.actions[index]))
+            node.children.add(game.hash)
+
+            child = self.table.get(game.hash)
+            if child is None:
+                if not game.is_over:
+                    self.table[game.hash] = Node(game)
+                break
+            node = child
+
+        if self.evaluator is not None and not game.is_over:
+            for node, index in path:
+                node.total += 1
+                node.visits[index] += 1
+            self.evaluator.submit(game, self._backup(path, game.current_player_index, len(game.players)))
+        else:
+            rewards = self._rollout(game)
+
+            # Backpropagation
+            for node, index in path:
+                node.total += 1
+                node.visits[index] += 1
+                node.values[index] += rewards[node.player]
+
+        for record in reversed(records):
+            game.undo(record)
+
+    @staticmethod
+    def _backup(path: list[tuple[Node, int]], leaf_player: int, n_players: int):
+        """Callback adding an evaluated leaf's value to a path already visited."""
+        def backup(value: float) -> None:
+            reward = (value + 1) / 2  # For the player to move at the leaf
+            other = (1 - reward) / (n_players - 1)
+            for node, index in path:
+                node.values[index] += reward if node.player == leaf_player else other
+        return backup
+
+    def _select(self, node: Node) -> int:
+        """Pick the edge with the highest UCB1 score; untried edges first."""
+        log_total = math.log(node.total) if node.total else 0.0
+        best, best_score = 0, -1.0
+        for index, visits in enumerate(node.visits):
+            if visits == 0:
+                return index
+            score = node.values[index] / visits + self.exploration * math.sqrt(log_total / visits)
+            if score > best_score:
+                best, best_score = index, score
+        return best
+
+    def _rollout(self, game: HeadlessGame) -> list[float]:
+        """Play random moves to the end, score the outcome, then undo them."""
+        records = []
+        choice = self.rng.choice
+        while not game.is_over:
+            records.append(game.apply(choice(game.legal_actions())))
+
+        rewards = outcome_rewards(game)
+        for record in reversed(records):
+            game.undo(record)
+        return rewards
+
+
+def outcome_rewards(game: HeadlessGame) -> list[float]:
+    """1 for the winner and 0 for the rest; an even split if nobody won."""
+    n_players = len(game.players)
+    if game.winner_index is None:
+        return [1 / n_players] * n_players
+    rewards = [0.0] * n_players
+    rewards[game.winner_index] = 1.0
+    return rewards
@@ -0,0 +1,99 @@
+import time
+from functools import lru_cache
+from itertools import product
+from typing import Optional
+
+from components.t0ken import GOLD_INDEX
+
+Vector = tuple[int, ...]
+
+
+def _enumerate_payments(need: Vector, holdings: Vector, spend_order: Vector = ()) -> tuple[Vector, ...]:
+    """
+    Every way to pay `need` (requirement net of bonuses) out of `holdings`,
+    with gold standing in for any colored token. Ordered by gold spent, so
+    the first payment (colored tokens before gold) is the canonical best one.
+    Payments spending the same gold keep the more useful tokens: they prefer
+    spending the colors listed first in `spend_order`.
+    """
+    gold = holdings[GOLD_INDEX]
+    needs = []  # (token index, tokens needed, least gold, most gold)
+    for i, quantity in enumerate(need):
+        if quantity > 0:
+            least_gold = max(quantity - holdings[i], 0)
+            if least_gold > gold:
+                return ()
+            needs.append((i, quantity, least_gold, min(quantity, gold)))
+
+    payments = []
+    for gold_split in product(*(range(low, high + 1) for _, _, low, high in needs)):
+        gold_spent = sum(gold_split)
+        if gold_spent > gold:
+            continue
+        payment = [0] * len(holdings)
+        for (i, quantity, _, _), gold_used in zip(needs, gold_split):
+            payment[i] = quantity - gold_used
+        payment[GOLD_INDEX] = gold_spent
+        payments.append(tuple(payment))
+
+    payments.sort(key=lambda payment: (payment[GOLD_INDEX], tuple(-payment[i] for i in spend_order), payment))
+    return tuple(payments)
+
+
+class PaymentSolver:
+    """
+    Memoized payment solver keyed on (requirement, bonus, holdings) vectors.
+
+    Before the cache lookup the key is canonicalized: bonuses are netted off
+    the requirement and holdings are clamped to what could ever be spent,
+    so positions that differ only in irrelevant tokens share an entry. The
+    key also ranks the needed colors by how many the player holds, most
+    first, which breaks ties between payments spending the same gold.
+    Results are kept in a bounded LRU cache; `cache_info()` reports its hit
+    rate and `mean_latency` the average wall time per call.
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        self._payments = lru_cache(maxsize=maxsize)(_enumerate_payments)
+        self.calls = 0
+        self.total_time = 0.0  # seconds
+
+    def payments(self, requirement: Vector, bonuses: Vector, holdings: Vector) -> tuple[Vector, ...]:
+        """All payments, best first; empty if the card is not affordable."""
+        start = time.perf_counter()
+        need = tuple(r - b if r > b else 0 for r, b in zip(requirement, bonuses))
+        usable = [h if h < n else n for h, n in zip(holdings, need)]
+        usable[GOLD_INDEX] = min(holdings[GOLD_INDEX], sum(need))
+        spend_order = tuple(sorted(
+            (i for i, n in enumerate(need) if n and i != GOLD_INDEX), key=lambda i: (-holdings[i], i)
+        ))
+        payments = self._payments(need, tuple(usable), spend_order)
+        self.total_time += time.perf_counter() - start
+        self.calls += 1
+        return payments
+
+    def best_payment(self, requirement: Vector, bonuses: Vector, holdings: Vector) -> Optional[Vector]:
+        """The payment spending the least gold, or None if not affordable."""
+        payments = self.payments(requirement, bonuses, holdings)
+        return payments[0] if payments else None
+
+    def cache_info(self):
+        return self._payments.cache_info()
+
+    @property
+    def hit_rate(self) -> float:
+        info = self._payments.cache_info()
+        total = info.hits + info.misses
+        return info.hits / total if total else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def clear(self) -> None:
+        self._payments.cache_clear()
+        self.calls = 0
+        self.total_time = 0.0
+
+
+PAYMENT_SOLVER = PaymentSolver()
@@ -1,37 +1,50 @@
-from collections import defaultdict
+from typing import Optional
 
 from components.card import Card
-from components.t0ken import Token
+from components.payment import PAYMENT_SOLVER
+from components.t0ken import GOLD_INDEX, TOKEN_INDEX, Token
+
+MAX_TOKENS = 10  # Most tokens a player may hold at once
+MAX_PRIVILEGES = 3
 
 
 class Player:
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, verbose: bool = True) -> None:
         self.name: str = name
-        self.tokens: list[Token] = []
+        self.verbose: bool = verbose
+        self.tokens: list[int] = [0] * len(Token)  # Token counts in enum order
+        self.bonuses: list[int] = [0] * len(Token)  # Jewel card bonuses in enum order
         self.privileges: int = 0
         self.cards: list[Card] = []  # Cards in the player's hand (general cards)
         self.jewel_cards = []  # Cards specifically representing jewels
         self.prestige_cards = []  # Cards specifically representing prestige
         self.crowns = 0  # Number of crowns owned by the player
+        # Running win-condition counters, updated by add_card/remove_card
+        self.prestige = 0
+        self.color_prestige: list[int] = [0] * len(Token)
 
     def __str__(self):
         return (
-            f"Player: {self.name}, Tokens: {dict(self.tokens)}, "
+            f"Player: {self.name}, Tokens: {dict(zip((t.name for t in Token), self.tokens))}, "
             f"Privilege Tokens: {self.privileges}, Crowns: {self.crowns}"
         )
 
+    def _log(self, message: str) -> None:
+        if self.verbose:
+            print(message)
+
     def add_token(self, token, quantity):
         """Add tokens to the player's pool."""
-        self.tokens[token] += quantity
-        print(f"{self.name} gained {quantity} {token} token(s). Total: {self.tokens[token]}.")
+        self.tokens[TOKEN_INDEX[token]] += quantity
+        self._log(f"{self.name} gained {quantity} {token} token(s). Total: {self.tokens[TOKEN_INDEX[token]]}.")
 
     def use_privilege_token(self):
         """Use a privilege token if available."""
         if self.privileges > 0:
             self.privileges -= 1
-            print(f"{self.name} used a privilege token. Remaining: {self.privileges}.")
+            self._log(f"{self.name} used a privilege token. Remaining: {self.privileges}.")
         else:
-            print(f"{self.name} has no privilege tokens left to use.")
+            self._log(f"{self.name} has no privilege tokens left to use.")
 
     def add_card(self, card, card_type="general"):
         """
@@ -41,49 +54,109 @@ class Player:
         """
         if card_type == "jewel":
             self.jewel_cards.append(card)
+            for i, bonus in enumerate(card.bonus_vector):
+                self.bonuses[i] += bonus
+            for i in card.color_indices:
+                self.color_prestige[i] += card.points
+            self.crowns += card.crowns
+            self.prestige += card.points
         elif card_type == "prestige":
             self.prestige_cards.append(card)
+            self.prestige += card.points
         else:
             self.cards.append(card)
-        print(f"{self.name} acquired a {card_type} card: {card}.")
+        self._log(f"{self.name} acquired a {card_type} card: {card}.")
+
+    def remove_card(self, card: Card) -> None:
+        """Take back the most recently added card, e.g. when undoing a purchase."""
+        if self.jewel_cards and self.jewel_cards[-1] is card:
+            self.jewel_cards.pop()
+            for i, bonus in enumerate(card.bonus_vector):
+                self.bonuses[i] -= bonus
+            for i in card.color_indices:
+                self.color_prestige[i] -= card.points
+            self.crowns -= card.crowns
+            self.prestige -= card.points
+        elif self.prestige_cards and self.prestige_cards[-1] is card:
+            self.prestige_cards.pop()
+            self.prestige -= card.points
+        else:
+            self.cards.remove(card)
+
+    def shortfall(self, card: Card) -> int:
+        """Tokens still missing for a card after bonuses and colored tokens; gold may cover them."""
+        tokens, bonuses = self.tokens, self.bonuses
+        missing = 0
+        for i, quantity in card.requirement_items:
+            quantity -= bonuses[i] + tokens[i]
+            if quantity > 0:
+                missing += quantity
+        return missing
+
+    def affordable_cards(self, cards: list[Card]) -> list[Card]:
+        """Filter cards down to those the player can pay for, gold counting as a wildcard."""
+        gold = self.tokens[GOLD_INDEX]
+        shortfall = self.shortfall
+        return [card for card in cards if shortfall(card) <= gold]
+
+    def payment_for(self, card: Card) -> Optional[tuple[int, ...]]:
+        """
+        Work out which tokens pay for a card after jewel bonuses are applied,
+        spending as little gold as possible (see PaymentSolver).
+
+        Returns a token count vector, or None if the card is not affordable.
+        """
+        return PAYMENT_SOLVER.best_payment(
+            card.requirement_vector, tuple(self.bonuses), tuple(self.tokens)
+        )
+
+    def payment_options(self, card: Card) -> tuple[tuple[int, ...], ...]:
+        """Every way the player can pay for a card, best first."""
+        return card.payment_options(self.bonuses, self.tokens)
+
+    def spend_tokens(self, payment: tuple[int, ...]) -> None:
+        """Remove a token count vector from the player's pool."""
+        tokens = self.tokens
+        for i, quantity in enumerate(payment):
+            tokens[i] -= quantity
+        self._log(f"{self.name} spent {sum(payment)} token(s).")
 
     def end_turn(self):
         """Indicate the end of the player's turn."""
-        print(f"{self.name}'s turn has ended.")
+        self._log(f"{self.name}'s turn has ended.")
 
     def calculate_crowns(self):
         """
-        Calculate crowns by summing the crowns from all jewel cards.
+        Crowns summed over all jewel cards, kept up to date by add_card.
         """
-        total_crowns = sum(card.get("crowns", 0) for card in self.jewel_cards)
-        self.crowns = total_crowns
-        print(f"{self.name} recalculated crowns: {self.crowns}.")
         return self.crowns
 
     def calculate_prestige(self):
         """
-        Calculate prestige points by summing points from jewel and prestige cards.
+        Prestige points summed over jewel and prestige cards, kept up to date by add_card.
         """
-        total_prestige = sum(card.get("points", 0) for card in self.jewel_cards)
-        total_prestige += sum(card.get("points", 0) for card in self.prestige_cards)
-        print(f"{self.name} recalculated prestige points: {total_prestige}.")
-        return total_prestige
+        return self.prestige
 
     def calculate_prestige_colors(self):
         """
-        Calculate the highest sum of prestige points by output color across jewel cards.
-        Returns the maximum sum of any color's prestige points.
+        The highest sum of prestige points by output color across jewel cards.
         """
-        color_totals = defaultdict(int)
-        for card in self.jewel_cards:
-            output = card.get("output", {})
-            for color, value in output.items():
-                color_totals[color] += value
-
-        max_prestige_color_value = max(color_totals.values(), default=0)
-        print(f"{self.name}'s highest color prestige points: {max_prestige_color_value}.")
-        return max_prestige_color_value
-        
+        return max(self.color_prestige)
+
+    def win_condition(self) -> Optional[str]:
+        """
+        Name the win condition the player meets, if any:
+        "crowns", "prestige" or "color" (see check_win_condition).
+        O(1) and silent: it only reads the running counters.
+        """
+        if self.crowns >= 10:
+            return "crowns"
+        if self.prestige >= 20:
+            return "prestige"
+        if max(self.color_prestige) >= 10:
+            return "color"
+        return None
+
     def check_win_condition(self):
         """
         Check if the player meets any of the win conditions:
@@ -98,14 +171,14 @@ class Player:
         max_prestige_color = self.calculate_prestige_colors()
 
         if crowns >= 10:
-            print(f"{self.name} wins with {crowns} crowns!")
+            self._log(f"{self.name} wins with {crowns} crowns!")
             return True
         elif total_prestige >= 20:
-            print(f"{self.name} wins with {total_prestige} prestige points!")
+            self._log(f"{self.name} wins with {total_prestige} prestige points!")
             return True
         elif max_prestige_color >= 10:
-            print(f"{self.name} wins with {max_prestige_color} prestige points in a single color!")
+            self._log(f"{self.name} wins with {max_prestige_color} prestige points in a single color!")
             return True
 
-        print(f"{self.name} does not meet the win conditions yet.")
-        return False
\ No newline at end of file
+        self._log(f"{self.name} does not meet the win conditions yet.")
+        return False
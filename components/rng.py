@@ -0,0 +1,78 @@
+import os
+import random
+from typing import Optional
+
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def mix64(z: int) -> int:
+    """SplitMix64 finalizer: a bijective scramble of a 64-bit integer."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def seed_from_entropy() -> int:
+    """A fresh 64-bit seed, for games that should still be replayable."""
+    return int.from_bytes(os.urandom(8), "little")
+
+
+class GameRNG(random.Random):
+    """
+    Counter-based random stream: output n is mix64(key + n * GOLDEN_GAMMA),
+    so the whole state is (key, counter) and any draw can be recomputed.
+
+    A game gets one GameRNG from its seed and hands each component its own
+    `stream(i)`, so adding a draw in one place does not shift the others.
+    Parallel workers take `GameRNG(seed).stream(worker)` (or `spawn(n)`) and
+    never share a stream. All of random.Random (shuffle, choice, randrange,
+    ...) works on top, and it pickles as its (key, counter) state.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.key = 0
+        self.counter = 0
+        super().__init__(seed)
+
+    def seed(self, a: Optional[int] = None, version: int = 2) -> None:
+        if a is None:
+            a = seed_from_entropy()
+        elif not isinstance(a, int):
+            raise ValueError(f"Seed must be an integer, got {type(a).__name__}.")
+        self.key = mix64(a & MASK64)
+        self.counter = 0
+        self.gauss_next = None
+
+    def getstate(self) -> tuple[int, int]:
+        return self.key, self.counter
+
+    def setstate(self, state: tuple[int, int]) -> None:
+        self.key, self.counter = state
+        self.gauss_next = None
+
+    def next64(self) -> int:
+        self.counter += 1
+        return mix64((self.key + self.counter * GOLDEN_GAMMA) & MASK64)
+
+    def getrandbits(self, k: int) -> int:
+        if k <= 64:
+            return self.next64() >> (64 - k) if k else 0
+        words = (k + 63) // 64
+        value = 0
+        for _ in range(words):
+            value = (value << 64) | self.next64()
+        return value >> (words * 64 - k)
+
+    def random(self) -> float:
+        return (self.next64() >> 11) * (1.0 / (1 << 53))
+
+    def stream(self, index: int) -> "GameRNG":
+        """Independent child stream `index`; does not advance this stream."""
+        child = GameRNG.__new__(GameRNG)
+        child.setstate((mix64(self.key ^ mix64((index + 1) * GOLDEN_GAMMA & MASK64)), 0))
+        return child
+
+    def spawn(self, n: int) -> list["GameRNG"]:
+        """The first n child streams, e.g. one per worker process."""
+        return [self.stream(i) for i in range(n)]
@@ -0,0 +1,254 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+from components.action import Action, BuyCard, Replenish
+from components.engine import HeadlessGame
+from components.player import Player
+
+if TYPE_CHECKING:
+    from components.evaluator import EvaluationQueue
+
+WIN_SCORE = 1.0
+LOSS_SCORE = -1.0
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def player_progress(player: Player) -> float:
+    """
+    How close a player is to winning, from 0 to 1, using the same terms as
+    Player.check_win_condition: crowns, total prestige and best single color.
+    """
+    return min(
+        max(
+            player.calculate_crowns() / 10,
+            player.calculate_prestige() / 20,
+            player.calculate_prestige_colors() / 10,
+        ),
+        1.0,
+    )
+
+
+def evaluate(game: HeadlessGame, player_index: int) -> float:
+    """Score a position for `player_index`, strictly between LOSS_SCORE and WIN_SCORE."""
+    if game.winner_index is not None:
+        return WIN_SCORE if game.winner_index == player_index else LOSS_SCORE
+    me = player_progress(game.players[player_index])
+    opponent = player_progress(game.players[1 - player_index])
+    return 0.9 * (me - opponent)
+
+
+def is_chance_action(game: HeadlessGame, action: Action) -> bool:
+    """Replenishing shuffles the bag and buying draws from a pile."""
+    if isinstance(action, Replenish):
+        return True
+    return isinstance(action, BuyCard) and bool(game.deck.piles.get(action.level))
+
+
+@dataclass(slots=True)
+class SearchStats:
+    depth: int = 0  # Deepest fully searched depth
+    nodes: int = 0
+    elapsed: float = 0.0  # seconds
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+
+class ExpectimaxAgent:
+    """
+    Iterative-deepening negamax for two-player games with chance nodes.
+
+    Decision nodes use alpha-beta, ordered by the previous iteration's best
+    move, two killer moves per ply and the history heuristic. Chance actions
+    (see is_chance_action) become chance nodes averaging `chance_samples`
+    sampled outcomes, pruned with Star1 bounds from the evaluation range.
+    Deepening stops at `max_depth` or when `time_limit` seconds run out; the
+    move from the last completed depth is played.
+
+    With an `evaluator` queue, nodes one ply above the horizon score all
+    their children in one batch instead of evaluating them one by one; that
+    gives up cutoffs among those children and samples chance actions once.
+    """
+
+    def __init__(
+        self,
+        time_limit: float = 0.2,
+        max_depth: int = 64,
+        chance_samples: int = 3,
+        rng: Optional[random.Random] = None,
+        evaluator: Optional["EvaluationQueue"] = None,
+    ) -> None:
+        self.time_limit = time_limit
+        self.evaluator = evaluator
+        self.max_depth = max_depth
+        self.chance_samples = chance_samples
+        self.rng = rng or random.Random()
+        self.history: dict[Action, int] = {}
+        self.killers: list[list[Action]] = []
+        self.stats = SearchStats()
+        self._deadline = 0.0
+
+    def __call__(self, game: HeadlessGame, actions: list[Action]) -> Action:
+        if len(game.players) != 2:
+            raise ValueError("ExpectimaxAgent only supports two-player games.")
+        if len(actions) == 1:
+            return actions[0]
+
+        start = time.perf_counter()
+        self._deadline = start + self.time_limit
+        self.stats = SearchStats()
+        self.history.clear()
+        best = actions[0]
+
+        # Replenishing during search shuffles with the game's own bag RNG;
+        # put it back so searching never changes the real game's future draws
+        bag_rng = game.token_bag.rng
+        bag_state = bag_rng.getstate()
+        try:
+            for depth in range(1, self.max_depth + 1):
+                self.killers = [[] for _ in range(depth + 1)]
+                try:
+                    best = self._search_root(game, actions, depth, best)
+                except SearchTimeout:
+                    break
+                self.stats.depth = depth
+                if time.perf_counter() >= self._deadline:
+                    break
+        finally:
+            bag_rng.setstate(bag_state)
+
+        self.stats.elapsed = time.perf_counter() - start
+        return best
+
+    def _search_root(
+        self, game: HeadlessGame, actions: list[Action], depth: int, previous_best: Action
+    ) -> Action:
+        alpha = LOSS_SCORE - 1
+        best = previous_best
+        for action in self._order(actions, 0, previous_best):
+            value = self._action_value(game, action, depth, alpha, WIN_SCORE, 0)
+            if value > alpha:
+                alpha, best = value, action
+        return best
+
+    def _negamax(self, game: HeadlessGame, depth: int, alpha: float, beta: float, ply: int) -> float:
+        self.stats.nodes += 1
+        if self.stats.nodes & 0x3F == 0 and time.perf_counter() >= self._deadline:
+            raise SearchTimeout
+
+        player_index = game.current_player_index
+        if depth == 0 or game.is_over:
+            return evaluate(game, player_index)
+        if depth == 1 and self.evaluator is not None:
+            return self._frontier_value(game)
+
+        best = LOSS_SCORE - 1
+        for action in self._order(game.legal_actions(), ply):
+            value = self._action_value(game, action, depth, alpha, beta, ply)
+            if value > best:
+                best = value
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                self._record_cutoff(action, depth, ply)
+                break
+        return best
+
+    def _action_value(
+        self, game: HeadlessGame, action: Action, depth: int, alpha: float, beta: float, ply: int
+    ) -> float:
+        """Value of `action` for the player to move, sampling chance outcomes."""
+        if not is_chance_action(game, action):
+            return self._child_value(game, action, depth, alpha, beta, ply)
+
+        # Star1: after i of n equally likely outcomes summing to total, the
+        # rest can only move the average within the evaluation bounds.
+        # Card draws are sampled by swapping a random card to the top of the
+        # pile, replenishes by pointing the bag's shuffle at a position drawn
+        # from self.rng; both are put back after each sample.
+        n = self.chance_samples
+        pile = game.deck.piles[action.level] if isinstance(action, BuyCard) else None
+        bag_rng = game.token_bag.rng
+        bag_state = bag_rng.getstate()
+        total = 0.0
+        for i in range(n):
+            remaining = n - i - 1
+            child_alpha = max(n * alpha - total - remaining * WIN_SCORE, LOSS_SCORE)
+            child_beta = min(n * beta - total - remaining * LOSS_SCORE, WIN_SCORE)
+            if pile is not None:
+                j = self.rng.randrange(len(pile))
+                pile[-1], pile[j] = pile[j], pile[-1]
+            else:
+                bag_rng.setstate((bag_state[0], self.rng.getrandbits(64)))
+            try:
+                total += self._child_value(game, action, depth, child_alpha, child_beta, ply)
+            finally:
+                if pile is not None:
+                    pile[-1], pile[j] = pile[j], pile[-1]
+                else:
+                    bag_rng.setstate(bag_state)
+            if (total + remaining * WIN_SCORE) / n <= alpha:
+                return (total + remaining * WIN_SCORE) / n
+            if (total + remaining * LOSS_SCORE) / n >= beta:
+                return (total + remaining * LOSS_SCORE) / n
+        return total / n
+
+    def _child_value(
+        self, game: HeadlessGame, action: Action, depth: int, alpha: float, beta: float, ply: int
+    ) -> float:
+        player_index = game.current_player_index
+        record = game.apply(action)
+        try:
+            if game.is_over:
+                return evaluate(game, player_index)
+            return -self._negamax(game, depth - 1, -beta, -alpha, ply + 1)
+        finally:
+            game.undo(record)
+
+    def _frontier_value(self, game: HeadlessGame) -> float:
+        """Best child value for the player to move, children scored as one batch."""
+        player_index = game.current_player_index
+        actions = game.legal_actions()
+        values = [0.0] * len(actions)
+
+        def store(i: int, mover: int):
+            def callback(value: float) -> None:
+                # Scaled like evaluate() so that real wins still dominate
+                values[i] = 0.9 * (value if mover == player_index else -value)
+            return callback
+
+        for i, action in enumerate(actions):
+            record = game.apply(action)
+            if game.is_over:
+                values[i] = evaluate(game, player_index)
+            else:
+                self.evaluator.submit(game, store(i, game.current_player_index))
+            game.undo(record)
+        self.evaluator.flush()
+        self.stats.nodes += len(actions)
+        return max(values)
+
+    def _order(self, actions: list[Action], ply: int, first: Optional[Action] = None) -> list[Action]:
+        killers = self.killers[ply] if ply < len(self.killers) else []
+
+        def priority(action: Action) -> tuple[int, int]:
+            if action == first:
+                return 2, 0
+            if action in killers:
+                return 1, 0
+            return 0, self.history.get(action, 0)
+
+        return sorted(actions, key=priority, reverse=True)
+
+    def _record_cutoff(self, action: Action, depth: int, ply: int) -> None:
+        self.history[action] = self.history.get(action, 0) + depth * depth
+        killers = self.killers[ply]
+        if action not in killers:
+            killers.insert(0, action)
+            del killers[2:]
@@ -0,0 +1,199 @@
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from components.catalogue import DEFAULT_CATALOGUE_PATH, load_catalogue
+from components.engine import Agent, HeadlessGame, random_agent
+from components.game_record import GameRecorder, GameRecordWriter, record_path
+from components.mcts import MCTSAgent
+from components.rng import GameRNG
+from components.search import ExpectimaxAgent
+
+AGENT_FACTORIES: dict[str, Callable[..., Agent]] = {
+    "random": lambda rng: random_agent(rng),
+    "mcts": lambda rng, **options: MCTSAgent(rng=rng, **options),
+    "expectimax": lambda rng, **options: ExpectimaxAgent(rng=rng, **options),
+}
+
+WIN_CONDITIONS = (None, "crowns", "prestige", "color")  # Index is the result code
+
+# What a worker sends back per game: (seed, winning agent or -1, win condition code, plies)
+CompactResult = tuple[int, int, int, int]
+
+_writer: Optional[GameRecordWriter] = None  # Per worker process, when recording
+
+
+@dataclass(frozen=True)
+class AgentSpec:
+    """Picklable recipe for an agent; workers build the agent itself."""
+    kind: str  # Key of AGENT_FACTORIES
+    options: dict[str, Any] = field(default_factory=dict)
+    name: Optional[str] = None
+
+    def __post_init__(self):
+        if self.kind not in AGENT_FACTORIES:
+            raise ValueError(f"Unknown agent kind {self.kind!r}; expected one of {sorted(AGENT_FACTORIES)}.")
+
+    @property
+    def label(self) -> str:
+        return self.name or self.kind
+
+    def build(self, rng: GameRNG) -> Agent:
+        return AGENT_FACTORIES[self.kind](rng, **self.options)
+
+
+@dataclass
+class SelfPlayStats:
+    """Running totals over finished games, indexed by agent (not seat)."""
+    n_agents: int
+    games: int = 0
+    wins: list[int] = field(default_factory=list)
+    draws: int = 0  # Games that hit the ply limit
+    total_plies: int = 0
+    win_conditions: Counter = field(default_factory=Counter)
+    elapsed: float = 0.0  # seconds
+
+    def __post_init__(self):
+        self.wins = self.wins or [0] * self.n_agents
+
+    def add(self, result: CompactResult) -> None:
+        _, winner, condition, plies = result
+        self.games += 1
+        self.total_plies += plies
+        if winner < 0:
+            self.draws += 1
+        else:
+            self.wins[winner] += 1
+            self.win_conditions[WIN_CONDITIONS[condition]] += 1
+
+    @property
+    def win_rates(self) -> list[float]:
+        return [wins / self.games if self.games else 0.0 for wins in self.wins]
+
+    @property
+    def mean_plies(self) -> float:
+        return self.total_plies / self.games if self.games else 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+
+def game_seeds(n_games: int, seed: Optional[int]) -> list[int]:
+    """Seed of game i is drawn from stream i, as in engine.run_games."""
+    streams = GameRNG(seed)
+    return [streams.stream(i).getrandbits(64) for i in range(n_games)]
+
+
+def play_seeded_game(
+    seed: int,
+    specs: tuple[AgentSpec, ...],
+    card_spec_file_path: str = DEFAULT_CATALOGUE_PATH,
+    max_plies: int = 200,
+    swap: bool = False,
+    recorder: Optional[GameRecorder] = None,
+) -> CompactResult:
+    """
+    Play one game from its seed. With swap the agents sit in reverse order;
+    the winner is still reported as an index into specs.
+    """
+    rng = GameRNG(seed)
+    order = list(reversed(range(len(specs)))) if swap else list(range(len(specs)))
+    agents = [specs[i].build(rng.stream(2 + i)) for i in order]
+    result = HeadlessGame(agents, card_spec_file_path, max_plies, seed=seed, recorder=recorder).play()
+    winner = -1 if result.winner_index is None else order[result.winner_index]
+    return seed, winner, WIN_CONDITIONS.index(result.win_condition), result.plies
+
+
+def init_worker(card_spec_file_path: str, record_dir: Optional[str] = None) -> None:
+    global _writer
+    catalogue = load_catalogue(card_spec_file_path)  # Parsed once per worker, then cached
+    if record_dir is not None:
+        _writer = GameRecordWriter(record_path(record_dir), catalogue.version)
+
+
+def play_shard(
+    shard: list[tuple[int, bool]],
+    specs: tuple[AgentSpec, ...],
+    card_spec_file_path: str,
+    max_plies: int,
+) -> list[CompactResult]:
+    recorder = None if _writer is None else _writer.recorder()
+    results = [
+        play_seeded_game(seed, specs, card_spec_file_path, max_plies, swap, recorder)
+        for seed, swap in shard
+    ]
+    if _writer is not None:
+        _writer.flush()  # Workers exit without closing their files
+    return results
+
+
+def run_self_play(
+    n_games: int,
+    specs: list[AgentSpec],
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    card_spec_file_path: str = DEFAULT_CATALOGUE_PATH,
+    max_plies: int = 200,
+    shard_size: int = 16,
+    swap_seats: bool = True,
+    on_update: Optional[Callable[[SelfPlayStats], None]] = None,
+    record_dir: Optional[str] = None,
+) -> SelfPlayStats:
+    """
+    Play n_games across a process pool and aggregate the results as shards
+    finish; on_update sees the running stats after every shard.
+
+    Games are split into shards of shard_size so each task is long enough to
+    hide the pool overhead, and only CompactResult tuples cross processes.
+    With swap_seats every other game reverses the seating. The same seed
+    gives the same games regardless of the number of workers.
+
+    With record_dir every worker appends its games to its own record file
+    there (see game_record).
+    """
+    specs = tuple(specs)
+    seeds = game_seeds(n_games, seed)
+    games = [(game_seed, swap_seats and i % 2 == 1) for i, game_seed in enumerate(seeds)]
+    shards = [games[i:i + shard_size] for i in range(0, n_games, shard_size)]
+
+    stats = SelfPlayStats(len(specs))
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=init_worker,
+        initargs=(card_spec_file_path, record_dir),
+    ) as pool:
+        futures = [
+            pool.submit(play_shard, shard, specs, card_spec_file_path, max_plies)
+            for shard in shards
+        ]
+        for future in as_completed(futures):
+            for result in future.result():
+                stats.add(result)
+            stats.elapsed = time.perf_counter() - start
+            if on_update is not None:
+                on_update(stats)
+    return stats
+
+
+if __name__ == '__main__':
+    from tqdm import tqdm
+
+    specs = [AgentSpec("random", name="random 1"), AgentSpec("random", name="random 2")]
+    progress = tqdm(total=2000, unit="game")
+
+    def report(stats: SelfPlayStats) -> None:
+        progress.update(stats.games - progress.n)
+        progress.set_postfix(
+            {spec.label: f"{rate:.2f}" for spec, rate in zip(specs, stats.win_rates)},
+            plies=f"{stats.mean_plies:.1f}",
+        )
+
+    stats = run_self_play(2000, specs, seed=0, on_update=report)
+    progress.close()
+    print(f"{stats.games} games in {stats.elapsed:.2f}s ({stats.games_per_second:.1f} games/sec)")
+    print(f"Win conditions: {dict(stats.win_conditions)}, draws: {stats.draws}")
@@ -0,0 +1,249 @@
+import asyncio
+import itertools
+import json
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from components.action import Action
+from components.catalogue import DEFAULT_CATALOGUE_PATH, load_catalogue
+from components.engine import HeadlessGame
+from components.features import action_index
+from components.game_record import encode_snapshot, restore_snapshot
+from components.rng import GameRNG
+from components.self_play import AgentSpec
+from components.t0ken import TOKEN_INDEX
+
+# Protocol: one JSON object per line in each direction.
+#   client -> server
+#     {"op": "join", "name": str, "opponent": {"kind": str, "options": {}},
+#      "seat": 0 | 1 | null, "seed": int | null}
+#     {"op": "move", "action": int}     an index from the last state's "legal"
+#     {"op": "quit"}
+#   server -> client
+#     {"type": "state", "ply", "to_move", "seat", "board", "players", "legal"}
+#       sent whenever the client is to move; board holds 25 cell codes
+#       (0 empty, token index + 1) and legal the action indices of
+#       features.action_index
+#     {"type": "over", "winner": seat | null, "condition", "plies"}
+#     {"type": "error", "message": str}
+DEFAULT_PORT = 8765
+# Bots cheap enough to move on the event loop instead of the executor
+INLINE_BOTS = ("random",)
+
+
+def bot_move(
+    spec: AgentSpec,
+    snapshot: bytes,
+    seed: int,
+    max_plies: int,
+    card_spec_file_path: str,
+    move_seed: int,
+) -> Action:
+    """Rebuild the position from its snapshot and let the bot choose. Runs in executor workers."""
+    game = HeadlessGame([None, None], card_spec_file_path, max_plies, seed=seed)
+    restore_snapshot(game, snapshot, 0)
+    return spec.build(GameRNG(move_seed))(game, game.legal_actions())
+
+
+@dataclass
+class ServerStats:
+    sessions: int = 0  # Started
+    active: int = 0
+    finished: int = 0
+    moves: int = 0  # Client moves applied
+    bot_moves: int = 0
+    bot_seconds: float = 0.0  # Wall time spent waiting for bot moves
+    errors: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+
+class GameServer:
+    """
+    Hosts many concurrent two-player sessions, a client against a bot, over
+    line-delimited JSON on TCP (see the protocol above).
+
+    Each connection runs as one coroutine holding a HeadlessGame. Bot moves
+    other than INLINE_BOTS are offloaded to the executor (a process pool by
+    default): the position crosses as a game_record snapshot and the action
+    comes back, so the event loop never blocks on search.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        card_spec_file_path: str = DEFAULT_CATALOGUE_PATH,
+        max_plies: int = 200,
+        executor: Optional[Executor] = None,
+        workers: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.card_spec_file_path = card_spec_file_path
+        self.catalogue = load_catalogue(card_spec_file_path)
+        self.max_plies = max_plies
+        self.executor = executor
+        self.owns_executor = executor is None
+        self.workers = workers
+        self.rng = GameRNG(seed)
+        self.session_ids = itertools.count()  # Session i draws from rng stream i
+        self.stats = ServerStats()
+        self.server: Optional[asyncio.Server] = None
+
+    async def start(self) -> None:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers or os.cpu_count())
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]  # Resolves port 0
+        self.stats = ServerStats()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.owns_executor and self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    async def __aenter__(self) -> "GameServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def _state(self, game: HeadlessGame, seat: int, legal: dict[int, Action]) -> dict:
+        return {
+            "type": "state",
+            "ply": game.plies,
+            "to_move": game.current_player_index,
+            "seat": seat,
+            "board": [
+                0 if cell.token is None else TOKEN_INDEX[cell.token] + 1
+                for row in game.token_board.fields for cell in row
+            ],
+            "players": [
+                {"tokens": p.tokens, "bonuses": p.bonuses, "crowns": p.crowns,
+                 "prestige": p.prestige, "privileges": p.privileges}
+                for p in game.players
+            ],
+            "legal": list(legal),
+        }
+
+    async def _bot_turn(self, game: HeadlessGame, spec: AgentSpec, rng: GameRNG) -> Action:
+        start = time.perf_counter()
+        if spec.kind in INLINE_BOTS:
+            action = spec.build(rng)(game, game.legal_actions())
+        else:
+            snapshot = bytearray()
+            encode_snapshot(snapshot, game)
+            action = await asyncio.get_running_loop().run_in_executor(
+                self.executor, bot_move, spec, bytes(snapshot), game.seed, game.max_plies,
+                self.card_spec_file_path, rng.getrandbits(64),
+            )
+        self.stats.bot_moves += 1
+        self.stats.bot_seconds += time.perf_counter() - start
+        return action
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        def send(message: dict[str, Any]) -> None:
+            writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+        async def receive() -> Optional[dict]:
+            """The next JSON object, answering and skipping malformed lines; None once the client hangs up."""
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return None
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    message = None
+                if isinstance(message, dict):
+                    return message
+                self.stats.errors += 1
+                send({"type": "error", "message": "Expected one JSON object per line."})
+                await writer.drain()
+
+        try:
+            join = await receive()
+            if join is None:
+                return
+            if join.get("op") != "join":
+                send({"type": "error", "message": "The first message must be a join."})
+                return
+            try:
+                opponent = join.get("opponent") or {"kind": "random"}
+                spec = AgentSpec(opponent["kind"], opponent.get("options", {}))
+                spec.build(GameRNG(0))  # Reject bad options before the game starts
+            except (KeyError, TypeError, ValueError) as error:
+                send({"type": "error", "message": f"Bad opponent: {error}"})
+                return
+
+            rng = self.rng.stream(next(self.session_ids))
+            seat = join.get("seat")
+            seat = rng.randrange(2) if seat not in (0, 1) else seat
+            seed = join.get("seed")
+            game = HeadlessGame(
+                [None, None], self.card_spec_file_path, self.max_plies,
+                seed=seed if isinstance(seed, int) else rng.getrandbits(64),
+            )
+            self.stats.sessions += 1
+            self.stats.active += 1
+            try:
+                await self._play(game, seat, spec, rng, send, receive, writer)
+            finally:
+                self.stats.active -= 1
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _play(
+        self,
+        game: HeadlessGame,
+        seat: int,
+        spec: AgentSpec,
+        rng: GameRNG,
+        send: Callable[[dict[str, Any]], None],
+        receive: Callable[[], Awaitable[Optional[dict]]],
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        while not game.is_over:
+            if game.current_player_index != seat:
+                game.apply(await self._bot_turn(game, spec, rng))
+                continue
+            legal = {action_index(action, self.catalogue): action for action in game.legal_actions()}
+            send(self._state(game, seat, legal))
+            await writer.drain()
+            while True:
+                message = await receive()
+                if message is None or message.get("op") == "quit":
+                    return
+                action = message.get("action")
+                # type() rather than isinstance: true must not pass as index 1
+                if message.get("op") == "move" and type(action) is int and action in legal:
+                    break
+                self.stats.errors += 1
+                send({"type": "error", "message": "Expected a move with one of the legal action indices."})
+            game.apply(legal[action])
+            self.stats.moves += 1
+
+        send({"type": "over", "winner": game.winner_index, "condition": game.win_condition, "plies": game.plies})
+        await writer.drain()
+        self.stats.finished += 1
+
+
+if __name__ == '__main__':
+    server = GameServer()
+    print(f"Serving Splendor Duel on {server.host}:{server.port}")
+    asyncio.run(server.serve_forever())
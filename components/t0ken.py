@@ -8,4 +8,17 @@ class Token(Enum):
     red = "#FF0000"
     black = "#000000"
     purple = "#800080"
-    gold = "#FFFF00"
\ No newline at end of file
+    gold = "#FFFF00"
+
+
+# Position of each token in enum order, for count vectors and lookup tables
+TOKEN_INDEX = {token: index for index, token in enumerate(Token)}
+GOLD_INDEX = TOKEN_INDEX[Token.gold]
+
+
+def token_vector(tokens) -> list[int]:
+    """Count tokens into a 7-slot vector ordered like the Token enum."""
+    vector = [0] * len(TOKEN_INDEX)
+    for token in tokens or ():
+        vector[TOKEN_INDEX[token]] += 1
+    return vector
@@ -1,8 +1,15 @@
-from components.t0ken import Token
+from math import comb
+from typing import Iterator, Optional
+
+from components.rng import GameRNG
+from components.t0ken import TOKEN_INDEX, Token, token_vector
+
+TOKENS = list(Token)
 
 
 class TokenBag:
-    def __init__(self) -> None:
+    def __init__(self, rng: Optional[GameRNG] = None) -> None:
+        self.rng = rng if rng is not None else GameRNG()
         self.tokens: list[Token] = self._fill_with_tokens()
 
     @staticmethod
@@ -17,8 +24,144 @@ class TokenBag:
                 tokens.extend([t] * 4)  # add 4 tokens for other colors
         return tokens
 
+    def shuffle(self) -> None:
+        """Mix the bag before drawing; take_token then draws at random."""
+        self.rng.shuffle(self.tokens)
+
     def add_token(self, token: Token) -> None:
         self.tokens.append(token)
 
     def take_token(self) -> Token:
-        return self.tokens.pop()
\ No newline at end of file
+        return self.tokens.pop()
+
+    def count(self, token: Token) -> int:
+        return self.tokens.count(token)
+
+    def add(self, tokens: list[Token]) -> None:
+        """Put tokens back in the bag, e.g. a payment."""
+        self.tokens.extend(tokens)
+
+    def remove(self, tokens: list[Token]) -> None:
+        """Take back the tokens of the last add, for undo."""
+        del self.tokens[len(self.tokens) - len(tokens):]
+
+    def restore(self, tokens: list[Token]) -> None:
+        """Reset the contents to an earlier copy of `tokens`."""
+        self.tokens[:] = tokens
+
+    def draw(self, n: int) -> list[Token]:
+        """Shuffle, then take up to n tokens in draw order (fewer if the bag runs out)."""
+        self.shuffle()
+        tokens = self.tokens
+        drawn = tokens[:len(tokens) - n - 1:-1] if n < len(tokens) else tokens[::-1]
+        del tokens[max(len(tokens) - n, 0):]
+        return drawn
+
+
+FULL_BAG_COUNTS = token_vector(TokenBag._fill_with_tokens())
+
+
+class CountTokenBag:
+    """
+    Token bag stored as a 7-slot count vector in Token enum order.
+
+    Draws sample straight from the counts: each token is picked with
+    probability count / total, which gives the same distribution as
+    shuffling TokenBag's list and popping. `outcomes` enumerates what a draw
+    of n tokens can yield, for chance nodes in search.
+    """
+    __slots__ = ("counts", "total", "rng")
+
+    def __init__(self, rng: Optional[GameRNG] = None, counts: Optional[list[int]] = None) -> None:
+        self.rng = rng if rng is not None else GameRNG()
+        self.counts: list[int] = (
+            list(counts) if counts is not None else FULL_BAG_COUNTS[:]
+        )
+        self.total = sum(self.counts)
+
+    @classmethod
+    def from_token_bag(cls, token_bag: TokenBag) -> "CountTokenBag":
+        return cls(token_bag.rng, token_vector(token_bag.tokens))
+
+    def copy(self) -> "CountTokenBag":
+        clone = CountTokenBag.__new__(CountTokenBag)
+        clone.counts = self.counts[:]
+        clone.total = self.total
+        clone.rng = self.rng
+        return clone
+
+    @property
+    def tokens(self) -> list[Token]:
+        """The bag's contents as a list, for code written against TokenBag."""
+        return [token for token, count in zip(TOKENS, self.counts) for _ in range(count)]
+
+    def __len__(self) -> int:
+        return self.total
+
+    def shuffle(self) -> None:
+        """Nothing to mix: draws already sample from the counts."""
+
+    def add_token(self, token: Token) -> None:
+        self.counts[TOKEN_INDEX[token]] += 1
+        self.total += 1
+
+    def take_token(self) -> Token:
+        if not self.total:
+            raise ValueError("Cannot take a token from an empty bag.")
+        return self.draw(1)[0]
+
+    def count(self, token: Token) -> int:
+        return self.counts[TOKEN_INDEX[token]]
+
+    def add(self, tokens: list[Token]) -> None:
+        for token in tokens:
+            self.counts[TOKEN_INDEX[token]] += 1
+        self.total += len(tokens)
+
+    def remove(self, tokens: list[Token]) -> None:
+        for token in tokens:
+            self.counts[TOKEN_INDEX[token]] -= 1
+        self.total -= len(tokens)
+
+    def restore(self, tokens: list[Token]) -> None:
+        """Reset the contents to an earlier copy of `tokens`."""
+        self.counts[:] = token_vector(tokens)
+        self.total = len(tokens)
+
+    def draw(self, n: int) -> list[Token]:
+        """Take up to n tokens at random (fewer if the bag runs out)."""
+        counts, random = self.counts, self.rng.random
+        drawn = []
+        for _ in range(min(n, self.total)):
+            pick = int(random() * self.total)
+            i = 0
+            while pick >= counts[i]:
+                pick -= counts[i]
+                i += 1
+            counts[i] -= 1
+            self.total -= 1
+            drawn.append(TOKENS[i])
+        return drawn
+
+    def outcomes(self, n: int) -> Iterator[tuple[tuple[int, ...], float]]:
+        """
+        Yield (drawn counts, probability) for every multiset a draw of n tokens
+        can produce (multivariate hypergeometric). Every ordering of a multiset
+        is equally likely, so this is all a chance node needs.
+        """
+        n = min(n, self.total)
+        counts = self.counts
+        denominator = comb(self.total, n)
+        drawn = [0] * len(counts)
+
+        def expand(color: int, left: int, ways: int) -> Iterator[tuple[tuple[int, ...], float]]:
+            if color == len(counts) - 1:
+                if left <= counts[color]:
+                    drawn[color] = left
+                    yield tuple(drawn), ways * comb(counts[color], left) / denominator
+                return
+            for k in range(min(left, counts[color]) + 1):
+                drawn[color] = k
+                yield from expand(color + 1, left - k, ways * comb(counts[color], k))
+
+        yield from expand(0, n, 1)
\ No newline at end of file
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
-from random import shuffle
-from typing import Optional
+from typing import Optional, Union
 
 from components.t0ken import Token
-from components.token_bag import TokenBag
+from components.token_bag import CountTokenBag, TokenBag
+from components.token_selection import Coords, legal_selections, selection_mask
 
 
 @dataclass
@@ -20,11 +20,13 @@ class TokenBoardField:
 
 
 class TokenBoard:
-    def __init__(self) -> None:
+    def __init__(self, verbose: bool = True) -> None:
+        self.verbose = verbose
         self.fields = [
             [TokenBoardField(row + 1, col + 1, token=None) for col in range(5)]
             for row in range(5)
         ]
+        self._replenish_fields = [self.fields[row - 1][col - 1] for row, col in BOARD_REPLENISH_ORDER]
 
     def _get_field(self, coord: tuple[int, int]) -> TokenBoardField:
         row, col = coord
@@ -32,17 +34,13 @@ class TokenBoard:
             raise ValueError(f"Coordinates {row}, {col} are out of bounds (1-5)")
         return self.fields[row - 1][col - 1]
 
-    def replenish(self, token_bag: TokenBag) -> TokenBag:
-        shuffle(token_bag.tokens)
-
-        for coord in BOARD_REPLENISH_ORDER:
-            field = self._get_field(coord)
-            if field.token is None:
-                if token_bag.tokens:
-                    field.token = token_bag.take_token()
-                else:
-                    print("No tokens left in the bag.")
-                    break
+    def replenish(self, token_bag: Union[TokenBag, CountTokenBag]) -> Union[TokenBag, CountTokenBag]:
+        empty = [field for field in self._replenish_fields if field.token is None]
+        drawn = token_bag.draw(len(empty))
+        for field, token in zip(empty, drawn):
+            field.token = token
+        if len(drawn) < len(empty) and self.verbose:
+            print("No tokens left in the bag.")
 
         # return empty bag for game continuity
         # TODO: attach TokenBag instance to TokenBoard instead?
@@ -62,29 +60,12 @@ class TokenBoard:
         if any(field.token is None for field in fields):
             raise ValueError("Cannot take tokens from empty fields.")
 
-        # If more than one token is taken, check adjacency and alignment of fields
-        if len(fields) > 1:
-            # Each pair of consecutive fields in the sorted list must be adjacent
-            for i in range(len(fields) - 1):
-                if (
-                    abs(fields[i].row - fields[i + 1].row) > 1
-                    or abs(fields[i].col - fields[i + 1].col) > 1
-                ):
-                    raise ValueError("Fields must be adjacent.")
-
-            # If 3 fields were selected, make sure they are in one line
-            # (direction vector between pairs is consistent)
-            if len(fields) == 3:
-                delta_row_1 = fields[1].row - fields[0].row
-                delta_col_1 = fields[1].col - fields[0].col
-                delta_row_2 = fields[2].row - fields[1].row
-                delta_col_2 = fields[2].col - fields[1].col
-
-                if (delta_row_1, delta_col_1) != (delta_row_2, delta_col_2):
-                    raise ValueError(
-                        "Fields must be aligned in one line "
-                        "(horizontal, vertical, or diagonal)."
-                    )
+        # Fields must form one of the precomputed straight lines
+        if selection_mask(coords) is None:
+            raise ValueError(
+                "Fields must be adjacent and aligned in one line "
+                "(horizontal, vertical, or diagonal)."
+            )
 
         tokens: list[Optional[Token]] = []
         for field in fields:
@@ -93,6 +74,18 @@ class TokenBoard:
 
         return tokens
 
+    def occupied_mask(self) -> int:
+        """Bitmask of the fields holding a token (bit (row - 1) * 5 + (col - 1))."""
+        mask = 0
+        for i, field in enumerate(field for row in self.fields for field in row):
+            if field.token is not None:
+                mask |= 1 << i
+        return mask
+
+    def legal_selections(self, max_length: int = 3) -> list[Coords]:
+        """List every legal take_tokens selection on the current board."""
+        return legal_selections(self.occupied_mask(), max_length)
+
     def display(self) -> None:
         print(
             f"\n--- Token Board ---\n{self.fields}"
@@ -0,0 +1,49 @@
+from typing import Optional
+
+# A legal selection is 1-3 fields in one straight, gap-free line (horizontal,
+# vertical or diagonal). Each is stored with the bitmask of its cells
+# (cell index = (row - 1) * 5 + (col - 1)), so finding the selections on a
+# board reduces to `mask & occupied == mask` tests.
+Coords = tuple[tuple[int, int], ...]
+
+LINE_DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+def _build_selections() -> list[list[tuple[Coords, int]]]:
+    """Group (coords, mask) pairs by selection length (index 0 = 1 field)."""
+    by_length: list[list[tuple[Coords, int]]] = [[], [], []]
+    for row in range(1, 6):
+        for col in range(1, 6):
+            by_length[0].append((((row, col),), 1 << ((row - 1) * 5 + col - 1)))
+            for d_row, d_col in LINE_DIRECTIONS:
+                for length in (2, 3):
+                    coords = tuple((row + d_row * k, col + d_col * k) for k in range(length))
+                    if all(1 <= r <= 5 and 1 <= c <= 5 for r, c in coords):
+                        mask = sum(1 << ((r - 1) * 5 + c - 1) for r, c in coords)
+                        by_length[length - 1].append((coords, mask))
+    return by_length
+
+
+SELECTIONS_BY_LENGTH = _build_selections()
+TOKEN_SELECTIONS: list[tuple[Coords, int]] = [
+    selection for selections in SELECTIONS_BY_LENGTH for selection in selections
+]
+# Selections keyed by their sorted coordinates, so lookups ignore pick order
+SELECTION_MASKS: dict[Coords, int] = {
+    tuple(sorted(coords)): mask for coords, mask in TOKEN_SELECTIONS
+}
+
+
+def selection_mask(coords) -> Optional[int]:
+    """Return the cell mask of a legal selection, or None if it is not one."""
+    return SELECTION_MASKS.get(tuple(sorted(coords)))
+
+
+def legal_selections(occupied: int, max_length: int = 3) -> list[Coords]:
+    """List the selections whose fields are all occupied."""
+    return [
+        coords
+        for selections in SELECTIONS_BY_LENGTH[:max_length]
+        for coords, mask in selections
+        if mask & occupied == mask
+    ]
@@ -0,0 +1,292 @@
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Callable, Optional
+
+from components.catalogue import DEFAULT_CATALOGUE_PATH
+from components.self_play import AgentSpec, game_seeds, init_worker, play_shard
+
+Z_95 = 1.959964  # Two-sided 95% normal quantile
+
+
+def elo_from_score(score: float) -> float:
+    """Elo difference implied by an expected score in (0, 1)."""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def score_from_elo(elo: float) -> float:
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+@dataclass
+class MatchScore:
+    """Wins, draws and losses from the first agent's point of view."""
+    wins: int = 0
+    draws: int = 0  # Games that hit the ply limit
+    losses: int = 0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        return (self.wins + self.draws / 2) / self.games if self.games else 0.5
+
+    @property
+    def variance(self) -> float:
+        """Per-game variance of the score (trinomial model)."""
+        if not self.games:
+            return 0.25
+        s = self.score
+        return (self.wins * (1 - s) ** 2 + self.draws * (0.5 - s) ** 2 + self.losses * s ** 2) / self.games
+
+    def elo(self) -> tuple[float, float, float]:
+        """Elo difference with its 95% confidence interval (estimate, low, high)."""
+        s = self.score
+        margin = Z_95 * math.sqrt(self.variance / self.games) if self.games else 0.5
+        return elo_from_score(s), elo_from_score(s - margin), elo_from_score(s + margin)
+
+
+@dataclass
+class SPRT:
+    """
+    Sequential probability ratio test of H0: elo = elo0 against H1: elo = elo1,
+    using the normal approximation of the trinomial log-likelihood ratio.
+    Stops with error rates alpha (false H1) and beta (false H0).
+    """
+    elo0: float = 0.0
+    elo1: float = 10.0
+    alpha: float = 0.05
+    beta: float = 0.05
+
+    @property
+    def bounds(self) -> tuple[float, float]:
+        return math.log(self.beta / (1 - self.alpha)), math.log((1 - self.beta) / self.alpha)
+
+    def llr(self, score: MatchScore) -> float:
+        variance = score.variance
+        if not score.games or variance == 0:
+            return 0.0
+        s0, s1 = score_from_elo(self.elo0), score_from_elo(self.elo1)
+        return score.games * (s1 - s0) * (2 * score.score - s0 - s1) / (2 * variance)
+
+    def decision(self, score: MatchScore) -> Optional[str]:
+        """"H1" or "H0" once the test is decided, None while it is still open."""
+        llr = self.llr(score)
+        lower, upper = self.bounds
+        if llr >= upper:
+            return "H1"
+        if llr <= lower:
+            return "H0"
+        return None
+
+
+@dataclass
+class MatchResult:
+    score: MatchScore
+    llr: float = 0.0
+    decision: Optional[str] = None  # SPRT outcome, or None if the game budget ran out
+
+
+@dataclass
+class Rating:
+    name: str
+    elo: float
+    low: float  # 95% confidence interval, relative to the first agent
+    high: float
+
+
+@dataclass
+class TournamentResult:
+    names: list[str]
+    scores: dict[tuple[int, int], MatchScore] = field(default_factory=dict)  # Keyed by (i, j), i < j
+
+    def ratings(self, iterations: int = 1000, tolerance: float = 1e-9) -> list[Rating]:
+        """
+        Bradley-Terry ratings on the Elo scale, fitted with the MM algorithm
+        (draws count as half a win each way). The first agent is the anchor at
+        0 Elo; intervals come from the inverse Fisher information.
+        """
+        n = len(self.names)
+        wins = [[0.0] * n for _ in range(n)]
+        for (i, j), score in self.scores.items():
+            wins[i][j] += score.wins + score.draws / 2
+            wins[j][i] += score.losses + score.draws / 2
+        games = [[wins[i][j] + wins[j][i] for j in range(n)] for i in range(n)]
+
+        strength = [1.0] * n
+        for _ in range(iterations):
+            updated = []
+            for i in range(n):
+                # Half a win and half a loss against a virtual agent of strength
+                # 1 keep unbeaten or winless agents finite
+                denominator = 1 / (strength[i] + 1) + sum(
+                    games[i][j] / (strength[i] + strength[j]) for j in range(n) if j != i
+                )
+                updated.append((sum(wins[i]) + 0.5) / denominator)
+            change = max(abs(a - b) for a, b in zip(updated, strength))
+            strength = updated
+            if change < tolerance:
+                break
+
+        theta = [math.log(s / strength[0]) for s in strength]
+        information = [[0.0] * n for _ in range(n)]
+        for i in range(n):
+            for j in range(n):
+                if i != j and games[i][j]:
+                    p = 1 / (1 + math.exp(theta[j] - theta[i]))
+                    weight = games[i][j] * p * (1 - p)
+                    information[i][j] -= weight
+                    information[i][i] += weight
+        covariance = _invert([row[1:] for row in information[1:]]) if n > 1 else []
+
+        scale = 400 / math.log(10)
+        ratings = [Rating(self.names[0], 0.0, 0.0, 0.0)]
+        for i in range(1, n):
+            elo = theta[i] * scale
+            variance = covariance[i - 1][i - 1] if covariance else math.inf
+            margin = Z_95 * math.sqrt(variance) * scale if variance >= 0 else math.inf
+            ratings.append(Rating(self.names[i], elo, elo - margin, elo + margin))
+        return ratings
+
+
+def _invert(matrix: list[list[float]]) -> list[list[float]]:
+    """Gauss-Jordan inverse of a small matrix; empty if it is singular."""
+    n = len(matrix)
+    rows = [list(row) + [float(i == j) for j in range(n)] for i, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            return []
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        scale = rows[col][col]
+        rows[col] = [value / scale for value in rows[col]]
+        for r in range(n):
+            if r != col and rows[r][col]:
+                factor = rows[r][col]
+                rows[r] = [a - factor * b for a, b in zip(rows[r], rows[col])]
+    return [row[n:] for row in rows]
+
+
+def _add_results(score: MatchScore, results) -> None:
+    for _, winner, _, _ in results:
+        if winner == 0:
+            score.wins += 1
+        elif winner == 1:
+            score.losses += 1
+        else:
+            score.draws += 1
+
+
+def _shards(n_games: int, seed: Optional[int], shard_size: int) -> list[list[tuple[int, bool]]]:
+    games = [(game_seed, i % 2 == 1) for i, game_seed in enumerate(game_seeds(n_games, seed))]
+    return [games[i:i + shard_size] for i in range(0, n_games, shard_size)]
+
+
+def run_match(
+    candidate: AgentSpec,
+    baseline: AgentSpec,
+    max_games: int = 20000,
+    sprt: Optional[SPRT] = None,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    card_spec_file_path: str = DEFAULT_CATALOGUE_PATH,
+    max_plies: int = 200,
+    shard_size: int = 8,
+    on_update: Optional[Callable[[MatchResult], None]] = None,
+) -> MatchResult:
+    """
+    Play candidate against baseline, alternating seats, until the SPRT is
+    decided or max_games have been played.
+
+    Only a couple of shards per worker are in flight at a time, so once the
+    test is decided little work is wasted; pending shards are cancelled.
+    """
+    workers = workers or os.cpu_count()
+    specs = (candidate, baseline)
+    shards = iter(_shards(max_games, seed, shard_size))
+    result = MatchResult(MatchScore())
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(card_spec_file_path,)
+    ) as pool:
+        def submit() -> bool:
+            shard = next(shards, None)
+            if shard is None:
+                return False
+            pending.add(pool.submit(play_shard, shard, specs, card_spec_file_path, max_plies))
+            return True
+
+        pending = set()
+        for _ in range(2 * workers):
+            if not submit():
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                _add_results(result.score, future.result())
+            if sprt is not None:
+                result.llr = sprt.llr(result.score)
+                result.decision = sprt.decision(result.score)
+            if on_update is not None:
+                on_update(result)
+            if result.decision is not None:
+                for future in pending:
+                    future.cancel()
+                break
+            for _ in done:
+                submit()
+    return result
+
+
+def run_round_robin(
+    specs: list[AgentSpec],
+    games_per_pair: int = 100,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    card_spec_file_path: str = DEFAULT_CATALOGUE_PATH,
+    max_plies: int = 200,
+    shard_size: int = 8,
+    on_update: Optional[Callable[[TournamentResult], None]] = None,
+) -> TournamentResult:
+    """Play every pair of agents games_per_pair times, all pairs in one pool."""
+    tournament = TournamentResult([spec.label for spec in specs])
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=init_worker,
+        initargs=(card_spec_file_path,),
+    ) as pool:
+        futures = {}
+        for pair_index, (i, j) in enumerate(combinations(range(len(specs)), 2)):
+            tournament.scores[i, j] = MatchScore()
+            pair_seed = None if seed is None else seed + pair_index
+            for shard in _shards(games_per_pair, pair_seed, shard_size):
+                future = pool.submit(play_shard, shard, (specs[i], specs[j]), card_spec_file_path, max_plies)
+                futures[future] = (i, j)
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                _add_results(tournament.scores[futures[future]], future.result())
+            if on_update is not None:
+                on_update(tournament)
+    return tournament
+
+
+if __name__ == '__main__':
+    specs = [
+        AgentSpec("random"),
+        AgentSpec("mcts", {"iterations": 20, "time_limit": None}, name="mcts-20"),
+    ]
+    tournament = run_round_robin(specs, games_per_pair=20, seed=0, shard_size=2)
+    for rating in tournament.ratings():
+        print(f"{rating.name:>10}: {rating.elo:7.1f} Elo [{rating.low:7.1f}, {rating.high:7.1f}]")
+
+    result = run_match(specs[1], specs[0], max_games=100, sprt=SPRT(0, 100), seed=1, shard_size=2)
+    elo, low, high = result.score.elo()
+    print(f"SPRT {result.decision} after {result.score.games} games "
+          f"(LLR {result.llr:.2f}), {elo:.1f} Elo [{low:.1f}, {high:.1f}]")
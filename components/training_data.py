@@ -0,0 +1,212 @@
+import json
+import os
+import random
+from typing import Optional
+
+import numpy as np
+
+from components.catalogue import DEFAULT_CATALOGUE_PATH, load_catalogue
+from components.engine import HeadlessGame
+from components.features import FeatureEncoder, action_index, action_space_size
+from components.mcts import MCTSAgent
+
+INDEX_FILE = "index.json"
+ARRAYS = ("features", "policy", "outcome")
+
+
+def _shard_path(directory: str, array: str, shard: int) -> str:
+    return os.path.join(directory, f"{array}-{shard:05d}.npy")
+
+
+class ShardWriter:
+    """
+    Streams training rows into fixed-size memory-mapped .npy shards:
+    features (float32, feature_size), policy targets (float32, action space)
+    and outcomes (float32, +1 win / -1 loss / 0 draw for the player to move).
+
+    `index.json` lists the shards and how many rows each holds; it is
+    rewritten whenever a shard fills up and on close, so readers only ever
+    see complete rows.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        feature_size: int,
+        policy_size: int,
+        shard_size: int = 65536,
+        metadata: Optional[dict] = None,
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.shapes = {"features": (feature_size,), "policy": (policy_size,), "outcome": ()}
+        self.shard_size = shard_size
+        self.metadata = metadata or {}
+        self.shards: list[int] = []  # Rows per finished shard
+        self.arrays: dict[str, np.ndarray] = {}
+        self.rows = 0  # Rows in the open shard
+        self._open_shard()
+
+    def _open_shard(self) -> None:
+        shard = len(self.shards)
+        self.arrays = {
+            name: np.lib.format.open_memmap(
+                _shard_path(self.directory, name, shard), mode="w+", dtype=np.float32,
+                shape=(self.shard_size, *self.shapes[name]),
+            )
+            for name in ARRAYS
+        }
+        self.rows = 0
+
+    def _write_index(self) -> None:
+        rows = self.shards + ([self.rows] if self.rows else [])
+        index = {
+            "shard_size": self.shard_size,
+            "feature_size": self.shapes["features"][0],
+            "policy_size": self.shapes["policy"][0],
+            "rows": rows,
+            **self.metadata,
+        }
+        path = os.path.join(self.directory, INDEX_FILE)
+        with open(path + ".tmp", "w") as file:
+            json.dump(index, file)
+        os.replace(path + ".tmp", path)
+
+    def write(self, features: np.ndarray, policy: np.ndarray, outcome: np.ndarray) -> None:
+        """Append a block of rows, spilling into new shards as they fill."""
+        start = 0
+        while start < len(features):
+            count = min(len(features) - start, self.shard_size - self.rows)
+            rows = slice(self.rows, self.rows + count)
+            self.arrays["features"][rows] = features[start:start + count]
+            self.arrays["policy"][rows] = policy[start:start + count]
+            self.arrays["outcome"][rows] = outcome[start:start + count]
+            self.rows += count
+            start += count
+            if self.rows == self.shard_size:
+                for array in self.arrays.values():
+                    array.flush()
+                self.shards.append(self.rows)
+                self._write_index()
+                self._open_shard()
+
+    def close(self) -> None:
+        for array in self.arrays.values():
+            array.flush()
+        self._write_index()
+        self.arrays = {}
+        if not self.rows:  # Drop the shard opened after the last one filled up
+            for name in ARRAYS:
+                os.remove(_shard_path(self.directory, name, len(self.shards)))
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ShardDataset:
+    """
+    Random access over exported shards. Shards are opened as read-only
+    memmaps, so a minibatch only pages in the rows it touches.
+    """
+
+    def __init__(self, directory: str) -> None:
+        with open(os.path.join(directory, INDEX_FILE)) as file:
+            self.index = json.load(file)
+        self.directory = directory
+        self.rows: list[int] = self.index["rows"]
+        self.starts = np.cumsum([0] + self.rows)
+        self._arrays: dict[tuple[str, int], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return int(self.starts[-1])
+
+    def _array(self, name: str, shard: int) -> np.ndarray:
+        key = (name, shard)
+        if key not in self._arrays:
+            self._arrays[key] = np.load(_shard_path(self.directory, name, shard), mmap_mode="r")
+        return self._arrays[key]
+
+    def batch(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Gather (features, policy, outcome) for global row numbers."""
+        rows = np.asarray(rows)
+        shards = np.searchsorted(self.starts, rows, side="right") - 1
+        out = [
+            np.empty((len(rows), *self._array(name, 0).shape[1:]), dtype=np.float32)
+            for name in ARRAYS
+        ]
+        for shard in np.unique(shards):
+            mask = shards == shard
+            local = rows[mask] - self.starts[shard]
+            order = np.argsort(local)  # Sorted reads are kinder to the page cache
+            for target, name in zip(out, ARRAYS):
+                target[np.flatnonzero(mask)[order]] = self._array(name, shard)[local[order]]
+        return out[0], out[1], out[2]
+
+    def sample(self, batch_size: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.batch(rng.integers(0, len(self), batch_size))
+
+
+def export_self_play(
+    directory: str,
+    n_games: int,
+    iterations: int = 100,
+    seed: int = 0,
+    card_spec_file_path: str = DEFAULT_CATALOGUE_PATH,
+    max_plies: int = 200,
+    shard_size: int = 65536,
+) -> int:
+    """
+    Play MCTS self-play games and export one row per ply: the position
+    features, the root visit distribution as the policy target and the final
+    result for the player to move. Returns the number of rows written.
+    """
+    catalogue = load_catalogue(card_spec_file_path)
+    encoder = FeatureEncoder(catalogue)
+    policy_size = action_space_size(catalogue)
+    rng = random.Random(seed)
+    rows = 0
+
+    metadata = {"catalogue_version": catalogue.version, "iterations": iterations, "seed": seed}
+    with ShardWriter(directory, encoder.size, policy_size, shard_size, metadata) as writer:
+        for _ in range(n_games):
+            mcts = MCTSAgent(iterations=iterations, time_limit=None, rng=random.Random(rng.getrandbits(64)))
+            policies: list[np.ndarray] = []
+            positions: list[np.ndarray] = []
+            movers: list[int] = []
+
+            def agent(game: HeadlessGame, actions):
+                policy = np.zeros(policy_size, dtype=np.float32)
+                if len(actions) == 1:
+                    action = actions[0]
+                    policy[action_index(action, catalogue)] = 1
+                else:
+                    root = mcts.search(game)
+                    for action, visits in zip(root.actions, root.visits):
+                        policy[action_index(action, catalogue)] = visits
+                    policy /= policy.sum()
+                    action = root.actions[max(range(len(root.actions)), key=root.visits.__getitem__)]
+                positions.append(encoder.encode(game))
+                policies.append(policy)
+                movers.append(game.current_player_index)
+                return action
+
+            game = HeadlessGame([agent, agent], card_spec_file_path, max_plies, seed=rng.getrandbits(64))
+            result = game.play()
+            outcome = np.array([
+                0.0 if result.winner_index is None else (1.0 if mover == result.winner_index else -1.0)
+                for mover in movers
+            ], dtype=np.float32)
+            writer.write(np.stack(positions), np.stack(policies), outcome)
+            rows += len(outcome)
+    return rows
+
+
+if __name__ == '__main__':
+    directory = os.path.join(os.path.dirname(__file__), "..", "resources", "training")
+    rows = export_self_play(directory, n_games=10, iterations=50)
+    dataset = ShardDataset(directory)
+    features, policy, outcome = dataset.sample(32, np.random.default_rng(0))
+    print(f"{rows} rows exported; minibatch {features.shape}, {policy.shape}, {outcome.shape}")
@@ -0,0 +1,337 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from components.catalogue import DEFAULT_CATALOGUE_PATH, Catalogue, load_catalogue
+from components.deck import Deck
+from components.engine import HeadlessGame
+from components.player import MAX_PRIVILEGES, MAX_TOKENS
+from components.t0ken import GOLD_INDEX, TOKEN_INDEX, Token
+from components.token_bag import TokenBag
+from components.token_board import BOARD_REPLENISH_ORDER
+from components.token_selection import TOKEN_SELECTIONS
+
+N_TOKENS = len(Token)
+TOKENS = list(Token)
+REPLENISH_CELLS = np.array([(row - 1) * 5 + col - 1 for row, col in BOARD_REPLENISH_ORDER])
+SELECTION_MASKS = np.array([mask for _, mask in TOKEN_SELECTIONS], dtype=np.int64)
+SELECTION_LENGTHS = np.array([len(coords) for coords, _ in TOKEN_SELECTIONS])
+SELECTION_CELLS = np.array(
+    [[(mask >> i) & 1 for i in range(25)] for _, mask in TOKEN_SELECTIONS], dtype=bool
+)
+CELL_BITS = 1 << np.arange(25, dtype=np.int64)
+WIN_CONDITIONS = (None, "crowns", "prestige", "color")  # Index is the result code
+POLICIES = ("random", "greedy")
+
+
+class CardTable:
+    """Catalogue columns as arrays; row len(catalogue) is an empty slot."""
+
+    def __init__(self, catalogue: Catalogue) -> None:
+        n = len(catalogue) + 1
+        self.empty = len(catalogue)
+        self.requirements = np.zeros((n, N_TOKENS), dtype=np.int16)
+        self.requirements[self.empty] = 99  # Never affordable
+        self.bonuses = np.zeros((n, N_TOKENS), dtype=np.int16)
+        self.colors = np.zeros((n, N_TOKENS), dtype=np.int16)  # Colors credited with the points
+        self.points = np.zeros(n, dtype=np.int16)
+        self.crowns = np.zeros(n, dtype=np.int16)
+        self.level_index = np.zeros(n, dtype=np.int64)
+        levels = list(catalogue.ids_by_level)
+        for card in catalogue.cards:
+            self.requirements[card.card_id] = card.requirement_vector
+            self.points[card.card_id] = card.points
+            self.level_index[card.card_id] = levels.index(card.level)
+            if card.output:  # Jewel card; prestige cards only add points
+                self.bonuses[card.card_id] = card.bonus_vector
+                self.colors[card.card_id, list(card.color_indices)] = 1
+                self.crowns[card.card_id] = card.crowns
+
+
+@dataclass(frozen=True, slots=True)
+class VectorResults:
+    winner: np.ndarray  # (games,) winning seat, -1 if the ply limit was hit
+    condition: np.ndarray  # (games,) index into WIN_CONDITIONS
+    plies: np.ndarray  # (games,)
+    elapsed: float  # seconds
+
+    @property
+    def games_per_second(self) -> float:
+        return len(self.winner) / self.elapsed if self.elapsed else float("inf")
+
+    def win_rates(self, n_players: int = 2) -> list[float]:
+        return [float(np.mean(self.winner == seat)) for seat in range(n_players)]
+
+    def win_conditions(self) -> dict[Optional[str], int]:
+        counts = np.bincount(self.condition, minlength=len(WIN_CONDITIONS))
+        return {name: int(count) for name, count in zip(WIN_CONDITIONS, counts) if name is not None}
+
+
+class VectorGames:
+    """
+    Many independent two-player games advanced in lockstep as arrays, under the
+    same rules as HeadlessGame (see its docstring).
+
+    State: board (games, 25) token codes (0 empty, token index + 1), bag
+    (games, 7) counts, per-seat holdings (games, players, 7), pile contents
+    with a cursor per level, and active card slots (games, slots) holding the
+    catalogue's empty row once a pile runs dry.
+
+    Games draw from one NumPy generator, so they follow the same rules and
+    distributions as HeadlessGame but not the same trajectories for a seed.
+    `from_games` loads HeadlessGame positions to check the rules side by side.
+    """
+
+    def __init__(
+        self,
+        n_games: int,
+        seed: Optional[int] = None,
+        card_spec_file_path: str = DEFAULT_CATALOGUE_PATH,
+        max_plies: int = 200,
+        n_players: int = 2,
+    ) -> None:
+        self.rng = np.random.default_rng(seed)
+        self.catalogue = load_catalogue(card_spec_file_path)
+        self.cards = CardTable(self.catalogue)
+        self.n_games, self.n_players, self.max_plies = n_games, n_players, max_plies
+        self.levels = list(self.catalogue.ids_by_level)
+        self.slot_counts = [Deck._get_max_card_count(level) for level in self.levels]
+        self.slot_level = np.repeat(np.arange(len(self.levels)), self.slot_counts)
+
+        g = n_games
+        self.board = np.zeros((g, 25), dtype=np.int8)
+        self.bag = np.tile(np.bincount([TOKEN_INDEX[t] for t in TokenBag._fill_with_tokens()],
+                                       minlength=N_TOKENS).astype(np.int16), (g, 1))
+        self.tokens = np.zeros((g, n_players, N_TOKENS), dtype=np.int16)
+        self.bonuses = np.zeros((g, n_players, N_TOKENS), dtype=np.int16)
+        self.color_prestige = np.zeros((g, n_players, N_TOKENS), dtype=np.int16)
+        self.crowns = np.zeros((g, n_players), dtype=np.int16)
+        self.prestige = np.zeros((g, n_players), dtype=np.int16)
+        self.privileges = np.zeros((g, n_players), dtype=np.int16)
+        self.current = np.zeros(g, dtype=np.int64)
+        self.plies = np.zeros(g, dtype=np.int64)
+        self.winner = np.full(g, -1, dtype=np.int64)
+        self.condition = np.zeros(g, dtype=np.int64)
+
+        # Piles: shuffled ids per level, top of pile at cursor - 1
+        pile_size = max(len(ids) for ids in self.catalogue.ids_by_level.values())
+        self.piles = np.full((g, len(self.levels), pile_size), self.cards.empty, dtype=np.int64)
+        self.cursor = np.zeros((g, len(self.levels)), dtype=np.int64)
+        for i, level in enumerate(self.levels):
+            ids = np.array(self.catalogue.ids_by_level[level])
+            order = np.argsort(self.rng.random((g, len(ids))), axis=1)
+            self.piles[:, i, :len(ids)] = ids[order]
+            self.cursor[:, i] = len(ids)
+
+        self.active = np.full((g, sum(self.slot_counts)), self.cards.empty, dtype=np.int64)
+        for slot, i in enumerate(self.slot_level):
+            self.active[:, slot] = self._draw(np.arange(g), np.full(g, i))
+
+        self._replenish(np.arange(g))
+
+    @classmethod
+    def from_games(cls, games: list[HeadlessGame]) -> "VectorGames":
+        """Copy HeadlessGame positions (same catalogue) into one batch."""
+        vector = cls.__new__(cls)
+        first = games[0]
+        vector.rng = np.random.default_rng()
+        vector.catalogue = first.deck.catalogue
+        vector.cards = CardTable(vector.catalogue)
+        vector.n_games, vector.n_players, vector.max_plies = len(games), len(first.players), first.max_plies
+        vector.levels = list(vector.catalogue.ids_by_level)
+        vector.slot_counts = [Deck._get_max_card_count(level) for level in vector.levels]
+        vector.slot_level = np.repeat(np.arange(len(vector.levels)), vector.slot_counts)
+
+        vector.board = np.array([
+            [0 if field.token is None else TOKEN_INDEX[field.token] + 1 for row in game.token_board.fields for field in row]
+            for game in games
+        ], dtype=np.int8)
+        vector.bag = np.array([
+            np.bincount([TOKEN_INDEX[t] for t in game.token_bag.tokens], minlength=N_TOKENS) for game in games
+        ], dtype=np.int16)
+        for name in ("tokens", "bonuses", "color_prestige"):
+            setattr(vector, name, np.array([[getattr(p, name) for p in game.players] for game in games], dtype=np.int16))
+        for name in ("crowns", "prestige", "privileges"):
+            setattr(vector, name, np.array([[getattr(p, name) for p in game.players] for game in games], dtype=np.int16))
+        vector.current = np.array([game.current_player_index for game in games], dtype=np.int64)
+        vector.plies = np.array([game.plies for game in games], dtype=np.int64)
+        vector.winner = np.array([-1 if game.winner_index is None else game.winner_index for game in games])
+        vector.condition = np.array([WIN_CONDITIONS.index(game.win_condition) for game in games])
+
+        pile_size = max(len(ids) for ids in vector.catalogue.ids_by_level.values())
+        vector.piles = np.full((len(games), len(vector.levels), pile_size), vector.cards.empty, dtype=np.int64)
+        vector.cursor = np.zeros((len(games), len(vector.levels)), dtype=np.int64)
+        vector.active = np.full((len(games), sum(vector.slot_counts)), vector.cards.empty, dtype=np.int64)
+        starts = np.cumsum([0] + vector.slot_counts)
+        for g, game in enumerate(games):
+            for i, level in enumerate(vector.levels):
+                pile = game.deck.piles[level]
+                vector.piles[g, i, :len(pile)] = pile
+                vector.cursor[g, i] = len(pile)
+                active = [card.card_id for card in game.deck.active_cards[level]]
+                vector.active[g, starts[i]:starts[i] + len(active)] = active
+        return vector
+
+    @property
+    def done(self) -> np.ndarray:
+        return (self.winner >= 0) | (self.plies >= self.max_plies)
+
+    # Legal moves
+
+    def _seat(self, array: np.ndarray, games: np.ndarray) -> np.ndarray:
+        return array[games, self.current[games]]
+
+    def legal_takes(self, games: np.ndarray) -> np.ndarray:
+        """(len(games), selections) mask of legal token selections."""
+        occupied = ((self.board[games] > 0) * CELL_BITS).sum(axis=1)
+        room = MAX_TOKENS - self._seat(self.tokens, games).sum(axis=1)
+        fits = SELECTION_LENGTHS[None, :] <= np.minimum(room, 3)[:, None]
+        return ((occupied[:, None] & SELECTION_MASKS[None, :]) == SELECTION_MASKS[None, :]) & fits
+
+    def _need(self, games: np.ndarray) -> np.ndarray:
+        """Tokens still owed per active card and color after bonuses."""
+        requirements = self.cards.requirements[self.active[games]]
+        return np.maximum(requirements - self._seat(self.bonuses, games)[:, None, :], 0)
+
+    def affordable(self, games: np.ndarray) -> np.ndarray:
+        """(len(games), slots) mask of the active cards the player to move can pay for."""
+        tokens = self._seat(self.tokens, games)
+        shortfall = np.maximum(self._need(games) - tokens[:, None, :], 0).sum(axis=2)
+        return shortfall <= tokens[:, GOLD_INDEX][:, None]
+
+    def can_replenish(self, games: np.ndarray) -> np.ndarray:
+        return (self.bag[games].sum(axis=1) > 0) & (self.board[games] == 0).any(axis=1)
+
+    # Actions
+
+    def _draw(self, games: np.ndarray, levels: np.ndarray) -> np.ndarray:
+        """Pop the top card of each game's pile, or the empty row if it is out."""
+        cursor = self.cursor[games, levels]
+        has_card = cursor > 0
+        drawn = np.full(len(games), self.cards.empty, dtype=np.int64)
+        drawn[has_card] = self.piles[games[has_card], levels[has_card], cursor[has_card] - 1]
+        self.cursor[games[has_card], levels[has_card]] -= 1
+        return drawn
+
+    def _replenish(self, games: np.ndarray) -> None:
+        """Fill empty cells in BOARD_REPLENISH_ORDER with random draws from the bag."""
+        for cell in REPLENISH_CELLS:
+            fill = games[(self.board[games, cell] == 0) & (self.bag[games].sum(axis=1) > 0)]
+            if not len(fill):
+                continue
+            bag = self.bag[fill]
+            cumulative = np.cumsum(bag, axis=1)
+            pick = (self.rng.random(len(fill)) * cumulative[:, -1]).astype(np.int64)
+            token = (cumulative > pick[:, None]).argmax(axis=1)
+            self.board[fill, cell] = token + 1
+            self.bag[fill, token] -= 1
+
+    def _take(self, games: np.ndarray, selections: np.ndarray) -> None:
+        cells = SELECTION_CELLS[selections]
+        codes = np.where(cells, self.board[games], 0)
+        gained = (codes[:, :, None] == np.arange(1, N_TOKENS + 1)).sum(axis=1)
+        self.tokens[games, self.current[games]] += gained.astype(np.int16)
+        self.board[games] = np.where(cells, 0, self.board[games])
+
+    def _buy(self, games: np.ndarray, slots: np.ndarray) -> None:
+        seats = self.current[games]
+        cards = self.active[games, slots]
+        tokens = self.tokens[games, seats]
+        need = np.maximum(self.cards.requirements[cards] - self.bonuses[games, seats], 0)
+        payment = np.minimum(need, tokens)  # Colored tokens first, gold covers the rest
+        payment[:, GOLD_INDEX] += (need - payment).sum(axis=1)
+        self.tokens[games, seats] -= payment
+        self.bag[games] += payment
+        self.bonuses[games, seats] += self.cards.bonuses[cards]
+        self.color_prestige[games, seats] += self.cards.colors[cards] * self.cards.points[cards][:, None]
+        self.crowns[games, seats] += self.cards.crowns[cards]
+        self.prestige[games, seats] += self.cards.points[cards]
+        self.active[games, slots] = self._draw(games, self.slot_level[slots])
+
+    def _replenish_action(self, games: np.ndarray) -> None:
+        following = (self.current[games] + 1) % self.n_players
+        self.privileges[games, following] = np.minimum(self.privileges[games, following] + 1, MAX_PRIVILEGES)
+        self._replenish(games)
+
+    # Policies
+
+    def _choose(self, games: np.ndarray, policy: str) -> tuple[np.ndarray, np.ndarray]:
+        """Pick (kind, argument) per game: 0 take, 1 buy, 2 replenish, 3 pass."""
+        takes = self.legal_takes(games)
+        buys = self.affordable(games)
+        replenish = self.can_replenish(games)
+        n_takes, n_buys = takes.sum(axis=1), buys.sum(axis=1)
+
+        if policy == "random":
+            # Uniform over every legal action, like random_agent
+            total = n_takes + n_buys + replenish
+            pick = (self.rng.random(len(games)) * total).astype(np.int64)
+            kind = np.where(pick < n_takes, 0, np.where(pick < n_takes + n_buys, 1, 2))
+            kind[total == 0] = 3
+            take_rank = np.where(kind == 0, pick, 0)
+            buy_rank = np.where(kind == 1, pick - n_takes, 0)
+            take = (np.cumsum(takes, axis=1) > take_rank[:, None]).argmax(axis=1)
+            buy = (np.cumsum(buys, axis=1) > buy_rank[:, None]).argmax(axis=1)
+        else:
+            # Greedy: the richest affordable card, else the longest token line
+            points = np.where(buys, self.cards.points[self.active[games]] + 1, 0)
+            buy = points.argmax(axis=1)
+            length = np.where(takes, SELECTION_LENGTHS[None, :] + self.rng.random(takes.shape), 0)
+            take = length.argmax(axis=1)
+            kind = np.where(n_buys > 0, 1, np.where(n_takes > 0, 0, np.where(replenish, 2, 3)))
+        return kind, np.where(kind == 0, take, buy)
+
+    def step(self, policy: str = "random") -> None:
+        """Play one ply in every unfinished game."""
+        games = np.flatnonzero(~self.done)
+        if not len(games):
+            return
+        kind, argument = self._choose(games, policy)
+        for code, apply in ((0, self._take), (1, self._buy)):
+            mask = kind == code
+            if mask.any():
+                apply(games[mask], argument[mask])
+        if (kind == 2).any():
+            self._replenish_action(games[kind == 2])
+
+        seats = self.current[games]
+        condition = np.zeros(len(games), dtype=np.int64)
+        condition[(self.color_prestige[games, seats].max(axis=1) >= 10)] = 3
+        condition[self.prestige[games, seats] >= 20] = 2
+        condition[self.crowns[games, seats] >= 10] = 1
+        won = condition > 0
+        self.winner[games[won]] = seats[won]
+        self.condition[games[won]] = condition[won]
+        self.current[games[~won]] = (seats[~won] + 1) % self.n_players
+        self.plies[games] += 1
+
+    def play(self, policy: str = "random") -> VectorResults:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}; expected one of {POLICIES}.")
+        start = time.perf_counter()
+        while not self.done.all():
+            self.step(policy)
+        return VectorResults(self.winner.copy(), self.condition.copy(), self.plies.copy(),
+                             time.perf_counter() - start)
+
+
+def simulate(
+    n_games: int,
+    policy: str = "random",
+    seed: Optional[int] = None,
+    card_spec_file_path: str = DEFAULT_CATALOGUE_PATH,
+    max_plies: int = 200,
+) -> VectorResults:
+    start = time.perf_counter()
+    results = VectorGames(n_games, seed, card_spec_file_path, max_plies).play(policy)
+    return VectorResults(results.winner, results.condition, results.plies, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    for policy in POLICIES:
+        results = simulate(10000, policy, seed=0)
+        print(f"{policy}: {len(results.winner)} games in {results.elapsed:.2f}s "
+              f"({results.games_per_second:.0f} games/sec), mean plies {results.plies.mean():.1f}, "
+              f"win rates {results.win_rates()}, {results.win_conditions()}")
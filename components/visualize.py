@@ -1,9 +1,32 @@
+import os
+import shutil
+import subprocess
+from typing import Iterable, Iterator, Optional
+
 import matplotlib.colors as mcolors
 import matplotlib.patches as patches
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from PIL import Image
 
+from components.catalogue import DEFAULT_CATALOGUE_PATH
+from components.engine import HeadlessGame
+from components.game_record import GameRecord
+from components.t0ken import TOKEN_INDEX, Token
 from components.token_board import TokenBoard
 
+EMPTY_COLOR = "#808080"
+# RGB per cell code: 0 = empty, token index + 1 otherwise
+CELL_COLORS = np.array(
+    [mcolors.hex2color(EMPTY_COLOR)] + [mcolors.hex2color(token.value) for token in Token],
+    dtype=np.float32,
+)
+Frame = tuple[np.ndarray, str]  # (5 x 5 cell codes, caption)
+
 
 def visualize_token_board(token_board: TokenBoard) -> None:
     # Plot a color grid representing the board fields (2d list) and their tokens.
@@ -11,7 +34,7 @@ def visualize_token_board(token_board: TokenBoard) -> None:
     # expected by matplotlib. Fill in fields without a token as gray.
     color_grid: list[list[tuple[float, float, float]]] = [
         [
-            _hex_to_rgb(getattr(getattr(field, "token", None), "value", "#808080"))
+            _hex_to_rgb(getattr(getattr(field, "token", None), "value", EMPTY_COLOR))
             for field in row
         ]
         for row in token_board.fields
@@ -44,3 +67,227 @@ def visualize_token_board(token_board: TokenBoard) -> None:
 
 def _hex_to_rgb(hex_color: str) -> tuple[float, float, float]:
     return mcolors.hex2color(hex_color)
+
+
+def board_codes(token_board: TokenBoard) -> np.ndarray:
+    """5 x 5 cell codes (0 empty, token index + 1) of a token board."""
+    return np.array(
+        [[0 if field.token is None else TOKEN_INDEX[field.token] + 1 for field in row] for row in token_board.fields],
+        dtype=np.uint8,
+    )
+
+
+class BoardView:
+    """
+    Persistent token-board figure that redraws by blitting.
+
+    The axes, ticks and title are drawn once and cached as the background;
+    `update` rewrites only the changed cells of the image data and redraws
+    the image, grid and caption on top of that background. With headless
+    the figure lives on an Agg canvas outside pyplot, and `frame` returns
+    the rendered pixels for export.
+    """
+
+    def __init__(self, headless: bool = False, size: float = 4.0, dpi: int = 64, title: str = "Token Board") -> None:
+        self.headless = headless
+        if headless:
+            self.figure = Figure(figsize=(size, size), dpi=dpi)
+            FigureCanvasAgg(self.figure)
+            self.ax = self.figure.add_subplot()
+        else:
+            self.figure, self.ax = plt.subplots(figsize=(size, size), dpi=dpi)
+        self.canvas = self.figure.canvas
+
+        self.codes = np.zeros((5, 5), dtype=np.uint8)
+        self.rgb = CELL_COLORS[self.codes]
+        self.image = self.ax.imshow(self.rgb, aspect="equal", interpolation="nearest", animated=True)
+        edges = np.arange(6) - 0.5
+        self.grid = LineCollection(
+            [[(x, -0.5), (x, 4.5)] for x in edges] + [[(-0.5, y), (4.5, y)] for y in edges],
+            colors="black", linewidths=1, animated=True,
+        )
+        self.ax.add_collection(self.grid)
+        self.caption = self.ax.text(0.5, -0.12, "", transform=self.ax.transAxes, ha="center", animated=True)
+        self.ax.set_xticks(range(5))
+        self.ax.set_yticks(range(5))
+        self.ax.set_xticklabels(range(1, 6))
+        self.ax.set_yticklabels(range(1, 6))
+        self.ax.set_title(title)
+
+        self.background = None
+        if not headless:
+            self.canvas.mpl_connect("draw_event", self._on_draw)  # Window resizes invalidate the background
+            plt.show(block=False)
+            plt.pause(0.001)
+        self.canvas.draw()
+        self._on_draw(None)
+
+    def _on_draw(self, event) -> None:
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self) -> None:
+        self.ax.draw_artist(self.image)
+        self.ax.draw_artist(self.grid)
+        self.ax.draw_artist(self.caption)
+
+    def update(self, codes: np.ndarray, caption: str = "") -> bool:
+        """Show new cell codes; returns False (and draws nothing) if nothing changed."""
+        changed = codes != self.codes
+        if not changed.any() and caption == self.caption.get_text():
+            return False
+        self.rgb[changed] = CELL_COLORS[codes[changed]]
+        self.codes[changed] = codes[changed]
+        self.image.set_data(self.rgb)
+        self.caption.set_text(caption)
+
+        self.canvas.restore_region(self.background)
+        self._draw_animated()
+        if not self.headless:
+            self.canvas.blit(self.figure.bbox)
+            self.canvas.flush_events()
+        return True
+
+    def show(self, token_board: TokenBoard, caption: str = "") -> bool:
+        return self.update(board_codes(token_board), caption)
+
+    def frame(self) -> np.ndarray:
+        """The current picture as an (height, width, 3) uint8 array."""
+        return np.asarray(self.canvas.buffer_rgba())[..., :3].copy()
+
+    def close(self) -> None:
+        if not self.headless:
+            plt.close(self.figure)
+
+
+class FrameWriter:
+    """
+    Streams frames to disk. The format follows the path:
+      .gif          animated GIF (frames are palettized and written on close)
+      .mp4          H.264 through an ffmpeg pipe
+      anything else a directory of frame-NNNNN.png files
+    `repeat` holds the previous frame one step longer, which a GIF stores as
+    a longer frame duration.
+    """
+
+    def __init__(self, path: str, fps: float = 10) -> None:
+        self.path = path
+        self.fps = fps
+        self.kind = os.path.splitext(path)[1].lower() or ".png"
+        self.frames = 0
+        self.gif_frames: list[Image.Image] = []
+        self.durations: list[float] = []
+        self.last: Optional[np.ndarray] = None
+        self.process: Optional[subprocess.Popen] = None
+        if self.kind == ".mp4":
+            ffmpeg = shutil.which(rcParams["animation.ffmpeg_path"])
+            if ffmpeg is None:
+                raise ValueError("MP4 export needs ffmpeg; write a .gif or a PNG directory instead.")
+            self.ffmpeg = ffmpeg
+        elif self.kind not in (".gif", ".png"):
+            raise ValueError(f"Unknown frame format {self.kind!r}; expected .gif, .mp4 or a directory.")
+        if self.kind == ".png":
+            os.makedirs(path, exist_ok=True)
+
+    def write(self, frame: np.ndarray) -> None:
+        self.last = frame
+        self.frames += 1
+        if self.kind == ".gif":
+            self.gif_frames.append(Image.fromarray(frame).quantize(method=Image.Quantize.FASTOCTREE))
+            self.durations.append(1000 / self.fps)
+        elif self.kind == ".mp4":
+            if self.process is None:
+                height, width = frame.shape[:2]
+                self.process = subprocess.Popen(
+                    [self.ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                     "-s", f"{width}x{height}", "-r", str(self.fps), "-i", "-",
+                     "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", self.path],
+                    stdin=subprocess.PIPE,
+                )
+            self.process.stdin.write(frame.tobytes())
+        else:
+            Image.fromarray(frame).save(os.path.join(self.path, f"frame-{self.frames - 1:05d}.png"), compress_level=1)
+
+    def repeat(self) -> None:
+        if self.last is None:
+            return
+        if self.kind == ".gif":
+            self.durations[-1] += 1000 / self.fps
+        else:
+            self.write(self.last)
+
+    def close(self) -> None:
+        if self.kind == ".gif" and self.gif_frames:
+            first, *rest = self.gif_frames
+            first.save(self.path, save_all=True, append_images=rest, duration=self.durations, loop=0)
+            self.gif_frames = []
+        elif self.process is not None:
+            self.process.stdin.close()
+            if self.process.wait():
+                raise ValueError(f"ffmpeg failed writing {self.path}.")
+            self.process = None
+
+    def __enter__(self) -> "FrameWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def export_frames(frames: Iterable[Frame], path: str, fps: float = 10, size: float = 4.0, dpi: int = 64) -> int:
+    """Render (codes, caption) frames headlessly into path; returns the frame count."""
+    view = BoardView(headless=True, size=size, dpi=dpi)
+    count = 0
+    with FrameWriter(path, fps) as writer:
+        for codes, caption in frames:
+            if view.update(codes, caption) or not writer.frames:
+                writer.write(view.frame())
+            else:
+                writer.repeat()
+            count += 1
+    return count
+
+
+def _caption(game: HeadlessGame) -> str:
+    if game.winner_index is not None:
+        return f"Ply {game.plies}: player {game.winner_index + 1} wins ({game.win_condition})"
+    return f"Ply {game.plies}: player {game.current_player_index + 1} to move"
+
+
+def game_frames(game: HeadlessGame) -> Iterator[Frame]:
+    """Play the game with its own agents, yielding the board before and after every ply."""
+    yield board_codes(game.token_board), _caption(game)
+    while not game.is_over:
+        game.apply(game.agents[game.current_player_index](game, game.legal_actions()))
+        yield board_codes(game.token_board), _caption(game)
+
+
+def record_frames(record: GameRecord, card_spec_file_path: str = DEFAULT_CATALOGUE_PATH) -> Iterator[Frame]:
+    for game in record.positions(card_spec_file_path):
+        yield board_codes(game.token_board), _caption(game)
+
+
+def watch(frames: Iterable[Frame], delay: float = 0.2) -> None:
+    """Animate frames in a live window."""
+    view = BoardView()
+    for codes, caption in frames:
+        view.update(codes, caption)
+        # Unlike plt.pause, this runs the GUI loop without a full redraw of the figure
+        view.canvas.start_event_loop(delay)
+    plt.show()
+
+
+if __name__ == '__main__':
+    import tempfile
+    import time
+
+    from components.engine import random_agent
+
+    directory = tempfile.mkdtemp()
+    start = time.perf_counter()
+    frames = 0
+    for seed in range(20):
+        game = HeadlessGame([random_agent(), random_agent()], seed=seed)
+        frames += export_frames(game_frames(game), os.path.join(directory, f"board-{seed}.gif"))
+    elapsed = time.perf_counter() - start
+    print(f"{frames} frames in {elapsed:.2f}s ({frames / elapsed * 60:.0f} frames/min)")
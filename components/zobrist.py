@@ -0,0 +1,80 @@
+import random
+
+from components.player import MAX_PRIVILEGES
+from components.t0ken import TOKEN_INDEX, Token
+
+MAX_PLAYERS = 4
+MAX_CARDS = 128  # Upper bound on card ids in the catalogue
+MAX_TOKEN_COUNT = 25  # Tokens of one color in any one place
+
+
+class ZobristKeys:
+    """
+    Random 64-bit keys for every component of a game position.
+
+    A position hashes to the XOR of the keys of its parts: board fields by
+    token, bag and player holdings by (color, count) so they hash as
+    multisets, active cards, pile sizes, owned cards (which also fix crowns
+    and prestige), privileges and the side to move.
+    """
+
+    def __init__(self, seed: int = 0x5EED) -> None:
+        rng = random.Random(seed)
+
+        def keys(n: int) -> list[int]:
+            return [rng.getrandbits(64) for _ in range(n)]
+
+        self.board = [keys(len(Token)) for _ in range(25)]
+        self.bag = [keys(MAX_TOKEN_COUNT + 1) for _ in Token]
+        self.pile_size = [keys(MAX_CARDS + 1) for _ in range(3)]
+        self.active = keys(MAX_CARDS)
+        self.player_tokens = [
+            [keys(MAX_TOKEN_COUNT + 1) for _ in Token] for _ in range(MAX_PLAYERS)
+        ]
+        self.player_cards = [keys(MAX_CARDS) for _ in range(MAX_PLAYERS)]
+        self.privileges = [keys(MAX_PRIVILEGES + 1) for _ in range(MAX_PLAYERS)]
+        self.side = keys(MAX_PLAYERS)
+
+
+ZOBRIST = ZobristKeys()
+
+
+def hash_tokens(keys: list[list[int]], tokens: list[Token]) -> int:
+    """Hash a token multiset given per-color (count -> key) tables."""
+    h = 0
+    for color_keys, token in zip(keys, Token):
+        h ^= color_keys[tokens.count(token)]
+    return h
+
+
+def hash_counts(keys: list[list[int]], counts: list[int]) -> int:
+    """Hash a token count vector given per-color (count -> key) tables."""
+    h = 0
+    for color_keys, count in zip(keys, counts):
+        h ^= color_keys[count]
+    return h
+
+
+def hash_game(game) -> int:
+    """Hash a HeadlessGame position from scratch."""
+    h = ZOBRIST.side[game.current_player_index]
+
+    for i, field in enumerate(field for row in game.token_board.fields for field in row):
+        if field.token is not None:
+            h ^= ZOBRIST.board[i][TOKEN_INDEX[field.token]]
+
+    h ^= hash_tokens(ZOBRIST.bag, game.token_bag.tokens)
+
+    for level, pile in game.deck.piles.items():
+        h ^= ZOBRIST.pile_size[level][len(pile)]
+    for cards in game.deck.active_cards.values():
+        for card in cards:
+            h ^= ZOBRIST.active[card.card_id]
+
+    for p, player in enumerate(game.players):
+        h ^= hash_counts(ZOBRIST.player_tokens[p], player.tokens)
+        for card in player.jewel_cards + player.prestige_cards:
+            h ^= ZOBRIST.player_cards[p][card.card_id]
+        h ^= ZOBRIST.privileges[p][player.privileges]
+
+    return h
@@ -0,0 +1,9 @@
+from components.catalogue import compile_catalogue
+
+# Run from helper/ with the repository root on PYTHONPATH, after csv_to_json.py
+card_spec_file = "../resources/deck/deck.json"
+output_file = "../resources/deck/deck.bin"
+
+version = compile_catalogue(card_spec_file, output_file)
+
+print(f"Compiled {card_spec_file} to {output_file} (catalogue version {version:#010x}).")
@@ -0,0 +1,34 @@
+from benchmarks.harness import BENCHMARKS, compare, regressions, run_suite
+from benchmarks import suite  # Registers the benchmarks
+
+
+def test_run_suite():
+    assert {'deck_construction', 'token_board_replenish', 'token_board_take_tokens', 'player_check_win_condition',
+            'legal_actions', 'deepcopy_game', 'random_playout'} <= set(BENCHMARKS)
+    names = ['player_win_condition', 'compact_token_board_copy']
+    report = run_suite(names, {'meta': {}, 'results': {}}, repeats=2, min_time=0.001)
+    assert set(report['results']) == set(names) and report['meta']['repeats'] == 2
+    assert report['comparison'] == {}
+    for result in report['results'].values():
+        assert result['unit'] == 's/op' and 0 < result['best'] <= result['median']
+
+
+def test_compare():
+    assert compare(1.05, 1.0, 0.1).status == 'ok'
+    assert compare(1.2, 1.0, 0.1).status == 'regression'
+    assert compare(0.8, 1.0, 0.1).status == 'improvement'
+    assert compare(2.0, 1.0, 0.1).ratio == 2.0
+
+    # Only regressions fail a run
+    report = {'comparison': {
+        'slower': {'ratio': 1.5, 'threshold': 0.1, 'status': 'regression'},
+        'faster': {'ratio': 0.5, 'threshold': 0.1, 'status': 'improvement'},
+        'same': {'ratio': 1.0, 'threshold': 0.1, 'status': 'ok'},
+    }}
+    assert regressions(report) == ['slower']
+    assert regressions({'results': {}}) == []
+
+
+if __name__ == '__main__':
+    test_run_suite()
+    test_compare()
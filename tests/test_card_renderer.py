@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+
+from PIL import Image
+
+from components.card import Card
+from components.card_renderer import ATLAS_FILE, CARD_SIZE, MANIFEST_FILE, card_hash, render_deck
+from components.catalogue import load_catalogue
+
+
+def test_render_deck():
+    path = '../resources/deck/deck.json'
+    output_dir = tempfile.mkdtemp()
+    n_cards = len(load_catalogue(path))
+
+    report = render_deck(output_dir, path, workers=1)
+    assert len(report.rendered) == n_cards and not report.skipped
+    with open(os.path.join(output_dir, ATLAS_FILE)) as file:
+        atlas = json.load(file)
+    assert len(atlas['frames']) == n_cards
+    frame = atlas['frames']['12']
+    with Image.open(report.sheet_path) as sheet, \
+            Image.open(os.path.join(output_dir, 'card-012.png')) as card:
+        assert sheet.size == tuple(atlas['size']) and card.size == CARD_SIZE
+        crop = sheet.crop((frame['x'], frame['y'], frame['x'] + frame['w'], frame['y'] + frame['h']))
+        assert crop.tobytes() == card.convert('RGB').tobytes()
+
+    # Unchanged cards are skipped; a changed hash re-renders just that card
+    assert not render_deck(output_dir, path, workers=1).rendered
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(manifest_path) as file:
+        manifest = json.load(file)
+    manifest['3'] = 'stale'
+    with open(manifest_path, 'w') as file:
+        json.dump(manifest, file)
+    assert render_deck(output_dir, path, workers=1).rendered == [3]
+
+
+def test_card_hash():
+    # Requirements are drawn in spec order, so reordering them changes the picture
+    card = Card(0, 1, requirements={'green': 2, 'red': 1}, output={'blue': 1})
+    assert card_hash(card) == card_hash(Card(0, 1, requirements={'green': 2, 'red': 1}, output={'blue': 1}))
+    assert card_hash(card) != card_hash(Card(0, 1, requirements={'red': 1, 'green': 2}, output={'blue': 1}))
+
+
+if __name__ == '__main__':
+    test_render_deck()
+    test_card_hash()
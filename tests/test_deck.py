@@ -1,3 +1,10 @@
+import json
+import os
+import tempfile
+
+from components.card import Card
+from components.catalogue import compile_catalogue, load_catalogue
+from components.compact_deck import EMPTY_SLOT, CompactDeck
 from components.deck import Deck
 
 
@@ -8,5 +15,91 @@ def test_deck():
     deck.display_active_cards()
 
 
+def test_compact_deck():
+    deck = Deck('../resources/deck/deck.json', verbose=False)
+    compact = CompactDeck.from_deck(deck)
+    assert {level: [card.card_id for card in pile] for level, pile in compact.piles.items()} == deck.piles
+    assert compact.active_cards == deck.active_cards
+
+    clone = compact.copy()
+    bought, replacement = compact.buy(0, 2)
+    assert bought == deck.active_cards[0][2].card_id
+    assert replacement == deck.piles[0][-1]
+    taken = compact.take(1, 0)
+    assert taken == deck.piles[1][0]
+    assert compact != clone
+
+    compact.untake(1, 0)
+    compact.unbuy(0, 2, bought, replacement)
+    assert compact == clone
+
+    # Emptied piles leave empty slots behind
+    while compact.draw(2) is not None:
+        pass
+    compact.buy(2, 0)
+    assert compact.active_slot(2, 0) == EMPTY_SLOT
+    assert len(compact.active_cards[2]) == 2
+    compact.display_piles()
+    compact.display_active_cards()
+
+
+def test_stale_compiled_catalogue():
+    directory = tempfile.mkdtemp()
+    json_path, bin_path = os.path.join(directory, 'deck.json'), os.path.join(directory, 'deck.bin')
+    with open('../resources/deck/deck.json') as file:
+        items = json.load(file)
+    with open(json_path, 'w') as file:
+        json.dump(items, file)
+    compile_catalogue(json_path, bin_path)
+
+    # Editing deck.json after compiling makes loads read the JSON, leaving deck.bin alone
+    with open(bin_path, 'rb') as file:
+        compiled = file.read()
+    items[0]['points'] += 1
+    with open(json_path, 'w') as file:
+        json.dump(items, file)
+    catalogue = load_catalogue(bin_path)
+    assert catalogue[0].points == items[0]['points']
+    assert catalogue.version == load_catalogue(json_path).version
+    with open(bin_path, 'rb') as file:
+        assert file.read() == compiled
+
+
+def _card_fields(catalogue):
+    return [[getattr(card, name) for name in Card.__slots__] for card in catalogue.cards]
+
+
+def test_compiled_catalogue_matches_json():
+    assert _card_fields(load_catalogue('../resources/deck/deck.bin')) == \
+        _card_fields(load_catalogue('../resources/deck/deck.json'))
+
+    # Null features and requirements listed out of enum order survive compiling
+    directory = tempfile.mkdtemp()
+    json_path, bin_path = os.path.join(directory, 'deck.json'), os.path.join(directory, 'deck.bin')
+    items = [{'level': 1, 'points': 2, 'feature': None, 'requirements': {'red': 3, 'white': 1},
+              'output': {'gold': 1, 'blue': 1}, 'crowns': 1}]
+    with open(json_path, 'w') as file:
+        json.dump(items, file)
+    compile_catalogue(json_path, bin_path)
+    compiled = load_catalogue(bin_path)
+    assert compiled[0].feature is None
+    assert _card_fields(compiled) == _card_fields(load_catalogue(json_path))
+
+    # Levels a Deck cannot deal are rejected
+    items[0]['level'] = 3
+    bad_path = os.path.join(directory, 'bad.json')
+    with open(bad_path, 'w') as file:
+        json.dump(items, file)
+    try:
+        load_catalogue(bad_path)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Levels a Deck cannot deal must be rejected")
+
+
 if __name__ == '__main__':
-    test_deck()
\ No newline at end of file
+    test_deck()
+    test_compact_deck()
+    test_stale_compiled_catalogue()
+    test_compiled_catalogue_matches_json()
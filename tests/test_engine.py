@@ -0,0 +1,133 @@
+import random
+
+from components.determinization import Determinizer, hidden_state
+from components.engine import HeadlessGame, random_agent
+from components.mcts import MCTSAgent
+from components.rng import GameRNG
+from components.token_bag import CountTokenBag
+from components.zobrist import hash_game
+
+
+def test_headless_game():
+    rng = random.Random(0)
+    game = HeadlessGame([random_agent(rng), random_agent(rng)], '../resources/deck/deck.json')
+    result = game.play()
+
+    assert 0 < result.plies <= game.max_plies
+    if result.winner_index is not None:
+        assert result.win_condition in ("crowns", "prestige", "color")
+        assert result.winner_name == game.players[result.winner_index].name
+
+    # Tokens are never created or destroyed
+    tokens_on_board = sum(field.token is not None for row in game.token_board.fields for field in row)
+    tokens_held = sum(sum(player.tokens) for player in game.players)
+    assert tokens_on_board + tokens_held + len(game.token_bag.tokens) == 25
+
+
+def _snapshot(game):
+    return (
+        [[field.token for field in row] for row in game.token_board.fields],
+        sorted(token.name for token in game.token_bag.tokens),
+        {level: list(pile) for level, pile in game.deck.piles.items()},
+        {level: list(cards) for level, cards in game.deck.active_cards.items()},
+        [(list(p.tokens), list(p.jewel_cards), list(p.prestige_cards), p.privileges,
+          p.crowns, p.prestige, list(p.color_prestige))
+         for p in game.players],
+        game.current_player_index, game.plies, game.winner_index,
+    )
+
+
+def test_apply_undo():
+    rng = random.Random(1)
+    game = HeadlessGame([random_agent(rng), random_agent(rng)], '../resources/deck/deck.json')
+    _apply_undo_round_trip(game, rng)
+
+
+def test_apply_undo_count_bag():
+    rng = random.Random(1)
+    game = HeadlessGame([random_agent(rng), random_agent(rng)], '../resources/deck/deck.json')
+    game.token_bag = CountTokenBag.from_token_bag(game.token_bag)
+    _apply_undo_round_trip(game, rng)
+
+
+def _apply_undo_round_trip(game, rng):
+    snapshots, records = [], []
+
+    while not game.is_over:
+        snapshots.append(_snapshot(game))
+        records.append(game.apply(rng.choice(game.legal_actions())))
+        assert game.hash == hash_game(game)
+        for player in game.players:
+            assert player.crowns == sum(card.crowns for card in player.jewel_cards)
+            assert player.prestige == sum(card.points for card in player.jewel_cards + player.prestige_cards)
+
+    while records:
+        game.undo(records.pop())
+        assert _snapshot(game) == snapshots.pop()
+        assert game.hash == hash_game(game)
+
+
+def test_mcts_agent():
+    agent = MCTSAgent(iterations=30, time_limit=None, rng=random.Random(2))
+    game = HeadlessGame([agent, random_agent(random.Random(3))], '../resources/deck/deck.json')
+    before, before_hash = _snapshot(game), game.hash
+
+    actions = game.legal_actions()
+    assert agent(game, actions) in actions
+    assert agent.stats.iterations == 30
+    assert _snapshot(game) == before and game.hash == before_hash
+
+
+def test_determinization():
+    rng = random.Random(4)
+    game = HeadlessGame([random_agent(rng), random_agent(rng)], '../resources/deck/deck.json')
+    for _ in range(40):
+        game.apply(rng.choice(game.legal_actions()))
+
+    piles = {level: sorted(pile) for level, pile in game.deck.piles.items()}
+    before_hash = game.hash
+    samples = Determinizer(game).sample(10, rng)
+    for i in range(len(samples)):
+        samples.apply(game, i)
+        assert game.hash == before_hash
+        assert {level: sorted(pile) for level, pile in game.deck.piles.items()} == piles
+
+    # A search that fails part way still puts the true hidden state back
+    before = hidden_state(game)
+    agent = MCTSAgent(iterations=10, time_limit=None, rng=rng, determinizations=4)
+    calls = []
+
+    def failing_iterate(game, root):
+        calls.append(root)
+        if len(calls) == 3:
+            raise RuntimeError("search failed")
+    agent._iterate = failing_iterate
+    try:
+        agent.search(game)
+    except RuntimeError:
+        pass
+    assert len(calls) == 3 and hidden_state(game) == before
+
+
+def test_seeded_games_replay():
+    def play(seed):
+        rng = GameRNG(seed)
+        game = HeadlessGame([random_agent(rng), random_agent(rng)], '../resources/deck/deck.json', seed=seed)
+        return game.play(), _snapshot(game)
+
+    assert play(5) == play(5)
+    assert play(5) != play(6)
+
+    streams = GameRNG(7).spawn(3)
+    draws = [[stream.getrandbits(64) for _ in range(100)] for stream in streams]
+    assert len({draw for stream in draws for draw in stream}) == 300
+    assert [GameRNG(7).stream(i).getrandbits(64) for i in range(3)] == [stream[0] for stream in draws]
+
+
+if __name__ == '__main__':
+    test_headless_game()
+    test_apply_undo()
+    test_apply_undo_count_bag()
+    test_mcts_agent()
+    test_determinization()
+    test_seeded_games_replay()
@@ -0,0 +1,53 @@
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from components.engine import HeadlessGame, random_agent
+from components.evaluator import BatchEvaluator, EvaluationQueue, default_queue
+from components.features import FeatureEncoder
+from components.mcts import MCTSAgent
+from components.search import ExpectimaxAgent
+
+
+def test_batch_evaluator():
+    game = HeadlessGame([None, None], '../resources/deck/deck.json', seed=0)
+    encoder = FeatureEncoder(game.deck.catalogue)
+    evaluator = BatchEvaluator.random([encoder.size, 16, 1], np.random.default_rng(0))
+    path = os.path.join(tempfile.mkdtemp(), 'weights.npz')
+    evaluator.save(path)
+    loaded = BatchEvaluator.from_file(path)
+
+    features = encoder.encode_batch([game, game])
+    assert np.allclose(loaded(features), evaluator(features))
+
+    values = []
+    queue = EvaluationQueue(evaluator, encoder, max_batch=3, max_delay=60)
+    for _ in range(4):
+        queue.submit(game, values.append)
+    assert len(values) == 3 and queue.batches == 1
+    queue.flush()
+    assert len(values) == 4 and np.allclose(values, evaluator(features)[0])
+
+
+def test_search_with_evaluator():
+    rng = random.Random(0)
+    game = HeadlessGame([random_agent(rng), random_agent(rng)], '../resources/deck/deck.json', seed=1)
+    before = game.hash
+    actions = game.legal_actions()
+
+    mcts = MCTSAgent(iterations=50, time_limit=None, rng=rng, evaluator=default_queue(game, max_batch=8))
+    assert mcts(game, actions) in actions
+    root = mcts.table[game.hash]
+    assert sum(root.visits) == 50 and 0 < sum(root.values) <= 50
+    assert mcts.evaluator.mean_batch_size > 1
+
+    expectimax = ExpectimaxAgent(time_limit=0.2, max_depth=2, rng=rng, evaluator=default_queue(game))
+    assert expectimax(game, actions) in actions
+    assert game.hash == before
+
+
+if __name__ == '__main__':
+    test_batch_evaluator()
+    test_search_with_evaluator()
@@ -0,0 +1,45 @@
+import os
+import random
+import tempfile
+
+from components.catalogue import load_catalogue
+from components.engine import HeadlessGame
+from components.game_record import GameRecordReader, GameRecordWriter
+from components.mcts import MCTSAgent
+from components.zobrist import hash_game
+
+
+def test_game_record():
+    path = os.path.join(tempfile.mkdtemp(), 'games.sdgr')
+    catalogue_path = '../resources/deck/deck.json'
+    finals = []
+    with GameRecordWriter(path, load_catalogue(catalogue_path).version, snapshot_interval=8) as writer:
+        for seed in range(3):
+            # Searching agents leave the bag's RNG alone, so replays draw the same tokens
+            agents = [MCTSAgent(iterations=5, time_limit=None, rng=random.Random(seed)) for _ in range(2)]
+            game = HeadlessGame(agents, catalogue_path, seed=seed, recorder=writer.recorder())
+            game.play()
+            finals.append((game.plies, game.winner_index, game.hash))
+
+    with GameRecordReader(path) as reader:
+        reader.check_catalogue(catalogue_path)
+        records = list(reader)
+        assert [(record.plies, record.winner_index) for record in records] == [final[:2] for final in finals]
+
+        record = records[0]
+        assert len(list(record.actions())) == record.plies
+        assert record.index
+        final = record.replay(card_spec_file_path=catalogue_path)
+        assert final.hash == finals[0][2] == hash_game(final)
+        assert final.winner_index == record.winner_index
+
+        # Jumping to a snapshot matches replaying from the start
+        ply = record.index[-1][0] + 1
+        jumped = record.replay(ply, catalogue_path)
+        record.index.clear()
+        assert record.replay(ply, catalogue_path).hash == jumped.hash
+        del records, record
+
+
+if __name__ == '__main__':
+    test_game_record()
@@ -0,0 +1,61 @@
+from components.payment import PaymentSolver
+from components.t0ken import GOLD_INDEX
+
+WHITE, BLUE, GREEN = 0, 1, 2
+
+
+def vector(**counts):
+    v = [0] * 7
+    for name, n in counts.items():
+        v[{'white': WHITE, 'blue': BLUE, 'green': GREEN, 'gold': GOLD_INDEX}[name]] = n
+    return tuple(v)
+
+
+def test_gold_substitution_alternatives():
+    solver = PaymentSolver()
+    requirement = vector(white=2, blue=1)
+    payments = solver.payments(requirement, vector(), vector(white=1, blue=1, gold=2))
+    # Least gold first: one gold covers the missing white
+    assert payments[0] == vector(white=1, blue=1, gold=1)
+    assert set(payments) == {
+        vector(white=1, blue=1, gold=1),
+        vector(white=0, blue=1, gold=2), vector(white=1, blue=0, gold=2),
+    }
+    assert all(sum(p) == 3 for p in payments)
+
+    # Bonuses reduce the need; too little gold means no payment
+    assert solver.payments(requirement, vector(white=2), vector(blue=1)) == (vector(blue=1),)
+    assert solver.payments(requirement, vector(), vector(white=1, gold=1)) == ()
+    assert solver.best_payment(requirement, vector(), vector(white=1, gold=1)) is None
+
+
+def test_canonical_tie_break():
+    solver = PaymentSolver()
+    requirement = vector(white=1, blue=1)
+    # Two gold-for-one options tie on gold; keep the scarcer color by spending the plentiful one
+    payments = solver.payments(requirement, vector(), vector(white=1, blue=3, gold=1))
+    assert payments[0] == vector(white=1, blue=1)
+    assert payments[1] == vector(blue=1, gold=1)
+    payments = solver.payments(requirement, vector(), vector(white=3, blue=1, gold=1))
+    assert payments[1] == vector(white=1, gold=1)
+    # Same inputs, same order every time
+    assert payments == solver.payments(requirement, vector(), vector(white=3, blue=1, gold=1))
+
+
+def test_cache_hits():
+    solver = PaymentSolver()
+    key = (vector(white=2, green=1), vector(green=1), vector(white=2, gold=1))
+    solver.payments(*key)
+    solver.payments(*key)
+    # Extra tokens nobody could spend canonicalize to the same entry
+    solver.payments(vector(white=2, green=1), vector(green=1), vector(white=2, blue=4, gold=1))
+    info = solver.cache_info()
+    assert info.misses == 1 and info.hits == 2 and solver.hit_rate == 2 / 3
+    solver.clear()
+    assert solver.cache_info().currsize == 0 and solver.calls == 0
+
+
+if __name__ == '__main__':
+    test_gold_substitution_alternatives()
+    test_canonical_tie_break()
+    test_cache_hits()
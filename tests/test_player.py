@@ -0,0 +1,45 @@
+from components.card import Card
+from components.deck import Deck
+from components.player import Player
+from components.t0ken import Token
+
+
+def test_affordable_cards():
+    card = Card(1, 0, requirements={'white': 3, 'blue': 2})
+    player = Player('Alice', verbose=False)
+    player.add_token(Token.white, 2)
+    player.add_token(Token.blue, 1)
+    assert player.shortfall(card) == 2
+    assert player.affordable_cards([card]) == []
+
+    # Gold covers what the colored tokens miss
+    player.add_token(Token.gold, 2)
+    assert player.shortfall(card) == 2
+    assert player.affordable_cards([card]) == [card]
+
+    # Bonuses lower the cost before tokens are counted
+    player.add_token(Token.gold, -2)
+    player.add_card(Card(1, 0, output={'white': 1}), 'jewel')
+    player.add_card(Card(1, 0, output={'blue': 1}), 'jewel')
+    assert player.shortfall(card) == 0
+    assert player.affordable_cards([card]) == [card]
+
+    # Surplus of one color does not pay for another
+    expensive = Card(2, 0, requirements={'red': 1, 'white': 1})
+    assert player.shortfall(expensive) == 1
+    assert player.affordable_cards([card, expensive]) == [card]
+
+
+def test_deck_affordable_cards():
+    deck = Deck('../resources/deck/deck.json', verbose=False)
+    active = [card for cards in deck.active_cards.values() for card in cards]
+    player = Player('Bob', verbose=False)
+    assert deck.affordable_cards(player) == [card for card in active if not card.requirement_items]
+
+    player.add_token(Token.gold, 100)
+    assert deck.affordable_cards(player) == active
+
+
+if __name__ == '__main__':
+    test_affordable_cards()
+    test_deck_affordable_cards()
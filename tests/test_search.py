@@ -0,0 +1,43 @@
+import random
+
+from components.action import Replenish
+from components.engine import HeadlessGame, random_agent
+from components.mcts import MCTSAgent
+from components.search import ExpectimaxAgent
+
+
+def _replenish_position() -> HeadlessGame:
+    """A few random plies in, with Replenish among the legal moves."""
+    rng = random.Random(0)
+    game = HeadlessGame([random_agent(rng), random_agent(rng)], '../resources/deck/deck.json', seed=18)
+    while game.plies < 12 or not any(isinstance(action, Replenish) for action in game.legal_actions()):
+        game.apply(rng.choice(game.legal_actions()))
+    return game
+
+
+def test_search():
+    game = _replenish_position()
+    hash_before, rng_before = game.hash, game.token_bag.rng.getstate()
+    actions = game.legal_actions()
+
+    agent = ExpectimaxAgent(time_limit=60, max_depth=2, rng=random.Random(0))
+    assert agent(game, actions) in actions
+    assert agent.stats.depth > 0
+    # Sampling replenishes during search leaves the real bag's draws alone
+    assert game.hash == hash_before
+    assert game.token_bag.rng.getstate() == rng_before
+
+
+def test_mcts_search():
+    game = _replenish_position()
+    hash_before, rng_before = game.hash, game.token_bag.rng.getstate()
+
+    agent = MCTSAgent(iterations=50, time_limit=None, rng=random.Random(0))
+    agent.search(game)
+    assert game.hash == hash_before
+    assert game.token_bag.rng.getstate() == rng_before
+
+
+if __name__ == '__main__':
+    test_search()
+    test_mcts_search()
@@ -0,0 +1,18 @@
+from components.self_play import AgentSpec, play_seeded_game, run_self_play
+
+
+def test_self_play():
+    specs = [AgentSpec("random"), AgentSpec("random")]
+    one = run_self_play(20, specs, workers=1, seed=0, shard_size=3)
+    two = run_self_play(20, specs, workers=2, seed=0, shard_size=3)
+
+    assert one.games == two.games == 20
+    assert one.wins == two.wins and one.total_plies == two.total_plies
+    assert sum(one.wins) + one.draws == 20
+    assert sum(one.win_conditions.values()) == sum(one.wins)
+
+    assert play_seeded_game(1, tuple(specs)) == play_seeded_game(1, tuple(specs))
+
+
+if __name__ == '__main__':
+    test_self_play()
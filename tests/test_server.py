@@ -0,0 +1,65 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from components.load_test import find_capacity, load_test
+from components.server import GameServer
+
+
+async def _session(server: GameServer) -> list[dict]:
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    messages = []
+
+    async def send(message):
+        writer.write(message if isinstance(message, bytes) else json.dumps(message).encode() + b'\n')
+        await writer.drain()
+        messages.append(json.loads(await reader.readline()))
+
+    await send({'op': 'join', 'seat': 0, 'seed': 3,
+                'opponent': {'kind': 'mcts', 'options': {'iterations': 5, 'time_limit': None}}})
+    await send({'op': 'move', 'action': -1})  # Not a legal index
+    await send(b'not json\n')  # Answered with exactly one error
+    await send({'op': 'move', 'action': [1]})  # Unhashable
+    await send({'op': 'move', 'action': True})  # Not an index although True == 1
+    state = messages[0]
+    while state['type'] == 'state':
+        await send({'op': 'move', 'action': state['legal'][0]})
+        state = messages[-1]
+    writer.close()
+    return messages
+
+
+def test_server_session():
+    async def run():
+        server = GameServer('127.0.0.1', 0, '../resources/deck/deck.json', max_plies=30,
+                            executor=ThreadPoolExecutor(2))
+        async with server:
+            messages = await _session(server)
+            assert server.stats.errors == 4 and server.stats.bot_moves > 0
+        return messages
+
+    messages = asyncio.run(run())
+    assert messages[0]['type'] == 'state' and messages[0]['seat'] == 0 and len(messages[0]['board']) == 25
+    assert all(message['type'] == 'error' for message in messages[1:5])
+    assert messages[5]['type'] == 'state'
+    assert messages[-1]['type'] == 'over' and messages[-1]['plies'] <= 30
+
+
+def test_load_test():
+    report = asyncio.run(load_test(20, card_spec_file_path='../resources/deck/deck.json', workers=1))
+    assert report.games == 20 and not report.errors
+    assert len(report.latencies) == report.moves and report.p99 >= report.p50 > 0
+
+
+def test_find_capacity():
+    # The server runs in another process; a generous target passes every step
+    capacity = find_capacity(30.0, start=4, max_clients=8, card_spec_file_path='../resources/deck/deck.json', workers=1)
+    assert [report.clients for report in capacity.steps] == [4, 8]
+    assert capacity.clients == 8 and capacity.sessions_per_core == 8 / capacity.cores
+    assert all(report.games == report.clients and not report.errors for report in capacity.steps)
+
+
+if __name__ == '__main__':
+    test_server_session()
+    test_load_test()
+    test_find_capacity()
@@ -0,0 +1,86 @@
+from collections import Counter
+
+from components.compact_token_board import CompactTokenBoard
+from components.rng import GameRNG
+from components.t0ken import Token, token_vector
+from components.token_bag import CountTokenBag, TokenBag
+from components.token_board import TokenBoard
+from components.token_selection import TOKEN_SELECTIONS
+
+
+def test_compact_token_board_round_trip():
+    token_board = TokenBoard(verbose=False)
+    token_board.replenish(TokenBag())
+    compact = CompactTokenBoard.from_token_board(token_board)
+
+    restored = compact.to_token_board()
+    assert [[f.token for f in row] for row in restored.fields] == \
+           [[f.token for f in row] for row in token_board.fields]
+
+    clone = compact.copy()
+    assert clone == compact and hash(clone) == hash(compact)
+
+    taken = clone.take_tokens([(1, 1), (1, 2), (1, 3)])
+    assert taken == token_board.take_tokens([(1, 1), (1, 2), (1, 3)])
+    assert clone != compact
+    assert clone == CompactTokenBoard.from_token_board(token_board)
+
+
+def test_legal_selections():
+    # 25 single fields, 72 adjacent pairs and 48 lines of three
+    assert len(TOKEN_SELECTIONS) == 145
+
+    token_board = TokenBoard(verbose=False)
+    token_board.replenish(TokenBag())
+    assert len(token_board.legal_selections()) == 145
+
+    token_board.take_tokens([(3, 3)])
+    selections = token_board.legal_selections()
+    assert all((3, 3) not in coords for coords in selections)
+    for coords in selections:
+        CompactTokenBoard.from_token_board(token_board).take_tokens(list(coords))
+
+    try:
+        token_board.take_tokens([(1, 1), (1, 3)])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Non-adjacent fields must be rejected")
+
+
+def test_count_token_bag():
+    bag = CountTokenBag(GameRNG(0))
+    assert bag.counts == token_vector(TokenBag().tokens) and len(bag) == 25
+
+    token_board = TokenBoard(verbose=False)
+    token_board.replenish(bag)
+    on_board = [field.token for row in token_board.fields for field in row]
+    assert None not in on_board and len(bag) == 0
+    assert token_vector(on_board) == token_vector(TokenBag().tokens)
+
+    compact = CompactTokenBoard()
+    compact.replenish(CountTokenBag(GameRNG(0)))
+    assert compact.occupied == (1 << 25) - 1
+
+    # Draw frequencies match shuffling the list bag
+    bag = CountTokenBag(counts=[3, 1, 0, 0, 0, 0, 2])
+    outcomes = dict(bag.outcomes(2))
+    assert abs(sum(outcomes.values()) - 1) < 1e-12
+    assert abs(outcomes[(1, 1, 0, 0, 0, 0, 0)] - 3 / 15) < 1e-12
+
+    rng = GameRNG(1)
+    counted, shuffled = Counter(), Counter()
+    for _ in range(3000):
+        counted[tuple(token_vector(CountTokenBag(rng, bag.counts).draw(2)))] += 1
+        list_bag = TokenBag(rng)
+        list_bag.tokens = [Token.white] * 3 + [Token.blue] + [Token.gold] * 2
+        shuffled[tuple(token_vector(list_bag.draw(2)))] += 1
+    for drawn, probability in outcomes.items():
+        assert abs(counted[drawn] / 3000 - probability) < 0.04
+        assert abs(shuffled[drawn] / 3000 - probability) < 0.04
+
+
+if __name__ == '__main__':
+    test_compact_token_board_round_trip()
+    test_legal_selections()
+    test_count_token_bag()
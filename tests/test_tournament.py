@@ -0,0 +1,35 @@
+from components.self_play import AgentSpec
+from components.tournament import SPRT, MatchScore, TournamentResult, run_match, run_round_robin
+
+
+def test_ratings():
+    tournament = TournamentResult(["a", "b", "c"])
+    tournament.scores[0, 1] = MatchScore(wins=30, draws=0, losses=70)
+    tournament.scores[0, 2] = MatchScore(wins=50, draws=0, losses=50)
+    tournament.scores[1, 2] = MatchScore(wins=70, draws=0, losses=30)
+    a, b, c = tournament.ratings()
+    assert a.elo == 0 and b.elo > 100 and abs(c.elo) < 50
+    assert b.low < b.elo < b.high
+
+
+def test_sprt():
+    sprt = SPRT(elo0=0, elo1=50)
+    assert sprt.decision(MatchScore(wins=300, draws=0, losses=100)) == "H1"
+    assert sprt.decision(MatchScore(wins=100, draws=0, losses=300)) == "H0"
+    assert sprt.decision(MatchScore(wins=5, draws=0, losses=5)) is None
+
+
+def test_tournament_runs():
+    specs = [AgentSpec("random", name="a"), AgentSpec("random", name="b")]
+    tournament = run_round_robin(specs, games_per_pair=8, workers=2, seed=0, shard_size=2)
+    assert tournament.scores[0, 1].games == 8
+    assert len(tournament.ratings()) == 2
+
+    result = run_match(specs[0], specs[1], max_games=12, sprt=SPRT(0, 400), workers=2, seed=0, shard_size=2)
+    assert result.score.games <= 12
+
+
+if __name__ == '__main__':
+    test_ratings()
+    test_sprt()
+    test_tournament_runs()
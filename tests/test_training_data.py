@@ -0,0 +1,50 @@
+import random
+import tempfile
+
+import numpy as np
+
+from components.catalogue import load_catalogue
+from components.engine import HeadlessGame, random_agent
+from components.features import FeatureEncoder, action_index, action_space_size
+from components.training_data import ShardDataset, export_self_play
+
+
+def test_feature_encoder():
+    catalogue = load_catalogue('../resources/deck/deck.json')
+    encoder = FeatureEncoder(catalogue)
+    rng = random.Random(0)
+    games = []
+    for seed in range(3):
+        game = HeadlessGame([random_agent(rng), random_agent(rng)], '../resources/deck/deck.json', seed=seed)
+        for _ in range(10 * seed):
+            game.apply(rng.choice(game.legal_actions()))
+        games.append(game)
+
+    batch = encoder.encode_batch(games)
+    assert batch.shape == (3, encoder.size)
+    for game, row in zip(games, batch):
+        assert np.array_equal(encoder.encode(game), row)
+        board = row[encoder.offsets["board"]]
+        assert board.sum() == sum(field.token is not None for r in game.token_board.fields for field in r)
+
+    indices = {action_index(action, catalogue) for action in games[0].legal_actions()}
+    assert len(indices) == len(games[0].legal_actions())
+    assert max(indices) < action_space_size(catalogue)
+
+
+def test_export_self_play():
+    directory = tempfile.mkdtemp()
+    rows = export_self_play(directory, n_games=2, iterations=3, card_spec_file_path='../resources/deck/deck.json',
+                            shard_size=64)
+    dataset = ShardDataset(directory)
+    assert len(dataset) == rows and len(dataset.rows) == -(-rows // 64)
+
+    features, policy, outcome = dataset.sample(16, np.random.default_rng(0))
+    assert features.shape[0] == policy.shape[0] == outcome.shape[0] == 16
+    assert np.allclose(policy.sum(axis=1), 1)
+    assert set(np.unique(outcome)) <= {-1.0, 0.0, 1.0}
+
+
+if __name__ == '__main__':
+    test_feature_encoder()
+    test_export_self_play()
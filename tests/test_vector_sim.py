@@ -0,0 +1,59 @@
+import random
+
+import numpy as np
+
+from components.action import BuyCard, Replenish, TakeTokens
+from components.engine import HeadlessGame, random_agent
+from components.features import SELECTION_INDEX
+from components.vector_sim import VectorGames, simulate
+
+
+def _state(vector):
+    # Deck refills a slot by appending, so compare active cards as sets
+    return [vector.board, vector.bag, vector.tokens, vector.bonuses, vector.color_prestige, vector.crowns,
+            vector.prestige, vector.privileges, vector.current, np.sort(vector.active), vector.cursor]
+
+
+def test_vector_rules_match_engine():
+    rng = random.Random(0)
+    for seed in range(5):
+        game = HeadlessGame([random_agent(rng), random_agent(rng)], '../resources/deck/deck.json', seed=seed)
+        while not game.is_over:
+            vector = VectorGames.from_games([game])
+            games = np.arange(1)
+            actions = game.legal_actions()
+
+            takes = {SELECTION_INDEX[tuple(sorted(a.coords))] for a in actions if isinstance(a, TakeTokens)}
+            buys = {a.card_id for a in actions if isinstance(a, BuyCard)}
+            assert set(np.flatnonzero(vector.legal_takes(games)[0])) == takes
+            assert set(vector.active[0][vector.affordable(games)[0]]) == buys
+            assert vector.can_replenish(games)[0] == any(isinstance(a, Replenish) for a in actions)
+
+            action = rng.choice(actions)
+            game.apply(action)
+            if isinstance(action, (TakeTokens, BuyCard)):
+                if isinstance(action, TakeTokens):
+                    vector._take(games, np.array([SELECTION_INDEX[tuple(sorted(action.coords))]]))
+                else:
+                    vector._buy(games, np.flatnonzero(vector.active[0] == action.card_id))
+                vector.plies += 1
+                after = VectorGames.from_games([game])
+                if game.winner_index is None:
+                    vector.current = after.current
+                for ours, theirs in zip(_state(vector), _state(after)):
+                    assert np.array_equal(ours, theirs)
+
+
+def test_simulate():
+    for policy in ('random', 'greedy'):
+        results = simulate(200, policy, seed=0, card_spec_file_path='../resources/deck/deck.json')
+        assert len(results.winner) == 200 and (results.plies <= 200).all()
+        decided = results.winner >= 0
+        assert (results.condition[decided] > 0).all() and (results.condition[~decided] == 0).all()
+    assert sum(simulate(100, 'greedy', seed=1, card_spec_file_path='../resources/deck/deck.json')
+               .win_conditions().values()) > 90
+
+
+if __name__ == '__main__':
+    test_vector_rules_match_engine()
+    test_simulate()
@@ -0,0 +1,56 @@
+import os
+import random
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+from components.catalogue import load_catalogue
+from components.engine import HeadlessGame, random_agent
+from components.game_record import GameRecordReader, GameRecordWriter
+from components.visualize import CELL_COLORS, BoardView, board_codes, export_frames, game_frames, record_frames
+
+
+def test_board_view():
+    game = HeadlessGame([None, None], '../resources/deck/deck.json', seed=0)
+    codes = board_codes(game.token_board)
+    view = BoardView(headless=True)
+    assert view.update(codes, 'Ply 0')
+    assert not view.update(codes.copy(), 'Ply 0')
+
+    # Blitted cells show the token colors at their centres
+    frame = view.frame()
+    bbox = view.ax.get_window_extent()
+    height = frame.shape[0]
+    for row, col in [(0, 0), (2, 3), (4, 4)]:
+        x = int(bbox.x0 + (col + 0.5) * bbox.width / 5)
+        y = int(height - (bbox.y0 + (4.5 - row) * bbox.height / 5))
+        assert np.allclose(frame[y, x] / 255, CELL_COLORS[codes[row, col]], atol=0.02)
+
+
+def test_export_frames():
+    directory = tempfile.mkdtemp()
+    catalogue_path = '../resources/deck/deck.json'
+    path = os.path.join(directory, 'games.sdgr')
+    rng = random.Random(0)
+    with GameRecordWriter(path, load_catalogue(catalogue_path).version) as writer:
+        game = HeadlessGame([random_agent(rng), random_agent(rng)], catalogue_path, seed=0,
+                            recorder=writer.recorder())
+        game.play()
+    with GameRecordReader(path) as reader:
+        record = next(iter(reader))
+        frames = export_frames(record_frames(record, catalogue_path), os.path.join(directory, 'game.gif'))
+        assert frames == record.plies + 1
+        del record
+    with Image.open(os.path.join(directory, 'game.gif')) as gif:
+        assert gif.n_frames > 1 and gif.n_frames <= frames
+
+    game = HeadlessGame([random_agent(rng), random_agent(rng)], catalogue_path, seed=1, max_plies=10)
+    png_dir = os.path.join(directory, 'frames')
+    assert export_frames(game_frames(game), png_dir) == 11
+    assert len(os.listdir(png_dir)) == 11
+
+
+if __name__ == '__main__':
+    test_board_view()
+    test_export_frames()